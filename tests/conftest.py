@@ -6,11 +6,15 @@ from asyncio import AbstractEventLoop
 from asyncio import AbstractEventLoopPolicy
 from dataclasses import dataclass
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 from typing import AsyncGenerator
+from typing import Awaitable
+from typing import Callable
 from typing import Dict
 from typing import Generator
 from typing import List
+from typing import Mapping
 from typing import NamedTuple
 from typing import Optional
 from unittest.mock import AsyncMock
@@ -28,6 +32,7 @@ from tests.conftest_data import NEURON_L203_MODBUS_REGISTER
 from unipi_control.config import Config
 from unipi_control.extensions.eastron import EastronSDM120M
 from unipi_control.helpers.typing import ModbusClient
+from unipi_control.helpers.typing import ModbusReadData
 from unipi_control.integrations.covers import CoverMap
 from unipi_control.neuron import Neuron
 
@@ -159,18 +164,94 @@ class MockHardwareInfo:
 class MockModbusClient(NamedTuple):
     tcp: AsyncMock
     serial: AsyncMock
+    serial_buses: Mapping[str, AsyncMock] = MappingProxyType({})
+
+
+def create_modbus_response(registers: Optional[List[int]] = None, is_error: bool = False) -> MagicMock:
+    """Create a mocked Modbus response.
+
+    Parameters
+    ----------
+    registers: list, optional
+        The registers of a read response.
+    is_error: bool
+        Return an exception response.
+
+    Returns
+    -------
+    MagicMock:
+        The mocked response.
+
+    """
+    mock_response: MagicMock = MagicMock(spec=ModbusResponse, registers=registers or [])
+    mock_response.isError.return_value = is_error
+
+    return mock_response
+
+
+class MockRegisterReader:
+    """Answer ``read_input_registers()`` with the address as value of every register.
+
+    Attributes
+    ----------
+    calls: list
+        The address, count and slave of every request.
+    hook: Callable, optional
+        Awaited with address, count and slave before the response is returned, e.g. to delay the response or to
+        raise a timeout.
+
+    """
+
+    def __init__(self) -> None:
+        self.calls: List[ModbusReadData] = []
+        self.hook: Optional[Callable[[int, int, int], Awaitable[None]]] = None
+
+    @property
+    def addresses(self) -> List[int]:
+        """Return the addresses of all requests."""
+        return [read_call["address"] for read_call in self.calls]
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 0) -> MagicMock:
+        """Record the request and return the mocked response."""
+        self.calls.append({"address": address, "count": count, "slave": slave})
+
+        if self.hook:
+            await self.hook(address, count, slave)
+
+        return create_modbus_response([address] * count)
+
+
+@pytest.fixture(name="hardware_info")
+def mock_hardware_info(mocker: MockerFixture) -> PropertyMock:
+    """Mock the hardware info that is read from the Unipi Neuron.
+
+    Parameters
+    ----------
+    mocker: MockerFixture
+        pytest fixture for mocking.
+
+    Returns
+    -------
+    PropertyMock:
+        The mocked hardware info class.
+
+    """
+    mock_hardware_info: PropertyMock = mocker.patch("unipi_control.config.HardwareInfo", new_callable=PropertyMock())
+    mock_hardware_info.return_value = MockHardwareInfo()
+
+    return mock_hardware_info
 
 
 @pytest.fixture(name="modbus_client")
-def mock_modbus_client(request: SubRequest, mocker: MockerFixture) -> MockModbusClient:
+def mock_modbus_client(request: SubRequest, hardware_info: PropertyMock) -> MockModbusClient:  # noqa: ARG001
     """Mock modbus client responses from read registers.
 
     Parameters
     ----------
     request: SubRequest
         Config for mocked modbus fixture.
-    mocker: MockerFixture
-        pytest fixture for mocking.
+    hardware_info: PropertyMock
+        The mocked hardware info.
 
     Returns
     -------
@@ -180,8 +261,7 @@ def mock_modbus_client(request: SubRequest, mocker: MockerFixture) -> MockModbus
     """
     modbus_client_config: Dict[str, Any] = getattr(request, "param", {})
 
-    mock_bord_response: MagicMock = MagicMock(spec=ModbusResponse, registers=[0])
-    mock_bord_response.isError.return_value = False
+    mock_bord_response: MagicMock = create_modbus_response([0])
 
     for mock_response in NEURON_L203_MODBUS_REGISTER:
         mock_response.isError.return_value = False
@@ -198,6 +278,10 @@ def mock_modbus_client(request: SubRequest, mocker: MockerFixture) -> MockModbus
         # In the first scan() features changed and in the second scan() features not changed.
         *NEURON_L203_MODBUS_REGISTER + NEURON_L203_MODBUS_REGISTER,
     ]
+    # Coil writes are answered with an exception response unless a test mocks a successful write,
+    # e.g. a cover doesn't start its run timer.
+    mock_modbus_tcp_client.write_coil.return_value = create_modbus_response(is_error=True)
+    mock_modbus_tcp_client.write_coils.return_value = create_modbus_response(is_error=True)
 
     for mock_response in EXTENSION_EASTRON_SDM120M_MODBUS_REGISTER:
         mock_response.isError.return_value = False
@@ -205,20 +289,83 @@ def mock_modbus_client(request: SubRequest, mocker: MockerFixture) -> MockModbus
     mock_modbus_serial_client: AsyncMock = AsyncMock()
     mock_modbus_serial_client.read_input_registers.side_effect = EXTENSION_EASTRON_SDM120M_MODBUS_REGISTER
 
-    mock_response_sw_version: MagicMock = MagicMock(spec=ModbusResponse, registers=[32, 516])
-    mock_response_sw_version.isError.return_value = modbus_client_config.get("eastron_sw_version_failed", False)
+    mock_response_sw_version: MagicMock = create_modbus_response(
+        [32, 516], is_error=modbus_client_config.get("eastron_sw_version_failed", False)
+    )
 
     mock_modbus_serial_client.read_holding_registers.side_effect = [
         # Eastron SDM120M Software Version
         mock_response_sw_version,
     ] * (EastronSDM120M.RETRY_LIMIT if modbus_client_config.get("eastron_sw_version_failed") else 1)
 
-    mock_hardware_info: PropertyMock = mocker.patch("unipi_control.config.HardwareInfo", new_callable=PropertyMock())
-    mock_hardware_info.return_value = MockHardwareInfo()
+    return MockModbusClient(tcp=mock_modbus_tcp_client, serial=mock_modbus_serial_client)
+
+
+@pytest.fixture(name="register_reader")
+def create_register_reader() -> MockRegisterReader:
+    """Create a register reader that records the read requests of the scan.
+
+    Returns
+    -------
+    MockRegisterReader:
+        The register reader.
+
+    """
+    return MockRegisterReader()
+
+
+@pytest.fixture(name="scan_modbus_client")
+def mock_scan_modbus_client(register_reader: MockRegisterReader) -> MockModbusClient:
+    """Mock a modbus client that answers all register reads with the register reader.
+
+    Parameters
+    ----------
+    register_reader: MockRegisterReader
+        The register reader of the tcp and serial client.
+
+    Returns
+    -------
+    MockModbusClient: NamedTuple
+        Named tuple with mocked tcp and serial client
+
+    """
+    mock_modbus_tcp_client: AsyncMock = AsyncMock()
+    mock_modbus_tcp_client.read_input_registers.side_effect = register_reader.read_input_registers
+
+    mock_modbus_serial_client: AsyncMock = AsyncMock()
+    mock_modbus_serial_client.read_input_registers.side_effect = register_reader.read_input_registers
 
     return MockModbusClient(tcp=mock_modbus_tcp_client, serial=mock_modbus_serial_client)
 
 
+@pytest.fixture(name="scan_neuron")
+def create_scan_neuron(
+    config_loader: ConfigLoader,
+    scan_modbus_client: MockModbusClient,
+    hardware_info: PropertyMock,  # noqa: ARG001
+) -> Neuron:
+    """Create a neuron device for scan tests without reading the boards.
+
+    Parameters
+    ----------
+    config_loader: ConfigLoader
+        Config loader class with helper methods.
+    scan_modbus_client: MockModbusClient
+        Mocked modbus client that answers with the register reader.
+    hardware_info: PropertyMock
+        The mocked hardware info.
+
+    Returns
+    -------
+    Neuron:
+        The neuron device.
+
+    """
+    modbus_client: ModbusClient = ModbusClient(tcp=scan_modbus_client.tcp, serial=scan_modbus_client.serial)
+
+    return Neuron(config=config_loader.get_config(), modbus_client=modbus_client)
+
+
 @pytest_asyncio.fixture(name="neuron")
 async def init_neuron(config_loader: ConfigLoader, modbus_client: ModbusClient) -> AsyncGenerator[Neuron, None]:
     """Initialize neuron device for tests.
@@ -261,17 +408,19 @@ async def create_cover_map(config_loader: ConfigLoader, neuron: Neuron) -> Async
 
 class MockMQTTMessage(NamedTuple):
     payload: bytes
+    topic: str = ""
 
 
 class MockMQTTMessages:
-    def __init__(self, message: List[bytes]) -> None:
+    def __init__(self, message: List[bytes], topic: str = "") -> None:
         self.message: List[bytes] = message
+        self.topic: str = topic
 
     def __aiter__(self) -> "MockMQTTMessages":
         return self
 
     async def __anext__(self) -> MockMQTTMessage:
         if self.message:
-            return MockMQTTMessage(self.message.pop())
+            return MockMQTTMessage(self.message.pop(), self.topic)
 
         raise StopAsyncIteration
@@ -390,10 +390,12 @@ EXTENSION_EASTRON_SDM120M_MODBUS_REGISTER: Final[List[MagicMock]] = [
     # Frequency, Import active energy, Export active energy, Imported reactive energy, Exported reactive energy
     MagicMock(spec=ModbusResponse, registers=[16968, 10486, 16525, 20447, 0, 0, 16023, 36176, 16431, 11010]),
     # Total system power demand, Maximum total system power demand,
-    # Import system power demand, Maximum import system power demand
-    MagicMock(spec=ModbusResponse, registers=[16917, 5097, 17058, 5854, 16917, 5097, 17058, 5854]),
+    # Import system power demand, Maximum import system power demand,
     # Export system power demand, Maximum export system power demand
-    MagicMock(spec=ModbusResponse, registers=[0, 0, 15609, 56093]),
+    MagicMock(
+        spec=ModbusResponse,
+        registers=[16917, 5097, 17058, 5854, 16917, 5097, 17058, 5854, 0, 0, 15609, 56093],
+    ),
     # Current demand
     MagicMock(spec=ModbusResponse, registers=[16020, 2247]),
     # Maximum current demand
@@ -57,6 +57,7 @@ class TestCovers:
         mock_response.isError.return_value = False
 
         modbus_client.tcp.write_coil.return_value = mock_response
+        modbus_client.tcp.write_coils.return_value = mock_response
 
         mocker.patch("unipi_control.integrations.covers.CoverTimer", new_callable=MagicMock)
 
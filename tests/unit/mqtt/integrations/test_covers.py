@@ -3,6 +3,7 @@
 import asyncio
 from asyncio import Task
 from contextlib import AsyncExitStack
+from typing import Dict
 from typing import List
 from typing import Set
 from unittest.mock import AsyncMock
@@ -17,6 +18,7 @@ from tests.conftest import MockMQTTMessages
 from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
 from tests.conftest_data import HARDWARE_DATA_CONTENT
 from tests.unit.mqtt.integrations.test_covers_data import CONFIG_CONTENT
+from tests.unit.mqtt.integrations.test_covers_data import CONFIG_CONTENT_WITH_TWO_COVERS
 from unipi_control.integrations.covers import Cover
 from unipi_control.integrations.covers import CoverMap
 from unipi_control.integrations.covers import CoverState
@@ -67,9 +69,13 @@ class TestHappyPathCoversMqttPlugin:
             (
                 (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 [
-                    MockMQTTMessages([b"50"]),  # position
-                    MockMQTTMessages([]),  # tilt
-                    MockMQTTMessages([b"""OPEN"""]),  # command
+                    MockMQTTMessages(
+                        [b"50"], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/position/set"
+                    ),  # position
+                    MockMQTTMessages([], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set"),  # tilt
+                    MockMQTTMessages(
+                        [b"""OPEN"""], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/set"
+                    ),  # command
                 ],
             )
         ],
@@ -99,9 +105,9 @@ class TestHappyPathCoversMqttPlugin:
         logs: List[str] = [record.getMessage() for record in caplog.records]
 
         assert "[CONFIG] 1 covers initialized." in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/position/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/position/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/tilt/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/set" in logs
         assert "[COVER] [mocked_unipi/mocked_blind_topic_name/cover/blind] [Worker] 1 task(s) canceled." in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/set] Subscribe message: OPEN" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/position] Publishing message: 0" in logs
@@ -118,9 +124,13 @@ class TestHappyPathCoversMqttPlugin:
             (
                 (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 [
-                    MockMQTTMessages([]),  # position
-                    MockMQTTMessages([]),  # tilt
-                    MockMQTTMessages([b"""CLOSE"""]),  # command
+                    MockMQTTMessages(
+                        [], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/position/set"
+                    ),  # position
+                    MockMQTTMessages([], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set"),  # tilt
+                    MockMQTTMessages(
+                        [b"""CLOSE"""], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/set"
+                    ),  # command
                 ],
             )
         ],
@@ -146,9 +156,9 @@ class TestHappyPathCoversMqttPlugin:
         logs: List[str] = [record.getMessage() for record in caplog.records]
 
         assert "[CONFIG] 1 covers initialized." in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/position/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/position/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/tilt/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/set" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/set] Subscribe message: CLOSE" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/position] Publishing message: 0" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/tilt] Publishing message: 0" in logs
@@ -164,9 +174,13 @@ class TestHappyPathCoversMqttPlugin:
             (
                 (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 [
-                    MockMQTTMessages([]),  # position
-                    MockMQTTMessages([]),  # tilt
-                    MockMQTTMessages([b"""STOP"""]),  # command
+                    MockMQTTMessages(
+                        [], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/position/set"
+                    ),  # position
+                    MockMQTTMessages([], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set"),  # tilt
+                    MockMQTTMessages(
+                        [b"""STOP"""], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/set"
+                    ),  # command
                 ],
             )
         ],
@@ -190,9 +204,9 @@ class TestHappyPathCoversMqttPlugin:
         logs: List[str] = [record.getMessage() for record in caplog.records]
 
         assert "[CONFIG] 1 covers initialized." in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/position/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/position/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/tilt/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/set" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/set] Subscribe message: STOP" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/position] Publishing message: 0" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/tilt] Publishing message: 0" in logs
@@ -208,9 +222,11 @@ class TestHappyPathCoversMqttPlugin:
             (
                 (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 [
-                    MockMQTTMessages([b"""50"""]),  # position
-                    MockMQTTMessages([]),  # tilt
-                    MockMQTTMessages([]),  # command
+                    MockMQTTMessages(
+                        [b"""50"""], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/position/set"
+                    ),  # position
+                    MockMQTTMessages([], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set"),  # tilt
+                    MockMQTTMessages([], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/set"),  # command
                 ],
             )
         ],
@@ -239,13 +255,12 @@ class TestHappyPathCoversMqttPlugin:
         mock_set_position.assert_called_once_with(50)
 
         assert "[CONFIG] 1 covers initialized." in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/position/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/position/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/tilt/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/set" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/position] Publishing message: 0" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/tilt] Publishing message: 0" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/state] Publishing message: closing" in logs
-        assert "[COVER] [mocked_unipi/mocked_blind_topic_name/cover/blind] [Worker] 1 task(s) in queue." in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/position/set] Subscribe message: 50" in logs
         assert "[COVER] [mocked_unipi/mocked_blind_topic_name/cover/blind] [Worker] Cover runtime: 10 seconds." in logs
 
@@ -256,9 +271,13 @@ class TestHappyPathCoversMqttPlugin:
             (
                 (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 [
-                    MockMQTTMessages([]),  # position
-                    MockMQTTMessages([b"""50"""]),  # tilt
-                    MockMQTTMessages([]),  # command
+                    MockMQTTMessages(
+                        [], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/position/set"
+                    ),  # position
+                    MockMQTTMessages(
+                        [b"""50"""], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set"
+                    ),  # tilt
+                    MockMQTTMessages([], topic="mocked_unipi/mocked_blind_topic_name/cover/blind/set"),  # command
                 ],
             )
         ],
@@ -287,14 +306,50 @@ class TestHappyPathCoversMqttPlugin:
         mock_set_tilt.assert_called_once_with(50)
 
         assert "[CONFIG] 1 covers initialized." in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/position/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set" in logs
-        assert "[MQTT] Subscribe topic mocked_unipi/mocked_blind_topic_name/cover/blind/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/position/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/tilt/set" in logs
+        assert "[MQTT] Subscribe topic mocked_unipi/+/cover/+/set" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/position] Publishing message: 0" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/tilt] Publishing message: 0" in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/state] Publishing message: opening" in logs
-        assert "[COVER] [mocked_unipi/mocked_blind_topic_name/cover/blind] [Worker] 1 task(s) in queue." in logs
         assert "[MQTT] [mocked_unipi/mocked_blind_topic_name/cover/blind/tilt/set] Subscribe message: 50" in logs
         assert (
             "[COVER] [mocked_unipi/mocked_blind_topic_name/cover/blind] [Worker] Cover runtime: 0.25 seconds." in logs
         )
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_TWO_COVERS, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_subscribe_dispatch(self, covers: CoverMap) -> None:
+        """Test that a slow command of one cover doesn't delay the other cover and commands of a cover run in order."""
+        covers.init()
+        plugin: CoversMqttPlugin = CoversMqttPlugin(mqtt_client=AsyncMock(spec=Client), covers=covers)
+        topics: Dict[str, Cover] = {
+            f"{cover.topic}/set": cover for cover in covers.by_device_classes(["blind", "shutter"])
+        }
+        blind_topic, shutter_topic = topics
+
+        calls: List[str] = []
+        release: asyncio.Event = asyncio.Event()
+
+        async def handler(cover: Cover, topic: str, value: str) -> None:  # noqa: ARG001
+            if value == "OPEN" and topic == blind_topic:
+                await release.wait()
+
+            calls.append(f"{topic} {value}")
+
+            if topic == shutter_topic:
+                release.set()
+
+        # The mocked messages are popped from the end of the list.
+        messages: List[MockMQTTMessages] = [
+            MockMQTTMessages([b"""STOP""", b"""OPEN"""], topic=blind_topic),
+            MockMQTTMessages([b"""CLOSE"""], topic=shutter_topic),
+        ]
+
+        await asyncio.gather(*(plugin._subscribe(topics, handler, message) for message in messages))  # noqa: SLF001
+
+        assert calls == [f"{shutter_topic} CLOSE", f"{blind_topic} OPEN", f"{blind_topic} STOP"]
@@ -39,3 +39,25 @@ logging:
   mqtt:
     covers_level: info
 """
+
+CONFIG_CONTENT_WITH_TWO_COVERS: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+covers:
+  - object_id: MOCKED_BLIND_TOPIC_NAME
+    friendly_name: MOCKED_FRIENDLY_NAME - BLIND
+    device_class: blind
+    cover_run_time: 35.5
+    tilt_change_time: 1.5
+    cover_up: ro_3_01
+    cover_down: ro_3_02
+  - object_id: MOCKED_SHUTTER_TOPIC_NAME
+    friendly_name: MOCKED_FRIENDLY_NAME - SHUTTER
+    device_class: shutter
+    cover_run_time: 35.5
+    cover_up: ro_3_03
+    cover_down: ro_3_04
+logging:
+  level: debug
+"""
@@ -1,8 +1,13 @@
 """Unit tests MQTT for input and output features."""
 
 import asyncio
+import json
+import re
+import struct
 from asyncio import Task
 from contextlib import AsyncExitStack
+from typing import Any
+from typing import Dict
 from typing import List
 from typing import Set
 from unittest.mock import AsyncMock
@@ -13,12 +18,19 @@ from unittest.mock import call
 import pytest
 from _pytest.logging import LogCaptureFixture
 from aiomqtt import Client
+from pymodbus.pdu import ModbusResponse
 from pytest_mock import MockerFixture
 
+from tests.conftest import MockModbusClient
 from tests.conftest import MockMQTTMessages
 from tests.conftest_data import CONFIG_CONTENT
 from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
 from tests.conftest_data import HARDWARE_DATA_CONTENT
+from tests.unit.mqtt.test_features_data import CONFIG_CONTENT_WITH_BOARDS
+from tests.unit.mqtt.test_features_data import CONFIG_CONTENT_WITH_STRUCT_CODEC
+from unipi_control.config import FeatureConfig
+from unipi_control.features.neuron import Relay
+from unipi_control.mqtt.features import FeatureCommandQueue
 from unipi_control.mqtt.features import MeterFeaturesMqttPlugin
 from unipi_control.mqtt.features import NeuronFeaturesMqttPlugin
 from unipi_control.neuron import Neuron
@@ -31,11 +43,18 @@ class TestHappyPathNeuronFeaturesMqttPlugin:
     )
     async def test_init_tasks(self, mocker: MockerFixture, neuron: Neuron, caplog: LogCaptureFixture) -> None:
         """Test MQTT output after initialize neuron features."""
-        mock_mqtt_messages: AsyncMock = AsyncMock()
-        mock_mqtt_messages.__aenter__.return_value = MockMQTTMessages([b"""ON""", b"""OFF"""])
+
+        def filtered_messages(topic: str) -> AsyncMock:
+            # Every subscribed topic filter gets its own messages, coil writes yield to the event loop.
+            mock_mqtt_messages: AsyncMock = AsyncMock()
+            mock_mqtt_messages.__aenter__.return_value = MockMQTTMessages(
+                [] if topic == "mocked_unipi/relay/set" else [b"""ON""", b"""OFF"""],
+                topic="mocked_unipi/relay/do_1_01/set",
+            )
+            return mock_mqtt_messages
 
         mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
-        mock_mqtt_client.filtered_messages.return_value = mock_mqtt_messages
+        mock_mqtt_client.filtered_messages.side_effect = filtered_messages
 
         mock_modbus_cache_data_scan: MagicMock = mocker.patch("unipi_control.modbus.ModbusCacheData.scan")
 
@@ -56,23 +75,262 @@ class TestHappyPathNeuronFeaturesMqttPlugin:
 
         assert mock_modbus_cache_data_scan.mock_calls == [
             # In the first run features changed.
-            call("tcp", ["Neuron"]),
+            call("tcp", ["Neuron"], port=None),
             # In the second run features not changed.
-            call("tcp", ["Neuron"]),
+            call("tcp", ["Neuron"], port=None),
         ]
 
-        for feature_do in range(1, 4):
-            assert f"[MQTT] Subscribe topic mocked_unipi/relay/do_1_{feature_do:02d}/set" in logs
-
-        for bord in range(2, 3):
-            for feature_ro in range(1, 4):
-                assert f"[MQTT] Subscribe topic mocked_unipi/relay/ro_{bord}_{feature_ro:02d}/set" in logs
+        subscribe_logs: List[str] = [log for log in logs if log.startswith("[MQTT] Subscribe topic")]
 
+        assert subscribe_logs == [
+            "[MQTT] Subscribe topic mocked_unipi/relay/+/set",
+            "[MQTT] Subscribe topic mocked_unipi/relay/set",
+        ]
         assert "[MQTT] [mocked_unipi/relay/do_1_01/set] Subscribe message: OFF" in logs
         assert "[MQTT] [mocked_unipi/relay/do_1_01/set] Subscribe message: ON" in logs
         assert "[MQTT] [mocked_unipi/relay/ro_2_01/get] Publishing message: OFF" in logs
         assert "[MQTT] [mocked_unipi/relay/ro_2_13/get] Publishing message: OFF" in logs
 
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_subscribe_bulk(
+        self, modbus_client: MockModbusClient, neuron: Neuron, caplog: LogCaptureFixture
+    ) -> None:
+        """Test that a bulk command switches all relays with as few Modbus requests as possible."""
+        mock_response: MagicMock = MagicMock(spec=ModbusResponse)
+        mock_response.isError.return_value = False
+
+        modbus_client.tcp.write_coil.return_value = mock_response
+        modbus_client.tcp.write_coils.return_value = mock_response
+
+        messages: MockMQTTMessages = MockMQTTMessages(
+            [
+                b"""ro_2_01=OFF,ro_2_99=ON""",
+                b"""{"ro_2_01": "ON", "ro_2_02": "ON", "ro_2_03": "ON", "do_1_01": "ON", "do_1_02": "OFF"}""",
+            ]
+        )
+
+        plugin: NeuronFeaturesMqttPlugin = NeuronFeaturesMqttPlugin(neuron, AsyncMock(spec=Client))
+        await plugin._subscribe_bulk("mocked_unipi/relay/set", messages)  # noqa: SLF001
+        await plugin.commands.join()
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        modbus_client.tcp.write_coil.assert_awaited_once_with(address=0, value=True, slave=0)
+        modbus_client.tcp.write_coils.assert_awaited_once_with(address=100, values=[True, True, True], slave=0)
+        assert plugin.commands.skipped == 1
+        assert (
+            "[MQTT] [mocked_unipi/relay/set] Subscribe message: "
+            '{"ro_2_01": "ON", "ro_2_02": "ON", "ro_2_03": "ON", "do_1_01": "ON", "do_1_02": "OFF"}'
+        ) in logs
+        assert (
+            "[MQTT] [mocked_unipi/relay/set] Invalid bulk command: [CONFIG] 'ro_2_99' not found in FeatureMap!" in logs
+        )
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_feature_command_queue(
+        self, mocker: MockerFixture, modbus_client: MockModbusClient, neuron: Neuron
+    ) -> None:
+        """Test that no-op commands are dropped, the latest command wins and writes are rate limited."""
+        mock_response: MagicMock = MagicMock(spec=ModbusResponse)
+        mock_response.isError.return_value = False
+
+        modbus_client.tcp.write_coil.return_value = mock_response
+
+        feature = neuron.features.by_feature_id("ro_2_01", feature_types=["RO"])
+        assert isinstance(feature, Relay)
+
+        feature.features_config = FeatureConfig(min_write_interval=1)
+        commands: FeatureCommandQueue = FeatureCommandQueue()
+
+        commands.put(feature, False)
+        commands.put(feature, True)
+        commands.put(feature, False)
+        commands.put(feature, True)
+        await commands.join()
+
+        modbus_client.tcp.write_coil.assert_awaited_once_with(address=100, value=True, slave=0)
+        assert commands.skipped == 0
+
+        commands.put(feature, True)
+        await commands.join()
+
+        assert commands.skipped == 1
+
+        mock_sleep: AsyncMock = mocker.patch("unipi_control.mqtt.features.asyncio.sleep", new_callable=AsyncMock)
+
+        commands.put(feature, False)
+        await commands.join()
+
+        assert any(0 < await_args.args[0] <= 1 for await_args in mock_sleep.await_args_list)
+        modbus_client.tcp.write_coil.assert_awaited_with(address=100, value=False, slave=0)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_log_statistics(self, mocker: MockerFixture, neuron: Neuron, caplog: LogCaptureFixture) -> None:
+        """Test that the statistics are logged when they changed."""
+        mocker.patch("unipi_control.modbus.ModbusCacheData.scan")
+        mocker.patch.object(NeuronFeaturesMqttPlugin, "statistics_interval", 0)
+
+        NeuronFeaturesMqttPlugin.PUBLISH_RUNNING = PropertyMock(side_effect=[True, True, True, False])
+
+        plugin: NeuronFeaturesMqttPlugin = NeuronFeaturesMqttPlugin(neuron, AsyncMock(spec=Client))
+        feature = neuron.features.by_feature_id("ro_2_01", feature_types=["RO"])
+        assert isinstance(feature, Relay)
+
+        # The relay is OFF, the command is skipped while the publish loop runs.
+        plugin.commands.put(feature, False)
+        await plugin._publish(  # noqa: SLF001
+            scan_type="tcp", hardware_types=["Neuron"], feature_types=["DI", "DO", "RO"], sleep=25e-3
+        )
+
+        statistics_logs: List[str] = [
+            record.getMessage() for record in caplog.records if "Statistics" in record.getMessage()
+        ]
+
+        # Unchanged statistics are not logged again.
+        assert statistics_logs == [
+            "[MQTT] [mocked_unipi] Statistics: superseded messages: 0, dropped messages: 0, skipped commands: 0",
+            "[MQTT] [mocked_unipi] Statistics: superseded messages: 0, dropped messages: 0, skipped commands: 1",
+        ]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_BOARDS, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_publish_boards(self, mocker: MockerFixture, neuron: Neuron) -> None:
+        """Test that the states are published as one message per changed board and as a snapshot."""
+        mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
+        mocker.patch("unipi_control.modbus.ModbusCacheData.scan")
+
+        NeuronFeaturesMqttPlugin.PUBLISH_RUNNING = PropertyMock(side_effect=[True, True, False])
+
+        plugin: NeuronFeaturesMqttPlugin = NeuronFeaturesMqttPlugin(neuron, mock_mqtt_client)
+        await plugin._publish(  # noqa: SLF001
+            scan_type="tcp", hardware_types=["Neuron"], feature_types=["DI", "DO", "RO"], sleep=25e-3
+        )
+
+        messages: Dict[str, Dict[str, str]] = {
+            publish_call.kwargs["topic"]: json.loads(publish_call.kwargs["payload"])
+            for publish_call in mock_mqtt_client.publish.call_args_list
+        }
+
+        # Nothing changed in the second scan and the snapshot is not due.
+        assert mock_mqtt_client.publish.call_count == 4
+        assert list(messages) == [
+            "mocked_unipi/board/1/get",
+            "mocked_unipi/board/2/get",
+            "mocked_unipi/board/3/get",
+            "mocked_unipi/state/get",
+        ]
+        assert messages["mocked_unipi/board/1/get"] == {
+            **{f"di_1_{index:02d}": "OFF" for index in range(1, 5)},
+            **{f"do_1_{index:02d}": "OFF" for index in range(1, 5)},
+        }
+        assert messages["mocked_unipi/board/2/get"]["ro_2_12"] == "ON"
+        assert messages["mocked_unipi/state/get"] == {
+            **messages["mocked_unipi/board/1/get"],
+            **messages["mocked_unipi/board/2/get"],
+            **messages["mocked_unipi/board/3/get"],
+        }
+        assert set(messages["mocked_unipi/state/get"].values()) <= {"ON", "OFF"}
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_STRUCT_CODEC, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_publish_boards_struct(self, mocker: MockerFixture, neuron: Neuron) -> None:
+        """Test that the board and snapshot states are packed as described in the schema topics."""
+        mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
+        mocker.patch("unipi_control.modbus.ModbusCacheData.scan")
+
+        NeuronFeaturesMqttPlugin.PUBLISH_RUNNING = PropertyMock(side_effect=[True, True, False])
+
+        plugin: NeuronFeaturesMqttPlugin = NeuronFeaturesMqttPlugin(neuron, mock_mqtt_client)
+        await plugin._publish(  # noqa: SLF001
+            scan_type="tcp", hardware_types=["Neuron"], feature_types=["DI", "DO", "RO"], sleep=25e-3
+        )
+
+        messages: Dict[str, Any] = {
+            publish_call.kwargs["topic"]: publish_call.kwargs["payload"]
+            for publish_call in mock_mqtt_client.publish.call_args_list
+        }
+        schema: Dict[str, Any] = json.loads(messages["mocked_unipi/state/schema"])
+        states: Dict[str, bool] = dict(
+            zip(schema["fields"], struct.unpack(schema["format"], messages["mocked_unipi/state/get"]))
+        )
+
+        # The per-feature topics keep their text payloads.
+        assert messages["mocked_unipi/relay/ro_2_12/get"] == "ON"
+        assert json.loads(messages["mocked_unipi/board/1/schema"]) == {
+            "format": "<8?",
+            "fields": [
+                *(f"di_1_{index:02d}" for index in range(1, 5)),
+                *(f"do_1_{index:02d}" for index in range(1, 5)),
+            ],
+        }
+        assert messages["mocked_unipi/board/1/get"] == bytes(8)
+        assert states["ro_2_12"] is True
+        assert states["ro_2_01"] is False
+        assert len(states) == len(messages["mocked_unipi/state/get"])
+
+    @pytest.mark.parametrize(
+        ("payload", "expected"),
+        [
+            ('{"ro_2_01": "ON", "do_1_01": "OFF"}', {"ro_2_01": "ON", "do_1_01": "OFF"}),
+            ("ro_2_01=ON,do_1_01=OFF", {"ro_2_01": "ON", "do_1_01": "OFF"}),
+            ("ro_2_01=ON do_1_01=OFF", {"ro_2_01": "ON", "do_1_01": "OFF"}),
+        ],
+    )
+    def test_parse_bulk_payload(self, payload: str, expected: Dict[str, str]) -> None:
+        """Test parsing the bulk command payload."""
+        assert NeuronFeaturesMqttPlugin.parse_bulk_payload(payload) == expected
+
+
+class TestUnhappyPathNeuronFeaturesMqttPlugin:
+    @pytest.mark.parametrize(
+        ("payload", "expected"),
+        [
+            ('["ro_2_01"]', "Expected a JSON object"),
+            ('{"ro_2_01": "TOGGLE"}', "Invalid value 'TOGGLE' for 'ro_2_01'"),
+            ("ro_2_01", "Expected 'feature_id=ON|OFF', got 'ro_2_01'"),
+        ],
+    )
+    def test_parse_bulk_payload(self, payload: str, expected: str) -> None:
+        """Test parsing an invalid bulk command payload."""
+        with pytest.raises(ValueError, match=re.escape(expected)):
+            NeuronFeaturesMqttPlugin.parse_bulk_payload(payload)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_subscribe_unknown_topic(self, mocker: MockerFixture, neuron: Neuron) -> None:
+        """Test that messages on the wildcard subscription without a matching feature are ignored."""
+        plugin: NeuronFeaturesMqttPlugin = NeuronFeaturesMqttPlugin(neuron, AsyncMock(spec=Client))
+        mock_put: MagicMock = mocker.patch.object(plugin.commands, "put")
+
+        feature = neuron.features.by_feature_id("ro_2_01", feature_types=["RO"])
+        assert isinstance(feature, Relay)
+
+        plugin.command_topics["mocked_unipi/relay/ro_2_01/set"] = feature
+
+        await plugin._subscribe(MockMQTTMessages([b"""ON"""], topic="mocked_unipi/relay/ro_9_99/set"))  # noqa: SLF001
+        await plugin._subscribe(MockMQTTMessages([b"""ON"""], topic="mocked_unipi/relay/ro_2_01/set"))  # noqa: SLF001
+
+        mock_put.assert_called_once_with(feature, True)
+
 
 class TestHappyPathMeterFeaturesMqttPlugin:
     @pytest.mark.asyncio()
@@ -97,7 +355,7 @@ class TestHappyPathMeterFeaturesMqttPlugin:
 
         logs: List[str] = [record.getMessage() for record in caplog.records]
 
-        assert mock_modbus_cache_data_scan.mock_calls == [call("serial", ["Extension"])]
+        assert mock_modbus_cache_data_scan.mock_calls == [call("serial", ["Extension"], port="/dev/MOCKED")]
 
         assert "[MQTT] [mocked_unipi/meter/voltage_1/get] Publishing message: 235.2" in logs
         assert "[MQTT] [mocked_unipi/meter/current_1/get] Publishing message: 0.29" in logs
@@ -121,3 +379,66 @@ class TestHappyPathMeterFeaturesMqttPlugin:
         assert "[MQTT] [mocked_unipi/meter/maximum_current_demand_1/get] Publishing message: 0.71" in logs
         assert "[MQTT] [mocked_unipi/meter/total_active_energy_1/get] Publishing message: 4.42" in logs
         assert "[MQTT] [mocked_unipi/meter/total_reactive_energy_1/get] Publishing message: 3.03" in logs
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_STRUCT_CODEC, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_publish_unit_struct(self, mocker: MockerFixture, neuron: Neuron) -> None:
+        """Test that all meter values of an extension unit are packed as float32 next to the meter topics."""
+        mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
+        mocker.patch("unipi_control.modbus.ModbusCacheData.scan")
+
+        MeterFeaturesMqttPlugin.PUBLISH_RUNNING = PropertyMock(side_effect=[True, False])
+
+        plugin: MeterFeaturesMqttPlugin = MeterFeaturesMqttPlugin(neuron, mock_mqtt_client)
+        await plugin._publish(  # noqa: SLF001
+            scan_type="serial", hardware_types=["Extension"], feature_types=["METER"], sleep=25e-3, port="/dev/MOCKED"
+        )
+
+        messages: Dict[str, Any] = {
+            publish_call.kwargs["topic"]: publish_call.kwargs["payload"]
+            for publish_call in mock_mqtt_client.publish.call_args_list
+        }
+        schema: Dict[str, Any] = json.loads(messages["mocked_unipi/unit/1/schema"])
+        values: Dict[str, float] = dict(
+            zip(schema["fields"], struct.unpack(schema["format"], messages["mocked_unipi/unit/1/get"]))
+        )
+
+        # Meters have no snapshot, and their Home Assistant topics keep the text payloads.
+        assert "mocked_unipi/state/get" not in messages
+        assert messages["mocked_unipi/meter/voltage_1/get"] == 235.2
+        assert schema["format"] == f"<{len(schema['fields'])}f"
+        assert len(messages["mocked_unipi/unit/1/get"]) == 4 * len(schema["fields"])
+        assert values["voltage_1"] == pytest.approx(235.2)
+        assert values["total_reactive_energy_1"] == pytest.approx(3.03)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_feature_command_queue_write_failed(
+        self, mocker: MockerFixture, neuron: Neuron, caplog: LogCaptureFixture
+    ) -> None:
+        """Test that a failed write is logged and doesn't block later commands of the feature."""
+        feature = neuron.features.by_feature_id("ro_2_01", feature_types=["RO"])
+        assert isinstance(feature, Relay)
+
+        mock_set_state: AsyncMock = mocker.patch.object(
+            Relay, "set_state", new_callable=AsyncMock, side_effect=[RuntimeError("MOCKED ERROR"), None]
+        )
+        commands: FeatureCommandQueue = FeatureCommandQueue()
+
+        commands.put(feature, True)
+        await commands.join()
+        await asyncio.sleep(0)
+
+        commands.put(feature, True)
+        await commands.join()
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert "[MQTT] Can't write ro_2_01: MOCKED ERROR" in logs
+        assert mock_set_state.await_count == 2
@@ -0,0 +1,32 @@
+"""Data for MQTT features unit tests."""
+
+from typing import Final
+
+CONFIG_CONTENT_WITH_BOARDS: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+mqtt:
+  publish_mode: boards
+  snapshot_interval: 60
+logging:
+  level: debug
+"""
+
+CONFIG_CONTENT_WITH_STRUCT_CODEC: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+mqtt:
+  publish_mode: all
+  snapshot_interval: 60
+  payload_codec: struct
+modbus_serial:
+  port: /dev/MOCKED
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: MOCKED_EASTRON
+logging:
+  level: debug
+"""
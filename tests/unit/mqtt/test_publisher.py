@@ -0,0 +1,113 @@
+"""Unit tests for the MQTT publisher."""
+
+import asyncio
+from typing import List
+from typing import Tuple
+from unittest.mock import AsyncMock
+
+import pytest
+from aiomqtt import Client
+from aiomqtt import MqttError
+
+from unipi_control.mqtt.publisher import MqttPayload
+from unipi_control.mqtt.publisher import MqttPublisher
+
+
+class TestHappyPathMqttPublisher:
+    @pytest.mark.asyncio()
+    async def test_publish(self) -> None:
+        """Test that messages are published in order without waiting for the acknowledgements."""
+        acknowledge: asyncio.Event = asyncio.Event()
+        topics: List[str] = []
+
+        async def publish(topic: str, **_: object) -> None:
+            topics.append(topic)
+            await acknowledge.wait()
+
+        mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
+        mock_mqtt_client.publish.side_effect = publish
+
+        publisher: MqttPublisher = MqttPublisher(mock_mqtt_client, max_inflight_messages=2)
+
+        publisher.publish(topic="mocked_unipi/relay/ro_2_01/get", payload="ON")
+        publisher.publish(topic="mocked_unipi/relay/ro_2_02/get", payload="OFF")
+        publisher.publish(topic="mocked_unipi/relay/ro_2_03/get", payload="ON")
+        await asyncio.sleep(0)
+
+        # The third message waits for a free slot.
+        assert publisher.in_flight == 2
+        assert publisher.queued == 1
+
+        acknowledge.set()
+        await publisher.join()
+
+        assert publisher.in_flight == 0
+        assert publisher.queued == 0
+        assert topics == [
+            "mocked_unipi/relay/ro_2_01/get",
+            "mocked_unipi/relay/ro_2_02/get",
+            "mocked_unipi/relay/ro_2_03/get",
+        ]
+
+    @pytest.mark.asyncio()
+    async def test_latest_value_wins(self) -> None:
+        """Test that only the newest payload of a topic is published while the broker is busy."""
+        acknowledge: asyncio.Event = asyncio.Event()
+        messages: List[Tuple[str, MqttPayload]] = []
+
+        async def publish(topic: str, payload: MqttPayload, **_: object) -> None:
+            messages.append((topic, payload))
+            await acknowledge.wait()
+
+        mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
+        mock_mqtt_client.publish.side_effect = publish
+
+        publisher: MqttPublisher = MqttPublisher(mock_mqtt_client, max_inflight_messages=1)
+
+        publisher.publish(topic="mocked_unipi/meter/voltage_1/get", payload=230.1)
+        await asyncio.sleep(0)
+
+        for voltage in (230.2, 230.3, 230.4):
+            publisher.publish(topic="mocked_unipi/meter/voltage_1/get", payload=voltage)
+
+        publisher.publish(topic="mocked_unipi/relay/ro_2_01/get", payload="ON")
+
+        assert publisher.queued == 2
+
+        acknowledge.set()
+        await publisher.join()
+
+        assert publisher.superseded == 2
+        assert publisher.dropped == 0
+        assert publisher.statistics == {"superseded messages": 2, "dropped messages": 0}
+        assert messages == [
+            ("mocked_unipi/meter/voltage_1/get", 230.1),
+            ("mocked_unipi/meter/voltage_1/get", 230.4),
+            ("mocked_unipi/relay/ro_2_01/get", "ON"),
+        ]
+
+
+class TestUnhappyPathMqttPublisher:
+    @pytest.mark.asyncio()
+    async def test_publish_error(self) -> None:
+        """Test that a failed publish drops the queue and is raised once, so the MQTT connection is restarted."""
+        mock_mqtt_client: AsyncMock = AsyncMock(spec=Client)
+        mock_mqtt_client.publish.side_effect = MqttError("Disconnected during message iteration")
+
+        publisher: MqttPublisher = MqttPublisher(mock_mqtt_client, max_inflight_messages=1)
+
+        publisher.publish(topic="mocked_unipi/relay/ro_2_01/get", payload="ON")
+        publisher.publish(topic="mocked_unipi/relay/ro_2_02/get", payload="OFF")
+        publisher.publish(topic="mocked_unipi/relay/ro_2_03/get", payload="ON")
+
+        with pytest.raises(MqttError, match="Disconnected during message iteration"):
+            await publisher.join()
+
+        assert publisher.dropped == 2
+        assert mock_mqtt_client.publish.await_count == 1
+
+        mock_mqtt_client.publish.side_effect = None
+        publisher.publish(topic="mocked_unipi/relay/ro_2_01/get", payload="OFF")
+        await publisher.join()
+
+        assert mock_mqtt_client.publish.await_count == 2
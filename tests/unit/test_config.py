@@ -30,17 +30,30 @@ from tests.unit.test_config_data import CONFIG_INVALID_COVER_ID
 from tests.unit.test_config_data import CONFIG_INVALID_COVER_TYPE
 from tests.unit.test_config_data import CONFIG_INVALID_DEVICE_CLASS
 from tests.unit.test_config_data import CONFIG_INVALID_DEVICE_NAME
+from tests.unit.test_config_data import CONFIG_DUPLICATE_REMOTE_NEURON_NAME
+from tests.unit.test_config_data import CONFIG_DUPLICATE_SERIAL_BUS_PORT
+from tests.unit.test_config_data import CONFIG_DUPLICATE_SERIAL_BUS_UNIT
 from tests.unit.test_config_data import CONFIG_INVALID_FEATURE_ID
+from tests.unit.test_config_data import CONFIG_INVALID_FEATURE_MIN_WRITE_INTERVAL
 from tests.unit.test_config_data import CONFIG_INVALID_FEATURE_TYPE
 from tests.unit.test_config_data import CONFIG_INVALID_HOMEASSISTANT_DISCOVERY_PREFIX
 from tests.unit.test_config_data import CONFIG_INVALID_LOG_LEVEL
 from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_BAUD_RATE
 from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_PARITY
+from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_PIPELINE_WINDOW
+from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_POLLING
+from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_REGISTER_GAP
+from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_TRANSPORT
+from tests.unit.test_config_data import CONFIG_INVALID_MODBUS_UNIT_TIMEOUT
+from tests.unit.test_config_data import CONFIG_INVALID_MQTT_MAX_INFLIGHT_MESSAGES
+from tests.unit.test_config_data import CONFIG_INVALID_MQTT_PAYLOAD_CODEC
 from tests.unit.test_config_data import CONFIG_INVALID_MQTT_PORT_TYPE
+from tests.unit.test_config_data import CONFIG_INVALID_MQTT_PUBLISH_MODE
 from tests.unit.test_config_data import CONFIG_INVALID_PERSISTENT_TMP_DIR
 from tests.unit.test_config_data import CONFIG_LOGGING_LEVEL_ERROR
 from tests.unit.test_config_data import CONFIG_LOGGING_LEVEL_INFO
 from tests.unit.test_config_data import CONFIG_MISSING_COVER_KEY
+from tests.unit.test_config_data import CONFIG_MISSING_REMOTE_NEURON_MODEL
 from tests.unit.test_config_data import CONFIG_MISSING_DEVICE_NAME
 from tests.unit.test_config_data import EXTENSION_HARDWARE_DATA_INVALID_KEY
 from tests.unit.test_config_data import EXTENSION_HARDWARE_DATA_IS_INVALID_YAML
@@ -49,10 +62,12 @@ from tests.unit.test_config_data import HARDWARE_DATA_INVALID_KEY
 from tests.unit.test_config_data import HARDWARE_DATA_IS_INVALID_YAML
 from tests.unit.test_config_data import HARDWARE_DATA_IS_LIST
 from unipi_control.config import Config
+from unipi_control.config import HardwareMap
 from unipi_control.config import UNIPI_LOGGER
 from unipi_control.helpers.exception import ConfigError
 from unipi_control.helpers.log import SIMPLE_LOG_FORMAT
 from unipi_control.helpers.typing import ModbusClient
+from unipi_control.helpers.typing import ModbusRegisterBlock
 from unipi_control.neuron import Neuron
 
 
@@ -239,6 +254,102 @@ class TestHappyPathConfig:
 
         assert config.unipi_tmp_dir == Path(expected)
 
+    @pytest.mark.parametrize(
+        ("modbus_register_blocks", "max_register_gap", "expected"),
+        [
+            (
+                [
+                    {"start_reg": 0, "count": 2, "slave": 1},
+                    {"start_reg": 2, "count": 3, "slave": 1},
+                    {"start_reg": 5, "count": 16, "slave": 1},
+                    {"start_reg": 1000, "count": 32, "slave": 1},
+                    {"start_reg": 100, "count": 2, "slave": 2},
+                    {"start_reg": 102, "count": 12, "slave": 2},
+                    {"start_reg": 114, "count": 14, "slave": 2},
+                ],
+                0,
+                [
+                    {"start_reg": 0, "count": 21, "slave": 1, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 1000, "count": 32, "slave": 1, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 100, "count": 28, "slave": 2, "interval": 0.0, "max_staleness": None},
+                ],
+            ),
+            (
+                [
+                    {"start_reg": 20, "count": 1},
+                    {"start_reg": 0, "count": 2},
+                    {"start_reg": 100, "count": 2},
+                ],
+                0,
+                [
+                    {"start_reg": 0, "count": 2, "slave": 0, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 20, "count": 1, "slave": 0, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 100, "count": 2, "slave": 0, "interval": 0.0, "max_staleness": None},
+                ],
+            ),
+            (
+                [
+                    {"start_reg": 0, "count": 2},
+                    {"start_reg": 6, "count": 2},
+                    {"start_reg": 12, "count": 2},
+                    {"start_reg": 70, "count": 10},
+                ],
+                4,
+                [
+                    {"start_reg": 0, "count": 14, "slave": 0, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 70, "count": 10, "slave": 0, "interval": 0.0, "max_staleness": None},
+                ],
+            ),
+            (
+                [
+                    {"start_reg": 0, "count": 100},
+                    {"start_reg": 100, "count": 50},
+                ],
+                0,
+                [
+                    {"start_reg": 0, "count": 100, "slave": 0, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 100, "count": 50, "slave": 0, "interval": 0.0, "max_staleness": None},
+                ],
+            ),
+            (
+                [
+                    {"start_reg": 0, "count": 20, "slave": 1},
+                    {"start_reg": 20, "count": 6, "slave": 1, "interval": 60},
+                    {"start_reg": 26, "count": 4, "slave": 1},
+                    {"start_reg": 1000, "count": 32, "slave": 1, "interval": 60},
+                ],
+                0,
+                [
+                    {"start_reg": 0, "count": 20, "slave": 1, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 26, "count": 4, "slave": 1, "interval": 0.0, "max_staleness": None},
+                    {"start_reg": 20, "count": 6, "slave": 1, "interval": 60.0, "max_staleness": None},
+                    {"start_reg": 1000, "count": 32, "slave": 1, "interval": 60.0, "max_staleness": None},
+                ],
+            ),
+            (
+                [
+                    {"start_reg": 0, "count": 2, "slave": 1, "max_staleness": 5},
+                    {"start_reg": 2, "count": 2, "slave": 1, "max_staleness": 1},
+                    {"start_reg": 4, "count": 2, "slave": 1},
+                ],
+                0,
+                [
+                    {"start_reg": 0, "count": 6, "slave": 1, "interval": 0.0, "max_staleness": 1},
+                ],
+            ),
+        ],
+    )
+    def test_compile_scan_plan(
+        self,
+        modbus_register_blocks: List[ModbusRegisterBlock],
+        max_register_gap: int,
+        expected: List[ModbusRegisterBlock],
+    ) -> None:
+        """Test merging register blocks into a minimal read plan."""
+        assert (
+            HardwareMap.compile_scan_plan(modbus_register_blocks, unit=0, max_register_gap=max_register_gap) == expected
+        )
+
 
 class TestUnhappyPathConfig:
     @pytest.mark.parametrize(
@@ -258,6 +369,10 @@ class TestUnhappyPathConfig:
                 "[HOMEASSISTANT] Invalid value 'invalid discovery name' in 'discovery_prefix'. "
                 "The following characters are prohibited: a-z 0-9 -_",
             ),
+            (
+                (CONFIG_INVALID_FEATURE_MIN_WRITE_INTERVAL, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[FEATURE] Invalid value '-1' in 'min_write_interval'. The value must be greater than or equal 0.",
+            ),
             (
                 (CONFIG_INVALID_FEATURE_TYPE, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 "Expected features to be <class 'dict'>, got 'INVALID'",
@@ -324,10 +439,68 @@ class TestUnhappyPathConfig:
                 (CONFIG_INVALID_MODBUS_PARITY, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 "[MODBUS] Invalid value 'S' in 'parity'. The following parity options are allowed: E O N.",
             ),
+            (
+                (CONFIG_INVALID_MODBUS_REGISTER_GAP, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Invalid value '-1' in 'max_register_gap'. The value must be greater than or equal 0.",
+            ),
+            (
+                (CONFIG_INVALID_MODBUS_POLLING, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                (
+                    "[MODBUS] Invalid value 'random' in 'polling'. "
+                    "The following polling modes are allowed: all round_robin."
+                ),
+            ),
+            (
+                (CONFIG_INVALID_MQTT_PUBLISH_MODE, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                (
+                    "[MQTT] Invalid value 'scan' in 'publish_mode'. "
+                    "The following publish modes are allowed: features boards all."
+                ),
+            ),
+            (
+                (CONFIG_INVALID_MQTT_PAYLOAD_CODEC, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                (
+                    "[MQTT] Invalid value 'cbor' in 'payload_codec'. "
+                    "The following payload codecs are allowed: text struct."
+                ),
+            ),
+            (
+                (CONFIG_INVALID_MQTT_MAX_INFLIGHT_MESSAGES, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MQTT] Invalid value '0' in 'max_inflight_messages'. The value must be greater than or equal 1.",
+            ),
+            (
+                (CONFIG_INVALID_MODBUS_PIPELINE_WINDOW, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Invalid value '0' in 'pipeline_window'. The value must be greater than or equal 1.",
+            ),
+            (
+                (CONFIG_INVALID_MODBUS_TRANSPORT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Invalid value 'fast' in 'transport'. The following transports are allowed: pymodbus lean.",
+            ),
+            (
+                (CONFIG_INVALID_MODBUS_UNIT_TIMEOUT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Invalid value '0' in 'timeout'. The value must be greater than 0.",
+            ),
+            (
+                (CONFIG_DUPLICATE_REMOTE_NEURON_NAME, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Duplicate name 'MOCKED-UNIPI' found in 'remote_neurons'!",
+            ),
+            (
+                (CONFIG_MISSING_REMOTE_NEURON_MODEL, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Required key 'model' is missing! RemoteNeuronConfig(name='MOCKED REMOTE UNIPI', "
+                "host='192.168.1.2', port=502, model='', suggested_area='', features={})",
+            ),
             (
                 (CONFIG_DUPLICATE_MODBUS_UNIT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 "[MODBUS] Duplicate modbus unit '1' found in 'units'!",
             ),
+            (
+                (CONFIG_DUPLICATE_SERIAL_BUS_PORT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Duplicate port '/dev/extcomm/0/0' found in 'modbus_serial_buses'!",
+            ),
+            (
+                (CONFIG_DUPLICATE_SERIAL_BUS_UNIT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                "[MODBUS] Duplicate modbus unit '1' found in 'units'!",
+            ),
             (
                 (CONFIG_MISSING_DEVICE_NAME, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
                 "[MODBUS] Device name for unit '1' is missing!",
@@ -214,6 +214,16 @@ features:
 logging:
   level: debug"""
 
+CONFIG_INVALID_FEATURE_MIN_WRITE_INTERVAL: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+features:
+  ro_2_01:
+    min_write_interval: -1
+logging:
+  level: debug"""
+
 CONFIG_INVALID_MODBUS_BAUD_RATE: Final[
     str
 ] = """device_info:
@@ -234,6 +244,130 @@ modbus_serial:
 logging:
   level: debug"""
 
+CONFIG_INVALID_MODBUS_REGISTER_GAP: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_tcp:
+  max_register_gap: -1
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MQTT_PUBLISH_MODE: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+mqtt:
+  publish_mode: scan
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MQTT_PAYLOAD_CODEC: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+mqtt:
+  payload_codec: cbor
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MQTT_MAX_INFLIGHT_MESSAGES: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+mqtt:
+  max_inflight_messages: 0
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MODBUS_PIPELINE_WINDOW: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_tcp:
+  pipeline_window: 0
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MODBUS_TRANSPORT: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_tcp:
+  transport: fast
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MODBUS_UNIT_TIMEOUT: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial:
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: Eastron_SDM120M
+      timeout: 0
+logging:
+  level: debug"""
+
+CONFIG_DUPLICATE_REMOTE_NEURON_NAME: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+remote_neurons:
+  - name: MOCKED-UNIPI
+    host: 192.168.1.2
+    model: L203
+logging:
+  level: debug"""
+
+CONFIG_MISSING_REMOTE_NEURON_MODEL: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+remote_neurons:
+  - name: MOCKED REMOTE UNIPI
+    host: 192.168.1.2
+logging:
+  level: debug"""
+
+CONFIG_DUPLICATE_SERIAL_BUS_PORT: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial_buses:
+  - port: /dev/extcomm/0/0
+logging:
+  level: debug"""
+
+CONFIG_DUPLICATE_SERIAL_BUS_UNIT: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial:
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: Eastron_SDM120M
+modbus_serial_buses:
+  - port: /dev/extcomm/1/0
+    units:
+      - unit: 1
+        device_name: MOCKED Eastron SDM120M
+        identifier: Eastron_SDM120M
+logging:
+  level: debug"""
+
+CONFIG_INVALID_MODBUS_POLLING: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial:
+  polling: random
+logging:
+  level: debug"""
+
 CONFIG_DUPLICATE_MODBUS_UNIT: Final[
     str
 ] = """device_info:
@@ -1,7 +1,10 @@
 """Unit tests for input and output features."""
 
+from typing import Dict
+from typing import List
 from typing import NamedTuple
 from typing import Optional
+from typing import Set
 from typing import Union
 from unittest.mock import MagicMock
 
@@ -12,6 +15,7 @@ from tests.conftest import MockModbusClient
 from tests.conftest_data import CONFIG_CONTENT
 from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
 from tests.conftest_data import HARDWARE_DATA_CONTENT
+from tests.unit.test_features_data import CONFIG_CONTENT_WITH_DISABLED_FEATURES
 from unipi_control.features.extensions import EastronMeter
 from unipi_control.features.neuron import DigitalInput
 from unipi_control.features.neuron import DigitalOutput
@@ -96,6 +100,8 @@ class TestHappyPathFeatures:
             assert feature.val_coil == expected.coil
             assert feature.payload == ("ON" if expected.value == 1 else "OFF")
             assert await feature.set_state(False)
+            assert feature.value == 0
+            assert neuron.modbus_cache_data.written.is_set()
         elif isinstance(feature, EastronMeter):
             assert feature.payload == expected.value
 
@@ -124,6 +130,95 @@ class TestHappyPathFeatures:
 
         assert feature.sw_version == expected
 
+    @pytest.mark.parametrize(
+        ("config_loader", "registers", "feature_types", "expected"),
+        [
+            (
+                (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                {0: {101}},
+                ["DI", "RO"],
+                [f"ro_2_{index:02d}" for index in range(1, 15)],
+            ),
+            (
+                (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                {0: {0, 20}},
+                ["DI", "DO"],
+                [f"di_1_{index:02d}" for index in range(1, 5)],
+            ),
+            (
+                (CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT),
+                {1: {12, 13}, 0: {200}},
+                ["METER"],
+                ["active_power_1"],
+            ),
+        ],
+        indirect=["config_loader"],
+    )
+    def test_features_by_registers(
+        self, neuron: Neuron, registers: Dict[int, Set[int]], feature_types: List[str], expected: List[str]
+    ) -> None:
+        """Test that only features from changed registers are returned."""
+        assert [
+            feature.feature_id for feature in neuron.features.by_registers(registers, feature_types=feature_types)
+        ] == expected
+
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    def test_digital_state_vector(self, neuron: Neuron) -> None:
+        """Test that only bit-mapped features with a changed state are returned."""
+        registers: Dict[int, Set[int]] = {0: {100, 101}}
+
+        assert len(neuron.features.digital_states.changed(registers, feature_types=["DI", "RO"])) == 30
+        assert neuron.features.digital_states.changed(registers, feature_types=["DI", "RO"]) == []
+
+        register_image = neuron.modbus_cache_data.data[0]
+        register_image.begin()
+        register_image.write(100, [16384 | 0x1, 8192])
+        register_image.commit()
+
+        changed = neuron.features.digital_states.changed(registers, feature_types=["DI", "RO"])
+
+        assert [feature.feature_id for feature in changed] == ["di_2_01", "ro_2_12"]
+        assert [feature.saved_value for feature in changed] == [1, 0]
+        assert [feature.value for feature in changed] == [1, 0]
+
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_DISABLED_FEATURES, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    def test_disabled_features(self, neuron: Neuron) -> None:
+        """Test that disabled features are not registered."""
+        feature_ids: List[str] = [feature.feature_id for feature in neuron.features.by_feature_types(["DI"])]
+
+        assert "di_1_01" not in feature_ids
+        assert "di_1_02" in feature_ids
+        assert len(feature_ids) == 35
+
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    def test_compile_feature_scan_plans(self, neuron: Neuron) -> None:
+        """Test that the scan plans only read registers from registered features."""
+        assert neuron.hardware["neuron"].modbus_scan_plan == [
+            {"start_reg": 0, "count": 2, "slave": 0, "interval": 0.0, "max_staleness": None},
+            {"start_reg": 20, "count": 1, "slave": 0, "interval": 0.0, "max_staleness": None},
+            {"start_reg": 100, "count": 2, "slave": 0, "interval": 0.0, "max_staleness": None},
+            {"start_reg": 200, "count": 2, "slave": 0, "interval": 0.0, "max_staleness": None},
+        ]
+
+        neuron.hardware.compile_feature_scan_plans({0: {1, 100, 101}, 1: {12, 13, 72, 73}})
+
+        assert neuron.hardware["neuron"].modbus_scan_plan == [
+            {"start_reg": 1, "count": 1, "slave": 0, "interval": 0.0, "max_staleness": None},
+            {"start_reg": 100, "count": 2, "slave": 0, "interval": 0.0, "max_staleness": None},
+        ]
+        assert neuron.hardware["modbus_rtu_1"].modbus_scan_plan == [
+            {"start_reg": 12, "count": 2, "slave": 1, "interval": 0.0, "max_staleness": None},
+            {"start_reg": 72, "count": 2, "slave": 1, "interval": 0.0, "max_staleness": None},
+        ]
+
 
 class TestUnhappyPathFeatures:
     @pytest.mark.parametrize(
@@ -0,0 +1,30 @@
+"""Data for feature unit tests."""
+
+from typing import Final
+
+CONFIG_CONTENT_WITH_DISABLED_FEATURES: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+  suggested_area: MOCKED AREA
+mqtt:
+  host: localhost
+  port: 1883
+modbus_tcp:
+  host: MOCKED_MODBUS_HOST
+  port: 123
+modbus_serial:
+  port: /dev/MOCKED
+  baud_rate: 2400
+  parity: N
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: MOCKED_EASTRON
+      suggested_area: Workspace
+features:
+  di_1_01:
+    enabled: false
+logging:
+  level: debug
+"""
@@ -1,28 +1,507 @@
 """Unit tests for modbus."""
 
 import asyncio
+import re
+from functools import partial
 from typing import Any
 from typing import Callable
 from typing import List
+from typing import Optional
+from typing import Tuple
 from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
 from unittest.mock import PropertyMock
+from unittest.mock import call
 
 import pytest
 from _pytest.logging import LogCaptureFixture
 from pymodbus.exceptions import ModbusException
+from pymodbus.pdu import ModbusResponse
 from pytest_mock import MockerFixture
 
 from tests.conftest import ConfigLoader
 from tests.conftest import MockHardwareInfo
+from tests.conftest import MockModbusClient
+from tests.conftest import MockRegisterReader
+from tests.conftest import create_modbus_response
 from tests.conftest_data import CONFIG_CONTENT
 from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
 from tests.conftest_data import HARDWARE_DATA_CONTENT
+from tests.unit.test_modbus_data import CONFIG_CONTENT_WITH_PIPELINE
+from tests.unit.test_modbus_data import CONFIG_CONTENT_WITH_ROUND_ROBIN
+from tests.unit.test_modbus_data import CONFIG_CONTENT_WITH_SERIAL_BUSES
+from tests.unit.test_modbus_data import CONFIG_CONTENT_WITH_UNIT_POLICY
+from tests.unit.test_modbus_data import EXTENSION_HARDWARE_DATA_CONTENT_WITH_STALENESS
+from tests.unit.test_modbus_data import HARDWARE_DATA_CONTENT_WITH_INTERVAL
+from tests.unit.test_modbus_data import HARDWARE_DATA_CONTENT_WITH_SLAVES
 from unipi_control.config import Config
 from unipi_control.config import HardwareType
+from unipi_control.config import LogPrefix
 from unipi_control.helpers.typing import ModbusClient
+from unipi_control.modbus import CoilWriteCoalescer
+from unipi_control.modbus import ModbusCircuitBreaker
+from unipi_control.modbus import ModbusErrorLog
+from unipi_control.modbus import ModbusScheduler
+from unipi_control.modbus import RegisterImage
+from unipi_control.modbus import SerialBusScheduler
 from unipi_control.neuron import Neuron
 
 
+class TestHappyPathModbus:
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT_WITH_SLAVES, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_concurrent_scan(
+        self, scan_neuron: Neuron, register_reader: MockRegisterReader, caplog: LogCaptureFixture
+    ) -> None:
+        """Test that a slow slave doesn't block the register blocks from other slaves."""
+        calls: List[str] = []
+
+        async def slow_slave(address: int, _: int, slave: int) -> None:
+            calls.append(f"start {slave}:{address}")
+
+            if slave == 1:
+                await asyncio.sleep(0.1)
+                raise asyncio.exceptions.TimeoutError
+
+            calls.append(f"done {slave}:{address}")
+
+        register_reader.hook = slow_slave
+
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert calls[:3] == ["start 1:0", "start 2:100", "done 2:100"]
+        assert scan_neuron.modbus_cache_data.get_register(address=100, index=2, unit=0).tolist() == [100, 100]
+        assert "[MODBUS] Timeout on: {'address': 0, 'count': 2, 'slave': 1}" in logs
+        assert "[MODBUS] Timeout on: {'address': 20, 'count': 1, 'slave': 1}" in logs
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_PIPELINE, HARDWARE_DATA_CONTENT_WITH_SLAVES, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_pipelined_scan(self, scan_neuron: Neuron, register_reader: MockRegisterReader) -> None:
+        """Test that the read plan is sent with up to ``pipeline_window`` requests in flight."""
+        calls: List[str] = []
+        in_flight: List[int] = [0]
+
+        async def count_in_flight(address: int, _: int, slave: int) -> None:
+            calls.append(f"start {slave}:{address} ({in_flight[0]} in flight)")
+            in_flight[0] += 1
+            await asyncio.sleep(0.01)
+            in_flight[0] -= 1
+
+        register_reader.hook = count_in_flight
+
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        assert scan_neuron.modbus_cache_data.tcp_scheduler.max_in_flight == 2
+        assert calls == ["start 1:0 (0 in flight)", "start 1:20 (1 in flight)", "start 2:100 (1 in flight)"]
+        assert scan_neuron.modbus_cache_data.get_register(address=100, index=2, unit=0).tolist() == [100, 100]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT_WITH_INTERVAL, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_scan_interval(
+        self, mocker: MockerFixture, scan_neuron: Neuron, register_reader: MockRegisterReader
+    ) -> None:
+        """Test that register blocks with an interval are only read when the interval has elapsed."""
+        mock_monotonic: MagicMock = mocker.patch("unipi_control.modbus.time.monotonic", return_value=100.0)
+
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        assert register_reader.addresses == [0, 1000, 0]
+        assert scan_neuron.modbus_cache_data.get_register(address=1000, index=4, unit=0).tolist() == [1000] * 4
+
+        mock_monotonic.return_value = 160.0
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        assert register_reader.addresses == [0, 1000, 0, 0, 1000]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_ROUND_ROBIN, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT_WITH_STALENESS)],
+        indirect=True,
+    )
+    async def test_round_robin_scan(
+        self,
+        mocker: MockerFixture,
+        scan_neuron: Neuron,
+        register_reader: MockRegisterReader,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        """Test that round-robin polling reads the most urgent serial register block per scan."""
+        mocker.patch("unipi_control.modbus.asyncio.sleep", new_callable=AsyncMock)
+        mock_monotonic: MagicMock = mocker.patch("unipi_control.modbus.time.monotonic", return_value=100.0)
+
+        for _ in range(3):
+            await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        assert register_reader.addresses == [12, 70, 342]
+
+        mock_monotonic.return_value = 100.5
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        assert register_reader.addresses[-1] == 12
+
+        mock_monotonic.return_value = 110.0
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert register_reader.addresses[-1] == 12
+        assert "[MODBUS] Unit 1 missed the staleness target of 5.0s on register 70 (10.00s)." in logs
+        assert "[MODBUS] Unit 1 missed the staleness target of 1s on register 12 (9.50s)." in logs
+        assert not [log for log in logs if "on register 342" in log]
+        assert scan_neuron.modbus_cache_data.staleness_misses == {(1, 1, 12): 1, (1, 1, 70): 1}
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_SERIAL_BUSES, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_serial_buses(self, config_loader: ConfigLoader, hardware_info: PropertyMock) -> None:  # noqa: ARG002
+        """Test that every RS-485 bus is scanned in parallel with its own client."""
+        config: Config = config_loader.get_config()
+        calls: List[Tuple[str, int, int, float]] = []
+        bus_2_started: asyncio.Event = asyncio.Event()
+
+        def create_serial_client(port: str) -> AsyncMock:
+            mock_modbus_serial_client: AsyncMock = AsyncMock()
+
+            async def read_input_registers(address: int, count: int, slave: int) -> Optional[ModbusResponse]:
+                calls.append((port, slave, address, mock_modbus_serial_client.comm_params.timeout_connect))
+
+                if slave == 2:
+                    bus_2_started.set()
+                else:
+                    # The first bus waits for the second bus, so a sequential scan would time out.
+                    await asyncio.wait_for(bus_2_started.wait(), timeout=1)
+
+                return create_modbus_response([address] * count)
+
+            mock_modbus_serial_client.read_input_registers.side_effect = read_input_registers
+
+            return mock_modbus_serial_client
+
+        modbus_client = ModbusClient(
+            tcp=AsyncMock(),
+            serial=create_serial_client("/dev/MOCKED"),
+            serial_buses={"/dev/MOCKED_2": create_serial_client("/dev/MOCKED_2")},
+        )
+        neuron: Neuron = Neuron(config=config, modbus_client=modbus_client)
+
+        await neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        assert {(port, slave) for port, slave, *_ in calls} == {("/dev/MOCKED", 1), ("/dev/MOCKED_2", 2)}
+        assert {timeout for port, _, _, timeout in calls if port == "/dev/MOCKED_2"} == {0.3}
+        assert neuron.modbus_cache_data.get_serial_bus(2).config.port == "/dev/MOCKED_2"
+        assert set(neuron.modbus_cache_data.pop_dirty([HardwareType.EXTENSION], port="/dev/MOCKED_2")) == {2}
+
+        calls.clear()
+        await neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION], port="/dev/MOCKED_2")
+
+        assert {port for port, *_ in calls} == {"/dev/MOCKED_2"}
+
+    @pytest.mark.asyncio()
+    async def test_scheduler_write_priority(self) -> None:
+        """Test that coil writes are sent before queued polling reads."""
+        scheduler: ModbusScheduler = ModbusScheduler()
+        calls: List[str] = []
+        release: asyncio.Event = asyncio.Event()
+
+        async def modbus_call(name: str, **_: int) -> ModbusResponse:
+            calls.append(name)
+
+            if name == "read 1":
+                await release.wait()
+
+            return create_modbus_response()
+
+        def request(name: str, priority: int) -> "asyncio.Task[Optional[ModbusResponse]]":
+            return asyncio.create_task(
+                scheduler.call(partial(modbus_call, name), {"address": 0, "count": 1, "slave": 0}, priority=priority)
+            )
+
+        tasks: List[asyncio.Task[Optional[ModbusResponse]]] = [request("read 1", ModbusScheduler.READ)]
+        await asyncio.sleep(0)
+
+        tasks.append(request("read 2", ModbusScheduler.READ))
+        tasks.append(request("write", ModbusScheduler.WRITE))
+        await asyncio.sleep(0)
+
+        assert calls == ["read 1"]
+
+        release.set()
+        await asyncio.gather(*tasks)
+
+        assert calls == ["read 1", "write", "read 2"]
+        assert scheduler.wait_times[ModbusScheduler.READ].count == 2
+        assert scheduler.wait_times[ModbusScheduler.WRITE].count == 1
+        assert scheduler.wait_times[ModbusScheduler.WRITE].max > 0
+
+    @pytest.mark.asyncio()
+    async def test_scheduler_log_wait_times(self, caplog: LogCaptureFixture) -> None:
+        """Test that the wait times are logged per priority and reset once per log interval."""
+        scheduler: ModbusScheduler = ModbusScheduler(name="/dev/MOCKED", log_interval=0)
+        mock_call: AsyncMock = AsyncMock(return_value=create_modbus_response())
+
+        await scheduler.call(mock_call, {"address": 0, "count": 1, "slave": 0}, priority=ModbusScheduler.READ)
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert len(logs) == 1
+        assert re.match(r"\[MODBUS\] \[/dev/MOCKED\] 1 read request\(s\) waited [\d.]+ ms on average", logs[0])
+        assert scheduler.wait_times[ModbusScheduler.READ].count == 0
+
+    @pytest.mark.asyncio()
+    async def test_coil_write_coalescer(self) -> None:
+        """Test that coil writes in the same tick are sent as contiguous ranges, coils off first."""
+        mock_response: MagicMock = create_modbus_response()
+
+        mock_modbus_tcp_client: AsyncMock = AsyncMock()
+        mock_modbus_tcp_client.write_coil.return_value = mock_response
+        mock_modbus_tcp_client.write_coils.return_value = mock_response
+
+        coil_writer: CoilWriteCoalescer = CoilWriteCoalescer(
+            modbus_client=ModbusClient(tcp=mock_modbus_tcp_client, serial=AsyncMock()),
+            scheduler=ModbusScheduler(),
+        )
+
+        responses: Tuple[Optional[ModbusResponse], ...] = await asyncio.gather(
+            coil_writer.write(2, value=True),
+            coil_writer.write(0, value=True),
+            coil_writer.write(1, value=True),
+            coil_writer.write(5, value=True),
+            coil_writer.write(9, value=False),
+            coil_writer.write(8, value=False),
+        )
+
+        assert list(responses) == [mock_response] * 6
+        assert mock_modbus_tcp_client.method_calls == [
+            call.write_coils(address=8, values=[False, False], slave=0),
+            call.write_coils(address=0, values=[True, True, True], slave=0),
+            call.write_coil(address=5, value=True, slave=0),
+        ]
+
+    @pytest.mark.parametrize(
+        ("baud_rate", "parity", "expected_silence", "expected_transaction_time"),
+        [
+            (2400, "N", 0.014583, 0.085417),
+            (9600, "E", 0.004010, 0.023490),
+            (115200, "N", 0.00175, 0.003226),
+        ],
+    )
+    def test_serial_bus_timing(
+        self, baud_rate: int, parity: str, expected_silence: float, expected_transaction_time: float
+    ) -> None:
+        """Test inter-frame silence and transaction time from the baud rate."""
+        serial_bus: SerialBusScheduler = SerialBusScheduler(baud_rate=baud_rate, parity=parity)
+
+        assert serial_bus.silence == pytest.approx(expected_silence, abs=1e-6)
+        assert serial_bus.transaction_time(count=2) == pytest.approx(expected_transaction_time, abs=1e-6)
+
+    @pytest.mark.asyncio()
+    async def test_serial_bus_pace(self, mocker: MockerFixture) -> None:
+        """Test that serial requests are paced by transaction time and inter-frame silence."""
+        mocker.patch("unipi_control.modbus.time.monotonic", return_value=100.0)
+        mock_sleep: AsyncMock = mocker.patch("unipi_control.modbus.asyncio.sleep", new_callable=AsyncMock)
+
+        serial_bus: SerialBusScheduler = SerialBusScheduler(baud_rate=2400, parity="N")
+
+        await serial_bus.pace(count=2)
+        mock_sleep.assert_not_called()
+
+        await serial_bus.pace(count=2)
+        mock_sleep.assert_awaited_once_with(pytest.approx(serial_bus.transaction_time(count=2) + serial_bus.silence))
+
+    def test_register_image(self) -> None:
+        """Test that readers only see the registers from the last complete scan."""
+        register_image: RegisterImage = RegisterImage(
+            [
+                {"start_reg": 100, "count": 2, "slave": 0, "interval": 0, "max_staleness": None},
+                {"start_reg": 110, "count": 4, "slave": 0, "interval": 0, "max_staleness": None},
+            ]
+        )
+
+        assert register_image.base_address == 100
+        assert register_image.size == 14
+        assert register_image.read(100, 2) is None
+
+        register_image.begin()
+        register_image.write(100, [1, 2])
+
+        assert register_image.read(100, 2) is None
+
+        register_image.commit()
+        view = register_image.read(100, 2)
+
+        assert view is not None
+        assert view.tolist() == [1, 2]
+        assert register_image.read(100, 3) is None
+        assert register_image.read(99, 1) is None
+        assert register_image.read(112, 4) is None
+
+        register_image.begin()
+        register_image.write(110, [3, 4, 5, 6])
+        register_image.commit()
+
+        assert view.tolist() == [1, 2]
+        assert register_image.read(100, 2).tolist() == [1, 2]  # type: ignore[union-attr]
+        assert register_image.read(111, 2).tolist() == [4, 5]  # type: ignore[union-attr]
+
+    def test_register_image_dirty(self) -> None:
+        """Test that only changed registers are marked as dirty."""
+        register_image: RegisterImage = RegisterImage(
+            [{"start_reg": 0, "count": 4, "slave": 0, "interval": 0, "max_staleness": None}]
+        )
+
+        register_image.begin()
+        register_image.write(0, [0, 0])
+        register_image.commit()
+
+        assert register_image.pop_dirty() == {0, 1}
+        assert register_image.pop_dirty() == set()
+
+        register_image.begin()
+        register_image.write(0, [0, 1, 2, 0])
+        register_image.commit()
+
+        assert register_image.pop_dirty() == {1, 2, 3}
+
+        register_image.begin()
+        register_image.write(0, [0, 1, 2, 0])
+        register_image.commit()
+
+        assert register_image.pop_dirty() == set()
+
+    def test_register_image_set_bits(self) -> None:
+        """Test that writing bits through updates the cached register in both buffers."""
+        register_image: RegisterImage = RegisterImage(
+            [{"start_reg": 0, "count": 2, "slave": 0, "interval": 0, "max_staleness": None}]
+        )
+
+        register_image.set_bits(0, mask=0b10, value=True)
+
+        assert register_image.read(0, 1) is None
+        assert register_image.pop_dirty() == set()
+
+        register_image.begin()
+        register_image.write(0, [0b01, 0])
+        register_image.commit()
+        register_image.pop_dirty()
+
+        register_image.set_bits(0, mask=0b10, value=True)
+
+        assert register_image.read(0, 1).tolist() == [0b11]  # type: ignore[union-attr]
+        assert register_image.pop_dirty() == {0}
+
+        register_image.begin()
+        register_image.commit()
+
+        assert register_image.read(0, 1).tolist() == [0b11]  # type: ignore[union-attr]
+
+        register_image.set_bits(0, mask=0b01, value=False)
+        register_image.set_bits(5, mask=0b01, value=True)
+
+        assert register_image.read(0, 1).tolist() == [0b10]  # type: ignore[union-attr]
+        assert register_image.pop_dirty() == {0}
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_write_through_during_scan(self, scan_neuron: Neuron, register_reader: MockRegisterReader) -> None:
+        """Test that a read sent before a coil write doesn't revert the written bits."""
+        read_sent: asyncio.Event = asyncio.Event()
+        written: asyncio.Event = asyncio.Event()
+
+        async def slow_read(address: int, *_: int) -> None:
+            if address == 0:
+                read_sent.set()
+                await written.wait()
+
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        register_reader.hook = slow_read
+        scan_task: asyncio.Task = asyncio.create_task(
+            scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+        )
+        await read_sent.wait()
+
+        scan_neuron.modbus_cache_data.write_through(0, mask=0b1, value=True, unit=0)
+        written.set()
+        await scan_task
+
+        # The response from before the write still has the old bits.
+        assert scan_neuron.modbus_cache_data.get_register(address=0, index=2, unit=0).tolist() == [1, 0]
+
+        register_reader.hook = None
+        await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        # A read sent after the write replaces the bits, e.g. if the write did not take effect.
+        assert scan_neuron.modbus_cache_data.get_register(address=0, index=2, unit=0).tolist() == [0, 0]
+
+    def test_circuit_breaker(self, mocker: MockerFixture) -> None:
+        """Test that polling of a failing unit is paused with exponential backoff."""
+        mock_monotonic: MagicMock = mocker.patch("unipi_control.modbus.time.monotonic", return_value=100.0)
+        circuit_breaker: ModbusCircuitBreaker = ModbusCircuitBreaker(failure_threshold=2, backoff=1, max_backoff=3)
+
+        circuit_breaker.record(1, success=False)
+
+        assert circuit_breaker.allow(1)
+
+        circuit_breaker.record(1, success=False)
+
+        assert not circuit_breaker.allow(1)
+        assert circuit_breaker.allow(2)
+
+        for backoff in (2, 3, 3):
+            mock_monotonic.return_value += circuit_breaker.max_backoff
+
+            assert circuit_breaker.allow(1)
+
+            circuit_breaker.record(1, success=False)
+            mock_monotonic.return_value += backoff - 0.1
+
+            assert not circuit_breaker.allow(1)
+
+        mock_monotonic.return_value += 0.1
+        circuit_breaker.record(1, success=True)
+
+        assert circuit_breaker.allow(1)
+        assert not circuit_breaker.is_open(1)
+
+    def test_modbus_error_log(self, mocker: MockerFixture, caplog: LogCaptureFixture) -> None:
+        """Test that repeated errors are logged at most once per interval."""
+        mock_monotonic: MagicMock = mocker.patch("unipi_control.modbus.time.monotonic", return_value=0.0)
+        errors: ModbusErrorLog = ModbusErrorLog(interval=60)
+
+        for monotonic in (0.0, 10.0, 20.0, 61.0):
+            mock_monotonic.return_value = monotonic
+            errors.error("%s Error on address %s (unit: %s)", LogPrefix.MODBUS, 0, 1)
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert logs == [
+            "[MODBUS] Error on address 0 (unit: 1)",
+            "[MODBUS] Error on address 0 (unit: 1) (3 times in the last 61s)",
+        ]
+        assert errors.suppressed == {}
+
+
 class TestUnhappyPathModbus:
     @pytest.mark.parametrize(
         "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
@@ -34,6 +513,54 @@ class TestUnhappyPathModbus:
 
         assert "[MODBUS] Error on address 0 (unit: 1)" in logs
 
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize("delay", [0, 0.01])
+    async def test_coil_write_coalescer_cancelled(self, delay: float) -> None:
+        """Test that pending coil writes are answered and later writes are sent if the flush is cancelled."""
+        mock_modbus_tcp_client: AsyncMock = AsyncMock()
+        mock_modbus_tcp_client.write_coil.return_value = create_modbus_response()
+
+        coil_writer: CoilWriteCoalescer = CoilWriteCoalescer(
+            modbus_client=ModbusClient(tcp=mock_modbus_tcp_client, serial=AsyncMock()),
+            scheduler=ModbusScheduler(),
+            window=10,
+        )
+
+        write_task: asyncio.Task = asyncio.create_task(coil_writer.write(0, value=True))
+        # Cancel the flush before it started and during the window.
+        await asyncio.sleep(delay)
+
+        assert coil_writer._flush_task  # noqa: SLF001
+        coil_writer._flush_task.cancel()  # noqa: SLF001
+
+        assert await write_task is None
+
+        coil_writer.window = 0
+
+        assert await coil_writer.write(1, value=True) is mock_modbus_tcp_client.write_coil.return_value
+        mock_modbus_tcp_client.write_coil.assert_awaited_once_with(address=1, value=True, slave=0)
+
+    @pytest.mark.asyncio()
+    async def test_coil_write_coalescer_failed(self, caplog: LogCaptureFixture) -> None:
+        """Test that an unexpected error in the flush is logged and the pending coil writes are answered."""
+        mock_modbus_tcp_client: AsyncMock = AsyncMock()
+        mock_modbus_tcp_client.write_coil.side_effect = [OSError("MOCKED ERROR"), create_modbus_response()]
+
+        coil_writer: CoilWriteCoalescer = CoilWriteCoalescer(
+            modbus_client=ModbusClient(tcp=mock_modbus_tcp_client, serial=AsyncMock()),
+            scheduler=ModbusScheduler(),
+        )
+
+        responses: Tuple[Optional[ModbusResponse], ...] = await asyncio.gather(
+            coil_writer.write(0, value=False), coil_writer.write(5, value=True)
+        )
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert list(responses) == [None, None]
+        assert "[MODBUS] Coil write failed: MOCKED ERROR" in logs
+        assert await coil_writer.write(1, value=True) is not None
+
     @pytest.mark.asyncio()
     @pytest.mark.parametrize(
         ("config_loader", "exception", "expected"),
@@ -85,3 +612,86 @@ class TestUnhappyPathModbus:
         logs: List[str] = [record.getMessage() for record in caplog.records]
 
         assert set(expected).issubset(logs)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_unresponsive_board(
+        self, scan_neuron: Neuron, register_reader: MockRegisterReader, caplog: LogCaptureFixture
+    ) -> None:
+        """Test that a failing SPI board is paused by the circuit breaker while the other boards keep polling."""
+
+        async def failing_board(address: int, *_: int) -> None:
+            if address == 100:
+                raise asyncio.exceptions.TimeoutError
+
+        register_reader.hook = failing_board
+
+        for _ in range(4):
+            await scan_neuron.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert register_reader.addresses == [0, 20, 100, 200] * 3 + [0, 20, 200]
+        assert "[MODBUS] Unit 0 register 100 is not responding. Polling is paused for 1.0s." in logs
+        assert not [log for log in logs if "Unit 0 is not responding" in log]
+        assert scan_neuron.modbus_cache_data.get_register(address=200, index=2, unit=0).tolist() == [200, 200]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_UNIT_POLICY, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT_WITH_STALENESS)],
+        indirect=True,
+    )
+    async def test_unresponsive_unit(
+        self,
+        mocker: MockerFixture,
+        scan_neuron: Neuron,
+        scan_modbus_client: MockModbusClient,
+        register_reader: MockRegisterReader,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        """Test that an unresponsive unit is polled with its own policy and paused by the circuit breaker."""
+        calls: List[Tuple[int, float, int]] = []
+
+        async def unresponsive_unit(address: int, *_: int) -> None:
+            calls.append(
+                (address, scan_modbus_client.serial.comm_params.timeout_connect, scan_modbus_client.serial.retries)
+            )
+
+            if len(calls) <= 4:
+                raise asyncio.exceptions.TimeoutError
+
+        register_reader.hook = unresponsive_unit
+
+        mocker.patch("unipi_control.modbus.asyncio.sleep", new_callable=AsyncMock)
+        mock_monotonic: MagicMock = mocker.patch("unipi_control.modbus.time.monotonic", return_value=100.0)
+
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        assert calls == [(12, 0.2, 0), (70, 0.2, 0), (342, 0.2, 0)]
+
+        # The first retry fails and doubles the backoff.
+        mock_monotonic.return_value = 101.0
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        mock_monotonic.return_value = 102.9
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        assert register_reader.addresses == [12, 70, 342, 12]
+
+        mock_monotonic.return_value = 103.0
+        await scan_neuron.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert register_reader.addresses == [12, 70, 342, 12, 12, 70, 342]
+        assert "[MODBUS] Unit 1 is not responding. Polling is paused for 1.0s." in logs
+        assert "[MODBUS] Unit 1 is not responding. Polling is paused for 2.0s." in logs
+        assert "[MODBUS] Unit 1 is responding again." in logs
+        assert logs.count("[MODBUS] Timeout on: {'address': 12, 'count': 2, 'slave': 1}") == 1
+        assert scan_neuron.modbus_cache_data.errors.suppressed == {
+            "[MODBUS] Timeout on: {'address': 12, 'count': 2, 'slave': 1}": 1
+        }
@@ -0,0 +1,134 @@
+"""Data for modbus unit tests."""
+
+from typing import Final
+
+HARDWARE_DATA_CONTENT_WITH_SLAVES: Final[
+    str
+] = """modbus_register_blocks:
+    # DI 1.x / DO 1.x
+  - start_reg: 0
+    count: 2
+    slave: 1
+    # LED 1.x
+  - start_reg: 20
+    count: 1
+    slave: 1
+    # DI 2.x / RO 2.x
+  - start_reg: 100
+    count: 2
+    slave: 2
+modbus_features:
+  - feature_type: DI
+    count: 4
+    major_group: 1
+    val_reg: 0
+  - feature_type: DI
+    count: 16
+    major_group: 2
+    val_reg: 100
+"""
+
+HARDWARE_DATA_CONTENT_WITH_INTERVAL: Final[
+    str
+] = """modbus_register_blocks:
+    # DI 1.x / DO 1.x
+  - start_reg: 0
+    count: 2
+    # Configuration registers
+  - start_reg: 1000
+    count: 4
+    interval: 60
+modbus_features:
+  - feature_type: DI
+    count: 4
+    major_group: 1
+    val_reg: 0
+"""
+
+CONFIG_CONTENT_WITH_PIPELINE: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_tcp:
+  pipeline_window: 2
+logging:
+  level: debug
+"""
+
+CONFIG_CONTENT_WITH_ROUND_ROBIN: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial:
+  port: /dev/MOCKED
+  baud_rate: 9600
+  polling: round_robin
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: MOCKED_EASTRON
+      max_staleness: 5
+logging:
+  level: debug
+"""
+
+CONFIG_CONTENT_WITH_UNIT_POLICY: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial:
+  port: /dev/MOCKED
+  baud_rate: 9600
+  timeout: 2
+  retries: 1
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: MOCKED_EASTRON
+      timeout: 0.2
+      retries: 0
+logging:
+  level: debug
+"""
+
+CONFIG_CONTENT_WITH_SERIAL_BUSES: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_serial:
+  port: /dev/MOCKED
+  baud_rate: 9600
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: MOCKED_EASTRON
+modbus_serial_buses:
+  - port: /dev/MOCKED_2
+    baud_rate: 19200
+    timeout: 0.3
+    units:
+      - unit: 2
+        device_name: MOCKED Eastron SDM120M 2
+        identifier: MOCKED_EASTRON
+logging:
+  level: debug
+"""
+
+EXTENSION_HARDWARE_DATA_CONTENT_WITH_STALENESS: Final[
+    str
+] = """manufacturer: Eastron
+model: SDM120M
+modbus_register_blocks:
+  # Active power
+  - start_reg: 12
+    count: 2
+    max_staleness: 1
+  # Frequency
+  - start_reg: 70
+    count: 2
+  # Total active energy
+  - start_reg: 342
+    count: 2
+    max_staleness: 60
+modbus_features: []
+"""
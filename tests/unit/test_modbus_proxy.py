@@ -0,0 +1,174 @@
+"""Unit tests for the Modbus TCP proxy server."""
+
+import asyncio
+import contextlib
+from typing import Any
+from typing import AsyncIterator
+from typing import List
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+from _pytest.logging import LogCaptureFixture
+from pymodbus.client import AsyncModbusTcpClient
+from pymodbus.pdu import ExceptionResponse
+from pymodbus.pdu import ModbusExceptions
+from pymodbus.pdu import ModbusResponse
+from pytest_mock import MockerFixture
+
+from tests.conftest import MockModbusClient
+from tests.conftest_data import CONFIG_CONTENT
+from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
+from tests.conftest_data import HARDWARE_DATA_CONTENT
+from unipi_control.modbus_proxy import ModbusProxyServer
+from unipi_control.neuron import Neuron
+
+
+@contextlib.asynccontextmanager
+async def start_proxy(neuron: Neuron) -> AsyncIterator[Any]:
+    """Start the proxy server on a free port and connect a Modbus TCP client.
+
+    The untyped pymodbus client is yielded as ``Any``, its request methods return awaitables.
+    """
+    proxy: ModbusProxyServer = ModbusProxyServer(neuron.config.modbus_proxy, neuron.modbus_cache_data)
+    proxy.config.port = 0
+
+    assert await proxy.start() is True
+    assert proxy.server
+
+    client: AsyncModbusTcpClient = AsyncModbusTcpClient(
+        "127.0.0.1",
+        port=proxy.server.transport.sockets[0].getsockname()[1],  # type: ignore[attr-defined]
+        timeout=1,
+        retries=0,
+    )
+
+    try:
+        await client.connect()
+        yield client
+    finally:
+        client.close()
+        await proxy.stop()
+
+
+class TestHappyPathModbusProxy:
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_read_from_cache(self, neuron: Neuron, modbus_client: MockModbusClient) -> None:
+        """Test that input register reads are answered from the register cache without Modbus requests."""
+        read_calls: int = modbus_client.tcp.read_input_registers.call_count
+
+        async with start_proxy(neuron) as client:
+            response: Any = await client.read_input_registers(address=100, count=2, slave=0)
+
+        assert response.registers == neuron.modbus_cache_data.get_register(address=100, index=2, unit=0).tolist()
+        assert modbus_client.tcp.read_input_registers.call_count == read_calls
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_forward_writes(self, mocker: MockerFixture, neuron: Neuron, modbus_client: MockModbusClient) -> None:
+        """Test that writes are forwarded through the Modbus TCP scheduler and coil writes are written through."""
+        mock_response: MagicMock = MagicMock(spec=ModbusResponse)
+        mock_response.isError.return_value = False
+
+        modbus_client.tcp.write_coil = AsyncMock(return_value=mock_response)
+        modbus_client.tcp.write_registers = AsyncMock(return_value=mock_response)
+        mock_scheduler_call: AsyncMock = mocker.spy(neuron.modbus_cache_data.tcp_scheduler, "call")
+
+        async with start_proxy(neuron) as client:
+            coil_response: Any = await client.write_coil(address=112, value=True, slave=0)
+            registers_response: Any = await client.write_registers(address=0, values=[1, 2], slave=0)
+
+        assert coil_response.isError() is False
+        assert coil_response.value is True
+        assert registers_response.count == 2
+        modbus_client.tcp.write_coil.assert_awaited_once_with(address=112, value=True, slave=0)
+        modbus_client.tcp.write_registers.assert_awaited_once_with(address=0, values=[1, 2], slave=0)
+        assert [call.kwargs["priority"] for call in mock_scheduler_call.call_args_list] == [0, 0]
+        # Coil 112 is RO 2.13, its state is bit 12 of register 101.
+        assert neuron.modbus_cache_data.get_register(address=101, index=1, unit=0)[0] & 0x1 << 12
+        assert neuron.modbus_cache_data.written.is_set()
+
+
+class TestUnhappyPathModbusProxy:
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_illegal_requests(self, neuron: Neuron, modbus_client: MockModbusClient) -> None:
+        """Test that requests the register cache can't answer get an exception response."""
+        modbus_client.tcp.write_coil = AsyncMock()
+        modbus_client.tcp.write_registers = AsyncMock()
+
+        async with start_proxy(neuron) as client:
+            responses: List[Any] = [
+                await client.read_input_registers(address=1000, count=2, slave=0),
+                # The register block at 100 has only two registers.
+                await client.read_input_registers(address=100, count=3, slave=0),
+                # Slave 1 is not scanned.
+                await client.read_input_registers(address=100, count=2, slave=1),
+                await client.write_coil(address=112, value=True, slave=1),
+                # Coil 114 is not a coil of a feature.
+                await client.write_coil(address=114, value=True, slave=0),
+                # Register 1000 is not in a scanned register block.
+                await client.write_registers(address=1000, values=[1, 2], slave=0),
+                # Holding registers are not cached.
+                await client.read_holding_registers(address=100, count=2, slave=0),
+            ]
+
+        assert all(isinstance(response, ExceptionResponse) for response in responses)
+        assert [response.exception_code for response in responses] == [
+            ModbusExceptions.IllegalAddress,
+            ModbusExceptions.IllegalAddress,
+            ModbusExceptions.IllegalAddress,
+            ModbusExceptions.IllegalAddress,
+            ModbusExceptions.IllegalAddress,
+            ModbusExceptions.IllegalAddress,
+            ModbusExceptions.IllegalFunction,
+        ]
+        modbus_client.tcp.write_coil.assert_not_called()
+        modbus_client.tcp.write_registers.assert_not_called()
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_illegal_value(self, neuron: Neuron, modbus_client: MockModbusClient) -> None:
+        """Test that a write request with a wrong byte count is answered without forwarding the write."""
+        modbus_client.tcp.write_coils = AsyncMock()
+
+        async with start_proxy(neuron) as client:
+            reader, writer = await asyncio.open_connection("127.0.0.1", client.comm_params.port)
+            # Write coils 112 and 113 with a byte count of 2 instead of 1.
+            writer.write(bytes.fromhex("000100000009000f00700002020300"))
+            response: bytes = await reader.readexactly(9)
+            writer.close()
+
+        assert response == bytes.fromhex("000100000003008f03")
+        modbus_client.tcp.write_coils.assert_not_called()
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader", [(CONFIG_CONTENT, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)], indirect=True
+    )
+    async def test_forward_write_failed(
+        self, neuron: Neuron, modbus_client: MockModbusClient, caplog: LogCaptureFixture
+    ) -> None:
+        """Test that a failed write is answered with a slave failure."""
+        mock_response: MagicMock = MagicMock(spec=ModbusResponse)
+        mock_response.isError.return_value = True
+
+        modbus_client.tcp.write_coil = AsyncMock(return_value=mock_response)
+
+        async with start_proxy(neuron) as client:
+            response: Any = await client.write_coil(address=112, value=True, slave=0)
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert isinstance(response, ExceptionResponse)
+        assert response.exception_code == ModbusExceptions.SlaveFailure
+        assert "[MODBUS] Proxy write to address 112 (slave: 0) failed." in logs
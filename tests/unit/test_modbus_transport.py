@@ -0,0 +1,259 @@
+"""Unit tests for the lean Modbus transport."""
+
+import asyncio
+import struct
+from typing import List
+from typing import TYPE_CHECKING
+from typing import Tuple
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+import pytest
+
+from tests.unit.test_modbus_transport_data import MODBUS_RTU_FRAMES
+from unipi_control.modbus import RegisterImage
+from unipi_control.modbus_transport import LeanModbusError
+from unipi_control.modbus_transport import LeanModbusRtuClient
+from unipi_control.modbus_transport import LeanModbusTcpClient
+from unipi_control.modbus_transport import ModbusReadRequest
+from unipi_control.modbus_transport import crc16
+
+if TYPE_CHECKING:
+    from unipi_control.helpers.typing import ModbusRegisterBlock
+
+
+def create_register_image(start_reg: int, count: int) -> RegisterImage:
+    """Create a register image with one register block."""
+    register_block: ModbusRegisterBlock = {
+        "start_reg": start_reg,
+        "count": count,
+        "slave": 0,
+        "interval": None,
+        "max_staleness": None,
+    }
+    register_image: RegisterImage = RegisterImage([register_block])
+    register_image.begin()
+
+    return register_image
+
+
+def create_rtu_client() -> LeanModbusRtuClient:
+    """Create a RTU client with a mocked serial transport."""
+    client: LeanModbusRtuClient = LeanModbusRtuClient(port="/dev/MOCKED", timeout=0.05, retries=1)
+    client.transport = MagicMock(spec=asyncio.Transport)
+    client.transport.is_closing.return_value = False
+
+    return client
+
+
+def create_tcp_client() -> LeanModbusTcpClient:
+    """Create a TCP client with a mocked transport."""
+    client: LeanModbusTcpClient = LeanModbusTcpClient(host="MOCKED", timeout=0.05, retries=0)
+    client.transport = MagicMock(spec=asyncio.Transport)
+    client.transport.is_closing.return_value = False
+
+    return client
+
+
+class TestHappyPathModbusTransport:
+    @pytest.mark.parametrize(("pdu", "expected"), MODBUS_RTU_FRAMES)
+    def test_rtu_frame(self, pdu: bytes, expected: bytes) -> None:
+        """Test that the RTU frames have the CRC of the Modbus specification."""
+        assert LeanModbusRtuClient.frame(1, pdu) == expected
+        assert crc16(expected) == 0
+
+    def test_read_request(self) -> None:
+        """Test that the read request frames are prebuilt."""
+        request: ModbusReadRequest = ModbusReadRequest(slave=1, address=0, count=2)
+
+        assert request.pdu == bytes.fromhex("0400000002")
+        assert request.rtu_frame == bytes.fromhex("01040000000271cb")
+        assert request.data == {"address": 0, "count": 2, "slave": 1}
+
+    @pytest.mark.asyncio()
+    async def test_tcp_read_into(self) -> None:
+        """Test that responses are matched by transaction ID and decoded into the register image."""
+        requests: List[Tuple[int, int]] = []
+
+        async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            frames: List[bytes] = [await reader.readexactly(12) for _ in range(2)]
+
+            # Answer in reverse order to test the transaction ID matching.
+            for frame in reversed(frames):
+                transaction_id, _, _, slave, _, address, count = struct.unpack(">HHHBBHH", frame)
+                requests.append((slave, address))
+                payload: bytes = struct.pack(f">BB{count}H", 4, 2 * count, *range(address, address + count))
+                writer.write(struct.pack(">HHHB", transaction_id, 0, len(payload) + 1, slave) + payload)
+
+            await writer.drain()
+
+        server: asyncio.base_events.Server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port: int = server.sockets[0].getsockname()[1]
+        client: LeanModbusTcpClient = LeanModbusTcpClient(host="127.0.0.1", port=port, timeout=1, retries=0)
+
+        try:
+            assert await client.connect() is True
+
+            register_image: RegisterImage = create_register_image(0, 102)
+            results: List[bool] = list(
+                await asyncio.gather(
+                    client.read_into(ModbusReadRequest(slave=1, address=0, count=2), register_image),
+                    client.read_into(ModbusReadRequest(slave=2, address=100, count=2), register_image),
+                )
+            )
+            register_image.commit()
+        finally:
+            client.close()
+            server.close()
+            await server.wait_closed()
+
+        assert results == [True, True]
+        assert requests == [(2, 100), (1, 0)]
+        assert register_image.read(0, 2).tolist() == [0, 1]  # type: ignore[union-attr]
+        assert register_image.read(100, 2).tolist() == [100, 101]  # type: ignore[union-attr]
+        assert register_image.pop_dirty() == {0, 1, 100, 101}
+
+    @pytest.mark.asyncio()
+    async def test_rtu_read_into(self) -> None:
+        """Test that a RTU response that arrives in chunks is decoded into the register image."""
+        client: LeanModbusRtuClient = create_rtu_client()
+        register_image: RegisterImage = create_register_image(12, 2)
+        request: ModbusReadRequest = ModbusReadRequest(slave=1, address=12, count=2)
+
+        task: asyncio.Task = asyncio.create_task(client.read_into(request, register_image))
+        await asyncio.sleep(0)
+
+        response: bytes = LeanModbusRtuClient.frame(1, bytes.fromhex("040443665333"))
+        client.data_received(response[:3])
+        client.data_received(response[3:])
+
+        assert await task is True
+        client.transport.write.assert_called_once_with(request.rtu_frame)  # type: ignore[union-attr]
+
+        register_image.commit()
+
+        assert register_image.read(12, 2).tolist() == [0x4366, 0x5333]  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio()
+    async def test_write_coils(self) -> None:
+        """Test that coils are packed LSB first."""
+        client: LeanModbusRtuClient = create_rtu_client()
+
+        task: asyncio.Task = asyncio.create_task(client.write_coils(address=100, values=[True, False, True], slave=0))
+        await asyncio.sleep(0)
+
+        client.data_received(LeanModbusRtuClient.frame(0, bytes.fromhex("0f00640003")))
+
+        assert (await task).isError() is False
+        client.transport.write.assert_called_once_with(  # type: ignore[union-attr]
+            LeanModbusRtuClient.frame(0, bytes.fromhex("0f006400030105"))
+        )
+
+
+class TestUnhappyPathModbusTransport:
+    @pytest.mark.asyncio()
+    async def test_exception_response(self) -> None:
+        """Test that an exception response leaves the register image unchanged."""
+        client: LeanModbusRtuClient = create_rtu_client()
+        register_image: RegisterImage = create_register_image(12, 2)
+
+        task: asyncio.Task = asyncio.create_task(
+            client.read_into(ModbusReadRequest(slave=1, address=12, count=2), register_image)
+        )
+        await asyncio.sleep(0)
+        client.data_received(LeanModbusRtuClient.frame(1, bytes.fromhex("8402")))
+
+        assert await task is False
+        assert register_image.pop_dirty() == set()
+
+    @pytest.mark.asyncio()
+    async def test_crc_error(self) -> None:
+        """Test that a response with a wrong CRC raises an error."""
+        client: LeanModbusRtuClient = create_rtu_client()
+
+        task: asyncio.Task = asyncio.create_task(client.read_input_registers(address=12, count=1, slave=1))
+        await asyncio.sleep(0)
+        client.data_received(bytes.fromhex("010402000100ff"))
+
+        with pytest.raises(LeanModbusError, match="CRC error in response: 010402000100ff"):
+            await task
+
+    @pytest.mark.asyncio()
+    async def test_timeout(self) -> None:
+        """Test that a request is retried after a timeout."""
+        client: LeanModbusRtuClient = create_rtu_client()
+        client.connect = AsyncMock(return_value=False)  # type: ignore[method-assign]
+
+        with pytest.raises(asyncio.TimeoutError):
+            await client.read_input_registers(address=12, count=1, slave=1)
+
+        assert client.transport.write.call_count == 2  # type: ignore[union-attr]
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        ("pdu", "expected"),
+        [
+            (bytes.fromhex("0400"), "Invalid response to .*: 0400"),
+            (bytes.fromhex("0406436653330001"), "Invalid response to .*: 0406436653330001"),
+            (bytes.fromhex("030443665333"), "Unexpected slave or function code in response: 020304436653"),
+        ],
+    )
+    async def test_invalid_response(self, pdu: bytes, expected: str) -> None:
+        """Test that a response that doesn't match the request leaves the register image unchanged."""
+        client: LeanModbusRtuClient = create_rtu_client()
+        register_image: RegisterImage = create_register_image(12, 2)
+
+        task: asyncio.Task = asyncio.create_task(
+            client.read_into(ModbusReadRequest(slave=2, address=12, count=2), register_image)
+        )
+        await asyncio.sleep(0)
+        client.data_received(LeanModbusRtuClient.frame(2, pdu))
+
+        with pytest.raises(LeanModbusError, match=expected):
+            await task
+
+        assert register_image.pop_dirty() == set()
+
+    @pytest.mark.asyncio()
+    async def test_response_from_other_slave(self) -> None:
+        """Test that a RTU response from another slave raises an error."""
+        client: LeanModbusRtuClient = create_rtu_client()
+
+        task: asyncio.Task = asyncio.create_task(client.read_input_registers(address=12, count=1, slave=1))
+        await asyncio.sleep(0)
+        client.data_received(LeanModbusRtuClient.frame(2, bytes.fromhex("04020001")))
+
+        with pytest.raises(LeanModbusError, match="Unexpected slave or function code in response: 0204020001"):
+            await task
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        ("frame", "expected"),
+        [
+            (bytes.fromhex("00010000000001"), "Invalid response: 00010000000001"),
+            (bytes.fromhex("0001000000020104"), "Invalid response: 0001000000020104"),
+            (bytes.fromhex("000100000003020400"), "Unexpected unit ID in response: 000100000003020400"),
+        ],
+    )
+    async def test_invalid_tcp_response(self, frame: bytes, expected: str) -> None:
+        """Test that a Modbus TCP response without PDU or from another unit raises an error."""
+        client: LeanModbusTcpClient = create_tcp_client()
+
+        task: asyncio.Task = asyncio.create_task(client.read_input_registers(address=12, count=1, slave=1))
+        await asyncio.sleep(0)
+        client.data_received(frame)
+
+        with pytest.raises(LeanModbusError, match=expected):
+            await task
+
+    @pytest.mark.asyncio()
+    async def test_odd_byte_count(self) -> None:
+        """Test that a read response with an odd byte count raises a Modbus error."""
+        client: LeanModbusRtuClient = create_rtu_client()
+
+        task: asyncio.Task = asyncio.create_task(client.read_input_registers(address=12, count=1, slave=1))
+        await asyncio.sleep(0)
+        client.data_received(LeanModbusRtuClient.frame(1, bytes.fromhex("0403436653")))
+
+        with pytest.raises(LeanModbusError, match="Invalid response: 0403436653"):
+            await task
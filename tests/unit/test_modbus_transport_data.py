@@ -0,0 +1,14 @@
+"""Data for lean Modbus transport unit tests."""
+
+from typing import Final
+from typing import List
+from typing import Tuple
+
+MODBUS_RTU_FRAMES: Final[List[Tuple[bytes, bytes]]] = [
+    # Read input registers 0-1
+    (bytes.fromhex("0400000002"), bytes.fromhex("01040000000271cb")),
+    # Read holding registers 64514-64515
+    (bytes.fromhex("03fc020002"), bytes.fromhex("0103fc020002559b")),
+    # Write coil 0 on
+    (bytes.fromhex("050000ff00"), bytes.fromhex("01050000ff008c3a")),
+]
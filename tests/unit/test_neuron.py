@@ -12,9 +12,11 @@ from pytest_mock import MockerFixture
 
 from tests.conftest import ConfigLoader
 from tests.conftest import MockHardwareInfo
+from tests.conftest import MockModbusClient
 from tests.conftest_data import CONFIG_CONTENT
 from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
 from tests.conftest_data import HARDWARE_DATA_CONTENT
+from tests.unit.test_neuron_data import CONFIG_CONTENT_WITH_REMOTE_NEURONS
 from unipi_control.helpers.typing import ModbusClient
 from unipi_control.neuron import Neuron
 
@@ -22,6 +24,39 @@ if TYPE_CHECKING:
     from unipi_control.config import Config
 
 
+class TestHappyPathNeuron:
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_REMOTE_NEURONS, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_remote_neuron(self, config_loader: ConfigLoader, modbus_client: MockModbusClient) -> None:
+        """Test that a remote neuron has its own model, features and topic namespace."""
+        config: Config = config_loader.get_config()
+        remote_config: Config = config.get_remote_neuron_config(config.remote_neurons[0])
+
+        neuron: Neuron = Neuron(
+            config=remote_config,
+            modbus_client=ModbusClient(tcp=modbus_client.tcp, serial=modbus_client.serial),
+            model="MOCKED_MODEL",
+        )
+        await neuron.init()
+
+        feature = neuron.features.by_feature_id("ro_2_01", feature_types=["RO"])
+
+        assert list(neuron.hardware) == ["neuron"]
+        assert neuron.hardware["neuron"].model == "Unipi Neuron MOCKED_MODEL"
+        assert feature.topic == "mocked_remote_unipi/relay/ro_2_01"
+        assert feature.unique_id == "mocked_remote_unipi_mocked_remote_id_ro_2_01"
+        assert feature.friendly_name == "MOCKED_REMOTE_FRIENDLY_NAME - RO_2_01"
+        assert remote_config.device_info.suggested_area == "MOCKED AREA"
+        assert remote_config.modbus_tcp.host == "192.168.1.2"
+        assert remote_config.modbus_serial.units == []
+        assert config.modbus_serial.units
+        modbus_client.serial.read_input_registers.assert_not_called()
+
+
 class TestUnhappyPathNeuron:
     @pytest.mark.asyncio()
     @pytest.mark.parametrize(
@@ -0,0 +1,26 @@
+"""Data for neuron unit tests."""
+
+from typing import Final
+
+CONFIG_CONTENT_WITH_REMOTE_NEURONS: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+  suggested_area: MOCKED AREA
+modbus_serial:
+  port: /dev/MOCKED
+  units:
+    - unit: 1
+      device_name: MOCKED Eastron SDM120M
+      identifier: MOCKED_EASTRON
+remote_neurons:
+  - name: MOCKED REMOTE UNIPI
+    host: 192.168.1.2
+    model: MOCKED_MODEL
+    features:
+      ro_2_01:
+        object_id: MOCKED_REMOTE_ID_RO_2_01
+        friendly_name: MOCKED_REMOTE_FRIENDLY_NAME - RO_2_01
+logging:
+  level: debug
+"""
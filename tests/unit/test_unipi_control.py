@@ -1,7 +1,24 @@
 """Unit tests for unipi-control entry point."""
 
+import asyncio
 from argparse import Namespace
+from typing import List
+from unittest.mock import AsyncMock
+from unittest.mock import PropertyMock
 
+import pytest
+from _pytest.logging import LogCaptureFixture
+from pytest_mock import MockerFixture
+
+from tests.conftest import ConfigLoader
+from tests.conftest_data import EXTENSION_HARDWARE_DATA_CONTENT
+from tests.conftest_data import HARDWARE_DATA_CONTENT
+from tests.unit.test_unipi_control_data import CONFIG_CONTENT_WITH_MODBUS_PROXY
+from tests.unit.test_unipi_control_data import CONFIG_CONTENT_WITH_REMOTE_NEURONS
+from unipi_control.helpers.typing import ModbusClient
+from unipi_control.modbus_proxy import ModbusProxyServer
+from unipi_control.neuron import Neuron
+from unipi_control.unipi_control import UnipiControl
 from unipi_control.unipi_control import parse_args
 
 
@@ -12,3 +29,65 @@ class TestHappyPathUnipiControl:
 
         assert parser.verbose == 2
         assert isinstance(parser, Namespace)
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_MODBUS_PROXY, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_stop_modbus_proxy(
+        self, mocker: MockerFixture, config_loader: ConfigLoader, modbus_client: ModbusClient
+    ) -> None:
+        """Test that the Modbus proxy server is stopped on shutdown."""
+        mocker.patch.object(UnipiControl, "_modbus_connect", new_callable=AsyncMock)
+        mocker.patch.object(UnipiControl, "mqtt_connect", new_callable=AsyncMock, side_effect=asyncio.CancelledError)
+        mock_start: AsyncMock = mocker.patch.object(ModbusProxyServer, "start", new_callable=AsyncMock)
+        mock_stop: AsyncMock = mocker.patch.object(ModbusProxyServer, "stop", new_callable=AsyncMock)
+
+        unipi_control: UnipiControl = UnipiControl(config=config_loader.get_config(), modbus_client=modbus_client)
+
+        with pytest.raises(asyncio.CancelledError):
+            await unipi_control.run()
+
+        assert isinstance(unipi_control.modbus_proxy, ModbusProxyServer)
+        mock_start.assert_awaited_once()
+        mock_stop.assert_awaited_once()
+
+    @pytest.mark.asyncio()
+    @pytest.mark.parametrize(
+        "config_loader",
+        [(CONFIG_CONTENT_WITH_REMOTE_NEURONS, HARDWARE_DATA_CONTENT, EXTENSION_HARDWARE_DATA_CONTENT)],
+        indirect=True,
+    )
+    async def test_unreachable_remote_neuron(
+        self,
+        mocker: MockerFixture,
+        config_loader: ConfigLoader,
+        modbus_client: ModbusClient,
+        caplog: LogCaptureFixture,
+    ) -> None:
+        """Test that an unreachable remote neuron is kept and initialized as soon as it is reachable."""
+        mock_tcp_client: AsyncMock = AsyncMock()
+        type(mock_tcp_client).connected = PropertyMock(side_effect=[False, False, False, True])
+
+        mocker.patch("unipi_control.unipi_control.create_modbus_tcp_client", return_value=mock_tcp_client)
+        mock_sleep: AsyncMock = mocker.patch("unipi_control.unipi_control.asyncio.sleep", new_callable=AsyncMock)
+        mock_init: AsyncMock = mocker.patch.object(Neuron, "init", new_callable=AsyncMock)
+
+        unipi_control: UnipiControl = UnipiControl(config=config_loader.get_config(), modbus_client=modbus_client)
+        remote_neuron: Neuron = unipi_control.remote_neurons[0]
+
+        await unipi_control._init_remote_neuron(remote_neuron)  # noqa: SLF001
+
+        logs: List[str] = [record.getMessage() for record in caplog.records]
+
+        assert unipi_control.remote_neurons == [remote_neuron]
+        assert mock_tcp_client.connect.await_count == 4
+        assert [await_args.args[0] for await_args in mock_sleep.await_args_list] == [1.0, 1.5, 1.5]
+        mock_init.assert_awaited_once()
+        assert (
+            "[MODBUS] TCP client can't connect to 192.168.1.2:502. "
+            "Remote neuron 'MOCKED REMOTE UNIPI' is retried in 1.0s."
+        ) in logs
+        assert "[MODBUS] TCP client connected to 192.168.1.2:502" in logs
@@ -0,0 +1,28 @@
+"""Data for unipi-control entry point unit tests."""
+
+from typing import Final
+
+CONFIG_CONTENT_WITH_MODBUS_PROXY: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_proxy:
+  enabled: true
+  port: 0
+logging:
+  level: debug
+"""
+
+CONFIG_CONTENT_WITH_REMOTE_NEURONS: Final[
+    str
+] = """device_info:
+  name: MOCKED UNIPI
+modbus_tcp:
+  max_backoff: 1.5
+remote_neurons:
+  - name: MOCKED REMOTE UNIPI
+    host: 192.168.1.2
+    model: MOCKED_MODEL
+logging:
+  level: debug
+"""
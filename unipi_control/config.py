@@ -1,5 +1,6 @@
 """Read config from yaml file and create config data class."""
 
+import copy
 import dataclasses
 import logging
 import re
@@ -19,6 +20,7 @@ from typing import List
 from typing import Mapping
 from typing import NamedTuple
 from typing import Optional
+from typing import Set
 from typing import Tuple
 from typing import Type
 from typing import Union
@@ -32,7 +34,9 @@ from unipi_control.helpers.log import LOG_LEVEL
 from unipi_control.helpers.log import LOG_NAME
 from unipi_control.helpers.log import SIMPLE_LOG_FORMAT
 from unipi_control.helpers.log import SystemdHandler
+from unipi_control.helpers.text import slugify
 from unipi_control.helpers.typing import HardwareDefinition
+from unipi_control.helpers.typing import ModbusRegisterBlock
 from unipi_control.helpers.yaml import yaml_loader_safe
 
 UNIPI_LOGGER: logging.Logger = logging.getLogger(LOG_NAME)
@@ -52,6 +56,12 @@ DEVICE_CLASSES: Final[List[str]] = [
 
 MODBUS_BAUD_RATES: Final[List[int]] = [2400, 4800, 9600, 19200, 38400, 57600, 115200]
 MODBUS_PARITY: Final[List[str]] = ["E", "O", "N"]
+MODBUS_SERIAL_POLLING: Final[List[str]] = ["all", "round_robin"]
+MODBUS_TRANSPORTS: Final[List[str]] = ["pymodbus", "lean"]
+MQTT_PUBLISH_MODES: Final[List[str]] = ["features", "boards", "all"]
+MQTT_PAYLOAD_CODECS: Final[List[str]] = ["text", "struct"]
+# Maximum number of registers that fit into one read input registers PDU.
+MODBUS_MAX_READ_REGISTERS: Final[int] = 125
 
 
 class LogPrefix:
@@ -167,11 +177,15 @@ class ConfigLoaderMixin:
             value: Any = getattr(self, _field.name)
             field_type = typing.get_origin(_field.type) or _field.type
 
+            if field_type is Union:
+                field_type = typing.get_args(_field.type)
+
             if is_dataclass(value):
                 value.validate()
             else:
                 if method := getattr(self, f"_validate_{_field.name}", None):
-                    setattr(self, _field.name, method(getattr(self, _field.name), name=_field.name))
+                    value = method(value, name=_field.name)
+                    setattr(self, _field.name, value)
 
                 if not isinstance(value, field_type) and not is_dataclass(value):
                     msg = f"Expected {_field.name} to be {field_type}, got {value!r}"
@@ -202,6 +216,48 @@ class MqttConfig(ConfigLoaderMixin):
     reconnect_interval: int = field(default=10)
     username: str = field(default_factory=str)
     password: str = field(default_factory=str)
+    max_inflight_messages: int = field(default=20)
+    publish_mode: str = field(default="features")
+    snapshot_interval: float = field(default=0.0)
+    payload_codec: str = field(default="text")
+
+    @staticmethod
+    def _validate_max_inflight_messages(value: int, name: str) -> int:
+        if value < 1:
+            msg = f"{LogPrefix.MQTT} Invalid value '{value}' in '{name}'. The value must be greater than or equal 1."
+            raise ConfigError(msg)
+
+        return value
+
+    @staticmethod
+    def _validate_publish_mode(value: str, name: str) -> str:
+        if (value := value.lower()) not in MQTT_PUBLISH_MODES:
+            exception_message: str = (
+                f"{LogPrefix.MQTT} Invalid value '{value}' in '{name}'. "
+                f"The following publish modes are allowed: {' '.join(MQTT_PUBLISH_MODES)}."
+            )
+            raise ConfigError(exception_message)
+
+        return value
+
+    @staticmethod
+    def _validate_snapshot_interval(value: float, name: str) -> float:
+        if value < 0:
+            msg = f"{LogPrefix.MQTT} Invalid value '{value}' in '{name}'. The value must be greater than or equal 0."
+            raise ConfigError(msg)
+
+        return float(value)
+
+    @staticmethod
+    def _validate_payload_codec(value: str, name: str) -> str:
+        if (value := value.lower()) not in MQTT_PAYLOAD_CODECS:
+            exception_message: str = (
+                f"{LogPrefix.MQTT} Invalid value '{value}' in '{name}'. "
+                f"The following payload codecs are allowed: {' '.join(MQTT_PAYLOAD_CODECS)}."
+            )
+            raise ConfigError(exception_message)
+
+        return value
 
 
 @dataclass
@@ -214,6 +270,8 @@ class FeatureConfig(ConfigLoaderMixin):
     unit_of_measurement: str = field(default_factory=str)
     suggested_area: str = field(default_factory=str)
     invert_state: bool = field(default=False)
+    enabled: bool = field(default=True)
+    min_write_interval: float = field(default=0.0)
 
     @staticmethod
     def _validate_object_id(value: str, name: str) -> str:
@@ -225,6 +283,14 @@ class FeatureConfig(ConfigLoaderMixin):
 
         return value
 
+    @staticmethod
+    def _validate_min_write_interval(value: float, name: str) -> float:
+        if value < 0:
+            msg = f"{LogPrefix.FEATURE} Invalid value '{value}' in '{name}'. The value must be greater than or equal 0."
+            raise ConfigError(msg)
+
+        return float(value)
+
 
 @dataclass
 class CoverConfig(ConfigLoaderMixin):
@@ -271,11 +337,62 @@ class CoverConfig(ConfigLoaderMixin):
 
 
 @dataclass
-class ModbusUnitConfig(ConfigLoaderMixin):
+class ModbusClientConfigMixin(ConfigLoaderMixin):
+    """Validate the settings that the Modbus TCP and the Modbus RTU clients share."""
+
+    @staticmethod
+    def _validate_timeout(value: float, name: str) -> float:
+        if value <= 0:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than 0."
+            raise ConfigError(msg)
+
+        return float(value)
+
+    @staticmethod
+    def _validate_retries(value: int, name: str) -> int:
+        if value < 0:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than or equal 0."
+            raise ConfigError(msg)
+
+        return value
+
+    @staticmethod
+    def _validate_max_backoff(value: float, name: str) -> float:
+        if value <= 0:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than 0."
+            raise ConfigError(msg)
+
+        return float(value)
+
+    @staticmethod
+    def _validate_max_register_gap(value: int, name: str) -> int:
+        if value < 0:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than or equal 0."
+            raise ConfigError(msg)
+
+        return value
+
+    @staticmethod
+    def _validate_transport(value: str, name: str) -> str:
+        if (value := value.lower()) not in MODBUS_TRANSPORTS:
+            exception_message: str = (
+                f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. "
+                f"The following transports are allowed: {' '.join(MODBUS_TRANSPORTS)}."
+            )
+            raise ConfigError(exception_message)
+
+        return value
+
+
+@dataclass
+class ModbusUnitConfig(ModbusClientConfigMixin):
     unit: int = field(default_factory=int)
     device_name: str = field(default_factory=str)
     identifier: str = field(default_factory=str)
     suggested_area: str = field(default_factory=str)
+    max_staleness: float = field(default_factory=float)
+    timeout: Optional[float] = field(default=None)
+    retries: Optional[int] = field(default=None)
 
     def _validate_device_name(self, value: str, name: str) -> str:  # noqa: ARG002
         if not value:
@@ -284,18 +401,64 @@ class ModbusUnitConfig(ConfigLoaderMixin):
 
         return value
 
+    @staticmethod
+    def _validate_max_staleness(value: float, name: str) -> float:
+        if value < 0:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than or equal 0."
+            raise ConfigError(msg)
+
+        return float(value)
+
+    def _validate_timeout(self, value: Optional[float], name: str) -> Optional[float]:  # type: ignore[override]
+        # Units without a timeout use the timeout of the bus.
+        return None if value is None else super()._validate_timeout(value, name)
+
+    def _validate_retries(self, value: Optional[int], name: str) -> Optional[int]:  # type: ignore[override]
+        return None if value is None else super()._validate_retries(value, name)
+
 
 @dataclass
-class ModbusTCPConfig(ConfigLoaderMixin):
+class ModbusTCPConfig(ModbusClientConfigMixin):
     host: str = field(default="localhost")
     port: int = field(default=502)
+    timeout: float = field(default=0.5)
+    retries: int = field(default=3)
+    max_backoff: float = field(default=300.0)
+    max_register_gap: int = field(default=0)
+    concurrent_scan: bool = field(default=True)
+    pipeline_window: int = field(default=1)
+    write_coalesce_window: float = field(default=0.0)
+    transport: str = field(default="pymodbus")
+
+    @staticmethod
+    def _validate_pipeline_window(value: int, name: str) -> int:
+        if value < 1:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than or equal 1."
+            raise ConfigError(msg)
+
+        return value
+
+    @staticmethod
+    def _validate_write_coalesce_window(value: float, name: str) -> float:
+        if value < 0:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than or equal 0."
+            raise ConfigError(msg)
+
+        return float(value)
 
 
 @dataclass
-class ModbusSerialConfig(ConfigLoaderMixin):
+class ModbusSerialConfig(ModbusClientConfigMixin):
     port: str = field(default="/dev/extcomm/0/0")
     baud_rate: int = field(default=2400)
     parity: str = field(default="N")
+    timeout: float = field(default=1.0)
+    retries: int = field(default=3)
+    max_backoff: float = field(default=300.0)
+    max_register_gap: int = field(default=0)
+    polling: str = field(default="all")
+    blocks_per_cycle: int = field(default=1)
+    transport: str = field(default="pymodbus")
     units: List[ModbusUnitConfig] = field(init=False, default_factory=list)
 
     def get_units_by_identifier(self, identifier: str) -> Iterator[ModbusUnitConfig]:
@@ -349,6 +512,59 @@ class ModbusSerialConfig(ConfigLoaderMixin):
 
         return value
 
+    @staticmethod
+    def _validate_polling(value: str, name: str) -> str:
+        if (value := value.lower()) not in MODBUS_SERIAL_POLLING:
+            exception_message: str = (
+                f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. "
+                f"The following polling modes are allowed: {' '.join(MODBUS_SERIAL_POLLING)}."
+            )
+            raise ConfigError(exception_message)
+
+        return value
+
+    @staticmethod
+    def _validate_blocks_per_cycle(value: int, name: str) -> int:
+        if value < 1:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. The value must be greater than or equal 1."
+            raise ConfigError(msg)
+
+        return value
+
+
+@dataclass
+class RemoteNeuronConfig(ConfigLoaderMixin):
+    name: str = field(default_factory=str)
+    host: str = field(default_factory=str)
+    port: int = field(default=502)
+    model: str = field(default_factory=str)
+    suggested_area: str = field(default_factory=str)
+    features: Dict[str, FeatureConfig] = field(init=False, default_factory=dict)
+
+    def validate(self) -> None:
+        """Validate remote neuron configuration."""
+        for _field in ("name", "host", "model"):
+            if not getattr(self, _field):
+                msg = f"{LogPrefix.MODBUS} Required key '{_field}' is missing! {self!r}"
+                raise ConfigError(msg)
+
+        super().validate()
+
+    @staticmethod
+    def _validate_name(value: str, name: str) -> str:
+        if re.search(Validation.NAME.regex, value) is None:
+            msg = f"{LogPrefix.MODBUS} Invalid value '{value}' in '{name}'. {Validation.NAME.error}"
+            raise ConfigError(msg)
+
+        return value
+
+
+@dataclass
+class ModbusProxyConfig(ConfigLoaderMixin):
+    enabled: bool = field(default=False)
+    host: str = field(default="localhost")
+    port: int = field(default=5020)
+
 
 @dataclass
 class HomeAssistantConfig(ConfigLoaderMixin):
@@ -457,6 +673,9 @@ class Config(ConfigLoaderMixin):
     mqtt: MqttConfig = field(default_factory=MqttConfig)
     modbus_tcp: ModbusTCPConfig = field(default_factory=ModbusTCPConfig)
     modbus_serial: ModbusSerialConfig = field(default_factory=ModbusSerialConfig)
+    modbus_serial_buses: List[ModbusSerialConfig] = field(init=False, default_factory=list)
+    remote_neurons: List[RemoteNeuronConfig] = field(init=False, default_factory=list)
+    modbus_proxy: ModbusProxyConfig = field(default_factory=ModbusProxyConfig)
     homeassistant: HomeAssistantConfig = field(default_factory=HomeAssistantConfig)
     features: Dict[str, FeatureConfig] = field(init=False, default_factory=dict)
     covers: List[CoverConfig] = field(init=False, default_factory=list)
@@ -481,6 +700,8 @@ class Config(ConfigLoaderMixin):
         self._validate_feature_object_ids()
         self._validate_covers_circuits()
         self._validate_cover_ids()
+        self._validate_remote_neuron_names()
+        self._validate_serial_buses()
 
     def _validate_feature_object_ids(self) -> None:
         object_ids: List[str] = []
@@ -530,6 +751,100 @@ class Config(ConfigLoaderMixin):
 
             object_ids.append(cover.object_id)
 
+    @property
+    def serial_buses(self) -> List[ModbusSerialConfig]:
+        """Return all RS-485 buses, ``modbus_serial`` first."""
+        return [self.modbus_serial, *self.modbus_serial_buses]
+
+    def get_serial_bus(self, unit: int) -> ModbusSerialConfig:
+        """Get the RS-485 bus of a unit.
+
+        Parameters
+        ----------
+        unit: int
+            The modbus RTU unit ID.
+
+        Returns
+        -------
+        ModbusSerialConfig:
+            The bus with this unit or ``modbus_serial`` if no bus has this unit.
+
+        """
+        for serial_bus in self.serial_buses:
+            if any(modbus_unit.unit == unit for modbus_unit in serial_bus.units):
+                return serial_bus
+
+        return self.modbus_serial
+
+    def _validate_serial_buses(self) -> None:
+        ports: List[str] = []
+        units: List[int] = []
+
+        for serial_bus in self.serial_buses:
+            if serial_bus.port in ports:
+                msg = f"{LogPrefix.MODBUS} Duplicate port '{serial_bus.port}' found in 'modbus_serial_buses'!"
+                raise ConfigError(msg)
+
+            ports.append(serial_bus.port)
+
+            for modbus_unit in serial_bus.units:
+                if modbus_unit.unit in units:
+                    msg = f"{LogPrefix.MODBUS} Duplicate modbus unit '{modbus_unit.unit}' found in 'units'!"
+                    raise ConfigError(msg)
+
+                units.append(modbus_unit.unit)
+
+    def _validate_remote_neuron_names(self) -> None:
+        names: List[str] = [slugify(self.device_info.name)]
+
+        for remote_neuron in self.remote_neurons:
+            if slugify(remote_neuron.name) in names:
+                msg = f"{LogPrefix.MODBUS} Duplicate name '{remote_neuron.name}' found in 'remote_neurons'!"
+                raise ConfigError(msg)
+
+            names.append(slugify(remote_neuron.name))
+
+    def get_remote_neuron_config(self, remote_neuron: RemoteNeuronConfig) -> "Config":
+        """Get the config for a remote Unipi Neuron.
+
+        The remote Unipi Neuron uses its name as device name and MQTT topic prefix. It has no
+        extensions and no covers.
+
+        Parameters
+        ----------
+        remote_neuron: RemoteNeuronConfig
+            The remote Unipi Neuron from the ``remote_neurons`` config.
+
+        Returns
+        -------
+        Config:
+            A copy of this config for the remote Unipi Neuron.
+
+        """
+        config: Config = copy.copy(self)
+        config.device_info = dataclasses.replace(
+            self.device_info,
+            name=remote_neuron.name,
+            suggested_area=remote_neuron.suggested_area or self.device_info.suggested_area,
+        )
+        config.modbus_tcp = dataclasses.replace(self.modbus_tcp, host=remote_neuron.host, port=remote_neuron.port)
+        config.modbus_serial = dataclasses.replace(self.modbus_serial)
+        config.modbus_serial.units = []
+        config.modbus_serial_buses = []
+        config.remote_neurons = []
+        config.features = remote_neuron.features
+        config.covers = []
+
+        return config
+
+
+@dataclass
+class RemoteHardwareInfo:
+    model: str
+    name: str = field(default="Unipi Neuron")
+    version: str = field(default="unknown")
+    serial: str = field(default="unknown")
+
 
 @dataclass
 class HardwareInfo:
@@ -594,11 +909,14 @@ class HardwareType:
 
 
 class HardwareMap(Mapping[str, HardwareDefinition]):
-    def __init__(self, config: Config) -> None:
+    def __init__(self, config: Config, model: Optional[str] = None) -> None:
         self.config = config
 
         self.data: Dict[str, HardwareDefinition] = {}
-        self.info: HardwareInfo = HardwareInfo(sys_bus_dir=config.sys_bus_dir)
+        # Remote Unipi Neurons have an explicit model, the local hardware is read from the EEPROM.
+        self.info: Union[HardwareInfo, RemoteHardwareInfo] = (
+            RemoteHardwareInfo(model=model) if model else HardwareInfo(sys_bus_dir=config.sys_bus_dir)
+        )
 
         if self.info.model == "unknown":
             msg = "Hardware is not supported!"
@@ -617,6 +935,128 @@ class HardwareMap(Mapping[str, HardwareDefinition]):
     def __len__(self) -> int:
         return len(self.data)
 
+    @staticmethod
+    def compile_scan_plan(
+        modbus_register_blocks: List[ModbusRegisterBlock], unit: int, max_register_gap: int = 0
+    ) -> List[ModbusRegisterBlock]:
+        """Merge the register blocks from a hardware definition into a minimal read plan.
+
+        Blocks of the same slave and scan interval are merged if the gap between them is
+        not greater than ``max_register_gap`` and the merged block fits into one read PDU.
+        A merged block keeps the lowest ``max_staleness`` of its blocks.
+
+        Parameters
+        ----------
+        modbus_register_blocks: list
+            The register blocks from the hardware definition.
+        unit: int
+            The default slave for register blocks without slave.
+        max_register_gap: int
+            Maximum number of unused registers between two blocks that are read anyway.
+
+        Returns
+        -------
+        list:
+            Merged register blocks sorted by slave, scan interval and start register.
+
+        """
+        scan_plan: List[ModbusRegisterBlock] = []
+        register_blocks: List[ModbusRegisterBlock] = sorted(
+            (
+                ModbusRegisterBlock(
+                    start_reg=modbus_register_block["start_reg"],
+                    count=modbus_register_block["count"],
+                    slave=modbus_register_block.get("slave", unit),
+                    interval=float(modbus_register_block.get("interval") or 0),
+                    max_staleness=modbus_register_block.get("max_staleness"),
+                )
+                for modbus_register_block in modbus_register_blocks
+            ),
+            key=lambda register_block: (
+                register_block["slave"] or 0,
+                register_block["interval"] or 0,
+                register_block["start_reg"],
+            ),
+        )
+
+        for register_block in register_blocks:
+            if (
+                scan_plan
+                and scan_plan[-1]["slave"] == register_block["slave"]
+                and scan_plan[-1]["interval"] == register_block["interval"]
+            ):
+                last_block: ModbusRegisterBlock = scan_plan[-1]
+                last_end: int = last_block["start_reg"] + last_block["count"]
+                end: int = max(last_end, register_block["start_reg"] + register_block["count"])
+
+                if (
+                    register_block["start_reg"] - last_end <= max_register_gap
+                    and end - last_block["start_reg"] <= MODBUS_MAX_READ_REGISTERS
+                ):
+                    last_block["count"] = end - last_block["start_reg"]
+                    last_block["max_staleness"] = min(
+                        (
+                            max_staleness
+                            for max_staleness in (last_block["max_staleness"], register_block["max_staleness"])
+                            if max_staleness is not None
+                        ),
+                        default=None,
+                    )
+                    continue
+
+            scan_plan.append(register_block)
+
+        return scan_plan
+
+    def compile_feature_scan_plans(self, registers: Dict[int, Set[int]]) -> None:
+        """Rebuild the scan plans from the registers that are used by registered features.
+
+        Register blocks without a used register are dropped and the other blocks are
+        trimmed to the used registers before they are merged into the scan plan.
+
+        Parameters
+        ----------
+        registers: dict
+            Used register addresses by unit.
+
+        """
+        for definition in self.data.values():
+            used_registers: Set[int] = registers.get(definition.unit, set())
+            register_blocks: List[ModbusRegisterBlock] = []
+
+            for modbus_register_block in definition.modbus_register_blocks:
+                start_reg: int = modbus_register_block["start_reg"]
+                addresses: List[int] = [
+                    address
+                    for address in used_registers
+                    if start_reg <= address < start_reg + modbus_register_block["count"]
+                ]
+
+                if addresses:
+                    register_blocks.append(
+                        ModbusRegisterBlock(
+                            start_reg=min(addresses),
+                            count=max(addresses) - min(addresses) + 1,
+                            slave=modbus_register_block.get("slave", definition.unit),
+                            interval=modbus_register_block.get("interval"),
+                            max_staleness=modbus_register_block.get("max_staleness"),
+                        )
+                    )
+
+            definition.modbus_scan_plan[:] = self.compile_scan_plan(
+                modbus_register_blocks=register_blocks,
+                unit=definition.unit,
+                max_register_gap=(
+                    self.config.modbus_tcp.max_register_gap
+                    if definition.hardware_type == HardwareType.NEURON
+                    else self.config.get_serial_bus(definition.unit).max_register_gap
+                ),
+            )
+
+            UNIPI_LOGGER.debug(
+                "%s Scan plan for unit %s: %s", LogPrefix.CONFIG, definition.unit, definition.modbus_scan_plan
+            )
+
     def _read_neuron_definition(self) -> None:
         definition_file: Path = Path(f"{self.config.hardware_dir}/neuron/{self.info.model}.yaml")
 
@@ -633,6 +1073,11 @@ class HardwareMap(Mapping[str, HardwareDefinition]):
                     model=f"{self.info.name} {self.info.model}",
                     modbus_register_blocks=yaml_content["modbus_register_blocks"],
                     modbus_features=yaml_content["modbus_features"],
+                    modbus_scan_plan=self.compile_scan_plan(
+                        modbus_register_blocks=yaml_content["modbus_register_blocks"],
+                        unit=0,
+                        max_register_gap=self.config.modbus_tcp.max_register_gap,
+                    ),
                 )
                 UNIPI_LOGGER.debug("%s Definition loaded: %s", LogPrefix.CONFIG, definition_file)
             except KeyError as error:
@@ -653,22 +1098,28 @@ class HardwareMap(Mapping[str, HardwareDefinition]):
             try:
                 yaml_content: Dict[str, Any] = yaml_loader_safe(definition_file)
 
-                units: Iterator[ModbusUnitConfig] = self.config.modbus_serial.get_units_by_identifier(
-                    identifier=definition_file.stem
-                )
-
-                for unit in units:
-                    self.data[f"modbus_rtu_{unit.unit}"] = HardwareDefinition(
-                        unit=unit.unit,
-                        hardware_type=HardwareType.EXTENSION,
-                        device_name=unit.device_name,
-                        suggested_area=unit.suggested_area,
-                        manufacturer=yaml_content["manufacturer"],
-                        model=yaml_content["model"],
-                        modbus_register_blocks=yaml_content["modbus_register_blocks"],
-                        modbus_features=yaml_content["modbus_features"],
+                for serial_bus in self.config.serial_buses:
+                    units: Iterator[ModbusUnitConfig] = serial_bus.get_units_by_identifier(
+                        identifier=definition_file.stem
                     )
 
+                    for unit in units:
+                        self.data[f"modbus_rtu_{unit.unit}"] = HardwareDefinition(
+                            unit=unit.unit,
+                            hardware_type=HardwareType.EXTENSION,
+                            device_name=unit.device_name,
+                            suggested_area=unit.suggested_area,
+                            manufacturer=yaml_content["manufacturer"],
+                            model=yaml_content["model"],
+                            modbus_register_blocks=yaml_content["modbus_register_blocks"],
+                            modbus_features=yaml_content["modbus_features"],
+                            modbus_scan_plan=self.compile_scan_plan(
+                                modbus_register_blocks=yaml_content["modbus_register_blocks"],
+                                unit=unit.unit,
+                                max_register_gap=serial_bus.max_register_gap,
+                            ),
+                        )
+
                 UNIPI_LOGGER.debug("%s Definition loaded: %s", LogPrefix.CONFIG, definition_file)
             except KeyError as error:
                 msg = f"{LogPrefix.CONFIG} Definition is invalid: {definition_file}\nKeyError: {error}"
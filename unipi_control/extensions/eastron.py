@@ -17,7 +17,7 @@ from unipi_control.helpers.typing import HardwareDefinition
 from unipi_control.helpers.typing import ModbusClient
 from unipi_control.helpers.typing import ModbusReadData
 from unipi_control.modbus import ModbusCacheData
-from unipi_control.modbus import check_modbus_call
+from unipi_control.modbus import ModbusSerialBus
 
 if TYPE_CHECKING:
     from pymodbus.pdu import ModbusResponse
@@ -85,8 +85,11 @@ class EastronSDM120M:
         while retry:
             retry_reconnect += 1
 
-            response: Optional[ModbusResponse] = await check_modbus_call(
-                self.modbus_client.serial.read_holding_registers, data
+            serial_bus: ModbusSerialBus = self.modbus_cache_data.get_serial_bus(self.definition.unit)
+            response: Optional[ModbusResponse] = await serial_bus.scheduler.call(
+                self.modbus_cache_data.serial_callback(serial_bus.client.read_holding_registers, self.definition.unit),
+                data,
+                count=data["count"],
             )
 
             if response:
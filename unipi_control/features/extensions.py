@@ -1,15 +1,13 @@
 """Extensions features classes."""
 
+import struct
 from dataclasses import dataclass
 from functools import cached_property
 from typing import Callable
-from typing import Iterable
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
-from pymodbus.constants import Endian
-from pymodbus.payload import BinaryPayloadDecoder
-
 from unipi_control.config import Config
 from unipi_control.config import FeatureConfig
 from unipi_control.features.utils import FeatureType
@@ -48,12 +46,13 @@ class EastronMeter:
         props: MeterProps,
     ) -> None:
         self.config: Config = config
+        self.modbus: Modbus = modbus
         self.hardware: Hardware = hardware
         self.props: MeterProps = props
 
         self.features_config: Optional[FeatureConfig] = config.features.get(self.feature_id)
 
-        self._reg_value: Callable[..., Iterable[int]] = lambda: modbus.cache.get_register(
+        self._reg_value: Callable[..., memoryview] = lambda: modbus.cache.get_register(
             address=modbus.val_reg, index=2, unit=hardware.definition.unit
         )
         self.saved_value: Optional[Union[float, int]] = None
@@ -69,32 +68,26 @@ class EastronMeter:
     @property
     def value(self) -> Optional[float]:
         """Return Eastron meter value."""
-        _reg_value: Iterable[int] = self._reg_value()
-
-        return (
-            round(
-                float(
-                    BinaryPayloadDecoder.fromRegisters(  # type: ignore[no-untyped-call]
-                        _reg_value, byteorder=Endian.BIG, wordorder=Endian.BIG
-                    ).decode_32bit_float()
-                ),
-                2,
-            )
-            if _reg_value
-            else None
-        )
+        _reg_value: memoryview = self._reg_value()
+
+        return round(struct.unpack(">f", struct.pack(">2H", *_reg_value))[0], 2) if _reg_value else None
 
     @property
     def changed(self) -> bool:
         """Detect whether the status has changed."""
         changed: bool = False
 
-        if self.value != self.saved_value:
+        if (value := self.value) != self.saved_value:
             changed = True
-            self.saved_value = self.value
+            self.saved_value = value
 
         return changed
 
+    @cached_property
+    def registers(self) -> Tuple[int, ...]:
+        """Return the register addresses that hold the meter value."""
+        return (self.modbus.val_reg, self.modbus.val_reg + 1)
+
     @cached_property
     def feature_id(self) -> str:
         """Return slugify friendly name for unique feature id."""
@@ -7,13 +7,17 @@ from typing import Iterator
 from typing import List
 from typing import Mapping
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Union
 
 from unipi_control.config import LogPrefix
+from unipi_control.config import UNIPI_LOGGER
 from unipi_control.features.extensions import EastronMeter
 from unipi_control.features.neuron import DigitalInput
 from unipi_control.features.neuron import DigitalOutput
 from unipi_control.features.neuron import Led
+from unipi_control.features.neuron import Modbus
 from unipi_control.features.neuron import Relay
 from unipi_control.helpers.exception import ConfigError
 
@@ -21,9 +25,88 @@ if TYPE_CHECKING:
     from unipi_control.features.utils import FeatureType
 
 
+class DigitalStateVector:
+    """Evaluate the state of all bit-mapped features with a precomputed register and mask table.
+
+    The features are grouped by register. Each evaluated register is XORed with its previous
+    value, so all features of one register are checked with a single operation.
+    """
+
+    def __init__(self) -> None:
+        self.table: Dict[Tuple[int, int, str], List[Tuple[int, Union[DigitalInput, DigitalOutput, Led, Relay]]]] = {}
+        self.masks: Dict[Tuple[int, int, str], int] = {}
+        self.state: Dict[Tuple[int, int, str], int] = {}
+
+    def add(self, feature: Union[DigitalInput, DigitalOutput, Led, Relay]) -> None:
+        """Add a bit-mapped feature to the table.
+
+        Parameters
+        ----------
+        feature: Feature
+            Digital input or output feature.
+
+        """
+        key: Tuple[int, int, str] = (
+            feature.hardware.definition.unit,
+            feature.modbus.val_reg,
+            feature.hardware.feature_type.short_name,
+        )
+
+        self.table.setdefault(key, []).append((feature.mask, feature))
+        self.masks[key] = self.masks.get(key, 0) | feature.mask
+
+    def changed(
+        self, registers: Dict[int, Set[int]], feature_types: List[str]
+    ) -> List[Union[DigitalInput, DigitalOutput, Led, Relay]]:
+        """Get the features whose state changed and save their new state.
+
+        Parameters
+        ----------
+        registers: dict
+            Changed register addresses by unit.
+        feature_types: list
+            List of feature types e.g. DI, RO, ...
+
+        Returns
+        -------
+        list
+            Changed features.
+
+        """
+        changed: List[Union[DigitalInput, DigitalOutput, Led, Relay]] = []
+
+        for key, features in self.table.items():
+            unit, address, feature_type = key
+
+            if feature_type not in feature_types or address not in registers.get(unit, ()):
+                continue
+
+            modbus: Modbus = features[0][1].modbus
+
+            if not (register := modbus.cache.get_register(address=address, index=1, unit=unit)):
+                continue
+
+            value: int = register[0]
+            previous: Optional[int] = self.state.get(key)
+            diff: int = self.masks[key] if previous is None else (value ^ previous) & self.masks[key]
+            self.state[key] = value
+
+            if diff:
+                for mask, feature in features:
+                    if diff & mask:
+                        feature.saved_value = 1 if value & mask else 0
+                        changed.append(feature)
+
+        return changed
+
+
 class FeatureMap(Mapping[str, List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]]):
     def __init__(self) -> None:
         self.data: Dict[str, List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]] = {}
+        self.register_index: Dict[
+            Tuple[int, int], List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]
+        ] = {}
+        self.digital_states: DigitalStateVector = DigitalStateVector()
 
     def __getitem__(self, key: str) -> List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]:
         data: List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]] = self.data[key]
@@ -49,6 +132,10 @@ class FeatureMap(Mapping[str, List[Union[DigitalInput, DigitalOutput, Led, Relay
             Input or output feature.
 
         """
+        if feature.features_config and not feature.features_config.enabled:
+            UNIPI_LOGGER.debug("%s %s is disabled.", LogPrefix.FEATURE, feature.feature_id)
+            return
+
         feature_type: FeatureType = feature.hardware.feature_type
 
         if not self.get(feature_type.short_name):
@@ -56,6 +143,29 @@ class FeatureMap(Mapping[str, List[Union[DigitalInput, DigitalOutput, Led, Relay
 
         self.data[feature_type.short_name].append(feature)
 
+        for address in feature.registers:
+            self.register_index.setdefault((feature.hardware.definition.unit, address), []).append(feature)
+
+        if isinstance(feature, (DigitalInput, DigitalOutput, Led, Relay)):
+            self.digital_states.add(feature)
+
+    @property
+    def registers(self) -> Dict[int, Set[int]]:
+        """Get the register addresses that are used by the registered features.
+
+        Returns
+        -------
+        dict
+            Register addresses by unit.
+
+        """
+        registers: Dict[int, Set[int]] = {}
+
+        for unit, address in self.register_index:
+            registers.setdefault(unit, set()).add(address)
+
+        return registers
+
     def by_feature_id(
         self, feature_id: str, feature_types: Optional[List[str]] = None
     ) -> Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]:
@@ -95,6 +205,67 @@ class FeatureMap(Mapping[str, List[Union[DigitalInput, DigitalOutput, Led, Relay
 
         return features
 
+    def by_registers(
+        self, registers: Dict[int, Set[int]], feature_types: List[str]
+    ) -> Iterator[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]:
+        """Filter features that are read from the given registers.
+
+        Parameters
+        ----------
+        registers: dict
+            Register addresses by unit e.g. the changed registers from the last scan.
+        feature_types: list
+            List of feature types e.g. DI, RO, ...
+
+        Returns
+        -------
+        Iterator
+            A list of features without duplicates filtered by register and feature type.
+
+        """
+        features: Dict[int, Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]] = {}
+
+        for unit, addresses in registers.items():
+            for address in sorted(addresses):
+                for feature in self.register_index.get((unit, address), []):
+                    if feature.hardware.feature_type.short_name in feature_types:
+                        features.setdefault(id(feature), feature)
+
+        return iter(features.values())
+
+    def changed(
+        self, registers: Dict[int, Set[int]], feature_types: List[str]
+    ) -> List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]:
+        """Get the features from changed registers whose value changed.
+
+        Bit-mapped features are evaluated with the ``DigitalStateVector``. All other
+        features are checked one by one.
+
+        Parameters
+        ----------
+        registers: dict
+            Changed register addresses by unit.
+        feature_types: list
+            List of feature types e.g. DI, RO, ...
+
+        Returns
+        -------
+        list
+            Changed features.
+
+        """
+        changed: List[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]] = [
+            *self.digital_states.changed(registers, feature_types)
+        ]
+
+        changed.extend(
+            feature
+            for feature in self.by_registers(registers, feature_types)
+            if isinstance(feature, EastronMeter) and feature.changed
+        )
+
+        return changed
+
     def by_feature_types(
         self, feature_types: List[str]
     ) -> Iterator[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]]:
@@ -4,6 +4,7 @@ from dataclasses import dataclass
 from functools import cached_property
 from typing import Callable
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from pymodbus.pdu import ModbusResponse
@@ -15,9 +16,7 @@ from unipi_control.features.utils import FeatureType
 from unipi_control.helpers.text import slugify
 from unipi_control.helpers.typing import HardwareDefinition
 from unipi_control.helpers.typing import ModbusClient
-from unipi_control.helpers.typing import ModbusWriteData
 from unipi_control.modbus import ModbusCacheData
-from unipi_control.modbus import check_modbus_call
 
 
 @dataclass
@@ -66,12 +65,23 @@ class NeuronFeature:
         """Detect whether the status has changed."""
         changed: bool = False
 
-        if self.value != self.saved_value:
+        if (value := self.value) != self.saved_value:
             changed = True
-            self.saved_value = self.value
+            self.saved_value = value
 
         return changed
 
+    async def _write_coil(self, value: bool) -> Optional[ModbusResponse]:
+        if response := await self.modbus.cache.write_coil(self.val_coil, value):
+            self.modbus.cache.write_through(address=self.modbus.val_reg, mask=self.mask, value=value, unit=0)
+
+        return response
+
+    @cached_property
+    def registers(self) -> Tuple[int, ...]:
+        """Return the register addresses that hold the feature state."""
+        return (self.modbus.val_reg,)
+
     @cached_property
     def feature_id(self) -> str:
         """Return unique feature id."""
@@ -130,8 +140,12 @@ class NeuronFeature:
     @property
     def value(self) -> int:
         """Return the feature state as integer."""
-        mask: int = 0x1 << (self.hardware.feature_index % 16)
-        return 1 if self._reg_value() & mask else 0
+        return 1 if self._reg_value() & self.mask else 0
+
+    @cached_property
+    def mask(self) -> int:
+        """Return the bit mask for the feature state in the register."""
+        return 0x1 << (self.hardware.feature_index % 16)
 
     @cached_property
     def icon(self) -> Optional[str]:
@@ -165,13 +179,7 @@ class Relay(NeuronFeature):
         ModbusResponse
 
         """
-        data: ModbusWriteData = {
-            "address": self.val_coil,
-            "value": value,
-            "slave": 0,
-        }
-
-        return await check_modbus_call(self.modbus.client.tcp.write_coil, data)
+        return await self._write_coil(value)
 
 
 class DigitalOutput(NeuronFeature):
@@ -190,13 +198,7 @@ class DigitalOutput(NeuronFeature):
         ModbusResponse
 
         """
-        data: ModbusWriteData = {
-            "address": self.val_coil,
-            "value": value,
-            "slave": 0,
-        }
-
-        return await check_modbus_call(self.modbus.client.tcp.write_coil, data)
+        return await self._write_coil(value)
 
 
 class DigitalInput(NeuronFeature):
@@ -219,10 +221,4 @@ class Led(NeuronFeature):
         ModbusResponse
 
         """
-        data: ModbusWriteData = {
-            "address": self.val_coil,
-            "value": value,
-            "slave": 0,
-        }
-
-        return await check_modbus_call(self.modbus.client.tcp.write_coil, data)
+        return await self._write_coil(value)
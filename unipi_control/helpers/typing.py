@@ -1,23 +1,36 @@
 """Collection of typed tuples and dicts."""
 
+from types import MappingProxyType
 from typing import List
+from typing import Mapping
 from typing import NamedTuple
 from typing import Optional
 from typing import TypedDict
+from typing import Union
 
 from pymodbus.client import AsyncModbusSerialClient
 from pymodbus.client import AsyncModbusTcpClient
 
+from unipi_control.modbus_transport import LeanModbusRtuClient
+from unipi_control.modbus_transport import LeanModbusTcpClient
+
+ModbusTcpClient = Union[AsyncModbusTcpClient, LeanModbusTcpClient]
+ModbusSerialClient = Union[AsyncModbusSerialClient, LeanModbusRtuClient]
+
 
 class ModbusClient(NamedTuple):
-    tcp: AsyncModbusTcpClient
-    serial: AsyncModbusSerialClient
+    tcp: ModbusTcpClient
+    serial: ModbusSerialClient
+    # Clients of the additional RS-485 buses by port.
+    serial_buses: Mapping[str, ModbusSerialClient] = MappingProxyType({})
 
 
 class ModbusRegisterBlock(TypedDict):
     start_reg: int
     count: int
     slave: Optional[int]
+    interval: Optional[float]
+    max_staleness: Optional[float]
 
 
 class ModbusFeature(TypedDict):
@@ -41,6 +54,24 @@ class ModbusWriteData(TypedDict):
     slave: int
 
 
+class ModbusWriteMultipleData(TypedDict):
+    address: int
+    values: List[bool]
+    slave: int
+
+
+class ModbusWriteRegisterData(TypedDict):
+    address: int
+    value: int
+    slave: int
+
+
+class ModbusWriteMultipleRegistersData(TypedDict):
+    address: int
+    values: List[int]
+    slave: int
+
+
 class ModbusReadData(TypedDict):
     address: int
     count: int
@@ -56,3 +87,4 @@ class HardwareDefinition(NamedTuple):
     model: str
     modbus_register_blocks: List[ModbusRegisterBlock]
     modbus_features: List[ModbusFeature]
+    modbus_scan_plan: List[ModbusRegisterBlock]
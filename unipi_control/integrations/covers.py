@@ -566,8 +566,10 @@ class Cover:
                 self.status.position = CoverState.CLOSED_IN_PERCENT
                 return
 
-        await self.settings.cover_down_feature.set_state(False)
-        await self.settings.cover_up_feature.set_state(False)
+        await asyncio.gather(
+            self.settings.cover_down_feature.set_state(False),
+            self.settings.cover_up_feature.set_state(False),
+        )
 
         await self._write_position()
         self._stop_timer()
@@ -1,11 +1,23 @@
 """Modbus helpers and register caches."""
 
 import asyncio
+import heapq
+import itertools
+import time
+from array import array
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from typing import Any
+from typing import AsyncIterator
 from typing import Callable
 from typing import Dict
+from typing import Final
+from typing import Iterable
+from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Union
 
 from pymodbus.exceptions import ModbusException
@@ -13,16 +25,166 @@ from pymodbus.pdu import ModbusResponse
 
 from unipi_control.config import HardwareMap
 from unipi_control.config import LogPrefix
+from unipi_control.config import ModbusSerialConfig
 from unipi_control.config import UNIPI_LOGGER
 from unipi_control.helpers.typing import HardwareDefinition
 from unipi_control.helpers.typing import ModbusClient
 from unipi_control.helpers.typing import ModbusReadData
 from unipi_control.helpers.typing import ModbusRegisterBlock
+from unipi_control.helpers.typing import ModbusSerialClient
+from unipi_control.helpers.typing import ModbusTcpClient
 from unipi_control.helpers.typing import ModbusWriteData
+from unipi_control.helpers.typing import ModbusWriteMultipleData
+from unipi_control.helpers.typing import ModbusWriteMultipleRegistersData
+from unipi_control.helpers.typing import ModbusWriteRegisterData
+from unipi_control.modbus_transport import LeanModbusClient
+from unipi_control.modbus_transport import ModbusReadRequest
+
+ModbusRequestData = Union[
+    ModbusReadData,
+    ModbusWriteData,
+    ModbusWriteMultipleData,
+    ModbusWriteRegisterData,
+    ModbusWriteMultipleRegistersData,
+]
+
+
+class ModbusErrorLog:
+    """Aggregate repeated Modbus errors and log each error at most once per interval.
+
+    Attributes
+    ----------
+    interval: float
+        Minimum time in seconds between two log messages of the same error.
+    suppressed: dict
+        The number of suppressed log messages by error since the error was last logged.
+
+    """
+
+    def __init__(self, interval: float = 60) -> None:
+        self.interval: float = interval
+        self.suppressed: Dict[str, int] = {}
+        self._logged_at: Dict[str, float] = {}
+
+    def error(self, msg: str, *args: object) -> None:
+        """Log an error unless the same error was logged within the interval.
+
+        Parameters
+        ----------
+        msg: str
+            The log message format string.
+        args: object
+            The log message arguments.
+
+        """
+        message: str = msg % args
+        now: float = time.monotonic()
+
+        logged_at: float = self._logged_at.get(message, now - self.interval)
+
+        if now - logged_at < self.interval:
+            self.suppressed[message] = self.suppressed.get(message, 0) + 1
+            return
+
+        self._logged_at[message] = now
+
+        if suppressed := self.suppressed.pop(message, 0):
+            UNIPI_LOGGER.error("%s (%s times in the last %ss)", message, suppressed + 1, round(now - logged_at))
+        else:
+            UNIPI_LOGGER.error(message)
+
+
+class ModbusCircuitBreaker:
+    """Pause polling of units that stopped responding.
+
+    After ``failure_threshold`` consecutive failed requests a unit is not polled for ``backoff``
+    seconds. Every failed retry doubles the pause up to ``max_backoff``. The first successful
+    request resumes polling. Every slave, and optionally every register block, of a unit has
+    its own state.
+
+    Attributes
+    ----------
+    failure_threshold: int
+        Number of consecutive failed requests until polling is paused.
+    backoff: float
+        The first pause in seconds.
+    max_backoff: float
+        The maximum pause in seconds.
+
+    """
+
+    def __init__(self, failure_threshold: int = 3, backoff: float = 1.0, max_backoff: float = 300.0) -> None:
+        self.failure_threshold: int = failure_threshold
+        self.backoff: float = backoff
+        self.max_backoff: float = max_backoff
+
+        self._failures: Dict[Tuple[int, Optional[int], Optional[int]], int] = {}
+        self._backoff: Dict[Tuple[int, Optional[int], Optional[int]], float] = {}
+        self._retry_at: Dict[Tuple[int, Optional[int], Optional[int]], float] = {}
+
+    @staticmethod
+    def _name(unit: int, slave: Optional[int], register: Optional[int]) -> str:
+        name: str = f"Unit {unit}"
+
+        if slave is not None and slave != unit:
+            name += f" slave {slave}"
+
+        if register is not None:
+            name += f" register {register}"
+
+        return name
+
+    def allow(self, unit: int, slave: Optional[int] = None, register: Optional[int] = None) -> bool:
+        """Return whether a unit may be polled."""
+        return time.monotonic() >= self._retry_at.get((unit, slave, register), 0)
+
+    def is_open(self, unit: int, slave: Optional[int] = None, register: Optional[int] = None) -> bool:
+        """Return whether polling of a unit is paused or waits for a successful retry."""
+        return (unit, slave, register) in self._retry_at
+
+    def record(self, unit: int, slave: Optional[int] = None, register: Optional[int] = None, *, success: bool) -> None:
+        """Record the result of a request.
+
+        Parameters
+        ----------
+        unit: int
+            The unit the request was sent to.
+        slave: int, optional
+            The Modbus slave ID of the request.
+        register: int, optional
+            The first register of the register block, if every block has its own state.
+        success: bool
+            ``True`` if the unit responded.
+
+        """
+        key: Tuple[int, Optional[int], Optional[int]] = (unit, slave, register)
+
+        if success:
+            if self._retry_at.pop(key, None) is not None:
+                UNIPI_LOGGER.info("%s %s is responding again.", LogPrefix.MODBUS, self._name(*key))
+
+            self._failures.pop(key, None)
+            self._backoff.pop(key, None)
+            return
+
+        self._failures[key] = self._failures.get(key, 0) + 1
+
+        if self._failures[key] < self.failure_threshold:
+            return
+
+        backoff: float = min(self._backoff[key] * 2, self.max_backoff) if key in self._backoff else self.backoff
+        self._backoff[key] = backoff
+        self._retry_at[key] = time.monotonic() + backoff
+
+        UNIPI_LOGGER.warning(
+            "%s %s is not responding. Polling is paused for %.1fs.", LogPrefix.MODBUS, self._name(*key), backoff
+        )
 
 
 async def check_modbus_call(
-    callback: Callable[..., Any], data: Union[ModbusReadData, ModbusWriteData]
+    callback: Callable[..., Any],
+    data: ModbusRequestData,
+    errors: Optional[ModbusErrorLog] = None,
 ) -> Optional[ModbusResponse]:
     """Check modbus read/write call has errors and log the errors.
 
@@ -32,6 +194,8 @@ async def check_modbus_call(
         modbus callback function e.g. read_input_registers()
     data: ModbusReadData
         Arguments pass to the callback function
+    errors: ModbusErrorLog, optional
+        Aggregate repeated errors instead of logging every error.
 
     Returns
     -------
@@ -40,6 +204,10 @@ async def check_modbus_call(
 
     """
     response: Optional[ModbusResponse] = None
+    log_error: Callable[..., Any] = UNIPI_LOGGER.error
+
+    if errors:
+        log_error = errors.error
 
     try:
         response = await callback(**data)
@@ -47,13 +215,623 @@ async def check_modbus_call(
         if response and response.isError():
             response = None
     except ModbusException as error:
-        UNIPI_LOGGER.error("%s %s", LogPrefix.MODBUS, error)
+        log_error("%s %s", LogPrefix.MODBUS, error)
     except asyncio.exceptions.TimeoutError:
-        UNIPI_LOGGER.error("%s Timeout on: %s", LogPrefix.MODBUS, data)
+        log_error("%s Timeout on: %s", LogPrefix.MODBUS, data)
 
     return response
 
 
+async def check_modbus_read(
+    callback: Callable[..., Any],
+    request: ModbusReadRequest,
+    register_image: "RegisterImage",
+    errors: Optional[ModbusErrorLog] = None,
+) -> bool:
+    """Read registers with a lean Modbus client and log the errors like ``check_modbus_call``.
+
+    Parameters
+    ----------
+    callback: Callable
+        The ``read_into()`` function of a lean Modbus client.
+    request: ModbusReadRequest
+        The prebuilt read request.
+    register_image: RegisterImage
+        The register image of the unit.
+    errors: ModbusErrorLog, optional
+        Aggregate repeated errors instead of logging every error.
+
+    Returns
+    -------
+    bool
+        ``True`` if the registers were read.
+
+    """
+    log_error: Callable[..., Any] = UNIPI_LOGGER.error
+
+    if errors:
+        log_error = errors.error
+
+    try:
+        success: bool = await callback(request, register_image)
+    except ModbusException as error:
+        log_error("%s %s", LogPrefix.MODBUS, error)
+    except asyncio.exceptions.TimeoutError:
+        log_error("%s Timeout on: %s", LogPrefix.MODBUS, request.data)
+    else:
+        return success
+
+    return False
+
+
+class RegisterImage:
+    """Double-buffered register image of one unit.
+
+    The registers are stored in a compact ``array`` starting at the lowest address of the
+    scan plan. A scan writes into the back buffer and ``commit()`` swaps the buffers,
+    so readers always see the registers from one complete scan.
+
+    Bits written with ``set_bits()`` are applied over every response until a scan that
+    began after the write has committed the register, so a read that was sent before the
+    write can't revert the bits.
+
+    Attributes
+    ----------
+    base_address: int
+        The lowest register address in the image.
+    size: int
+        The number of registers in the image.
+    dirty: set
+        Register addresses that changed since the dirty registers were last taken.
+
+    """
+
+    def __init__(self, modbus_register_blocks: List[ModbusRegisterBlock]) -> None:
+        self.base_address: int = min((block["start_reg"] for block in modbus_register_blocks), default=0)
+        self.size: int = (
+            max((block["start_reg"] + block["count"] for block in modbus_register_blocks), default=0)
+            - self.base_address
+        )
+
+        self._registers: Tuple[array, array] = (array("H", bytes(2 * self.size)), array("H", bytes(2 * self.size)))
+        self._cached: Tuple[bytearray, bytearray] = (bytearray(self.size), bytearray(self.size))
+        self._views: Tuple[memoryview, memoryview] = (memoryview(self._registers[0]), memoryview(self._registers[1]))
+        self._front: int = 0
+        self._scan: int = 0
+        # Written bits by register offset: mask, bits and the scan that was running during the write.
+        self._written_bits: Dict[int, Tuple[int, int, int]] = {}
+        self._settled: Set[int] = set()
+
+        self.dirty: Set[int] = set()
+
+    def _offset(self, address: int, count: int) -> Optional[int]:
+        offset: int = address - self.base_address
+
+        if offset < 0 or offset + count > self.size:
+            return None
+
+        return offset
+
+    def begin(self) -> None:
+        """Prepare the back buffer for a new scan with the registers from the front buffer."""
+        back: int = 1 - self._front
+        self._registers[back][:] = self._registers[self._front]
+        self._cached[back][:] = self._cached[self._front]
+        self._scan += 1
+
+    def write(self, address: int, registers: Union[List[int], array]) -> None:
+        """Write registers from a modbus response into the back buffer.
+
+        Registers that differ from the previous scan are added to ``dirty``. Bits from
+        ``set_bits()`` are applied over responses to reads that may have been sent before the write.
+
+        Parameters
+        ----------
+        address: int
+            The starting address of the response.
+        registers: list or array
+            The registers from the modbus response. An ``array`` is written without conversion.
+
+        """
+        count: int = len(registers)
+
+        if (offset := self._offset(address, count)) is not None:
+            back: int = 1 - self._front
+            new_registers: array = registers if isinstance(registers, array) else array("H", registers)
+            cached: bytearray = self._cached[back]
+
+            if self._written_bits:
+                new_registers = self._apply_written_bits(offset, new_registers)
+
+            if cached.find(0, offset, offset + count) != -1 or self._views[back][offset : offset + count] != memoryview(
+                new_registers
+            ):
+                old_registers: array = self._registers[back]
+
+                self.dirty.update(
+                    address + index
+                    for index in range(count)
+                    if not cached[offset + index] or old_registers[offset + index] != new_registers[index]
+                )
+
+            self._registers[back][offset : offset + count] = new_registers
+            cached[offset : offset + count] = b"\x01" * count
+
+    def _apply_written_bits(self, offset: int, registers: array) -> array:
+        written_registers: Optional[array] = None
+
+        for written_offset, (mask, bits, scan) in self._written_bits.items():
+            if not offset <= written_offset < offset + len(registers):
+                continue
+
+            # A scan that began after the write sent this read, so the response replaces the written bits.
+            if scan < self._scan:
+                self._settled.add(written_offset)
+                continue
+
+            if written_registers is None:
+                written_registers = array("H", registers)
+
+            written_registers[written_offset - offset] = written_registers[written_offset - offset] & ~mask | bits
+
+        return registers if written_registers is None else written_registers
+
+    def set_bits(self, address: int, mask: int, value: bool) -> None:
+        """Write bits of a cached register in both buffers, e.g. after a successful coil write.
+
+        The bits are kept until a read that was sent after the write is committed, which
+        corrects the bits if the write did not take effect.
+
+        Parameters
+        ----------
+        address: int
+            The register address.
+        mask: int
+            The bit mask of the register bits.
+        value: bool
+            Set the bits if ``True`` else clear the bits.
+
+        """
+        if (offset := self._offset(address, 1)) is None or not self._cached[self._front][offset]:
+            return
+
+        for registers in self._registers:
+            registers[offset] = registers[offset] | mask if value else registers[offset] & ~mask
+
+        written_mask, bits, _ = self._written_bits.get(offset, (0, 0, 0))
+        self._written_bits[offset] = (written_mask | mask, bits & ~mask | (mask if value else 0), self._scan)
+        self._settled.discard(offset)
+
+        self.dirty.add(address)
+
+    def pop_dirty(self) -> Set[int]:
+        """Take the changed register addresses and reset the dirty registers."""
+        dirty: Set[int] = self.dirty
+        self.dirty = set()
+
+        return dirty
+
+    def commit(self) -> None:
+        """Swap the buffers and publish the scanned registers to the readers."""
+        self._front = 1 - self._front
+
+        for offset in self._settled:
+            self._written_bits.pop(offset, None)
+
+        self._settled.clear()
+
+    def read(self, address: int, count: int) -> Optional[memoryview]:
+        """Read registers from the front buffer.
+
+        Parameters
+        ----------
+        address: int
+            The starting address to read from.
+        count: int
+            The number of registers to read.
+
+        Returns
+        -------
+        memoryview, optional
+            A zero-copy view on the registers or ``None`` if any register is not cached.
+
+        """
+        offset: Optional[int] = self._offset(address, count)
+
+        if offset is None or self._cached[self._front].find(0, offset, offset + count) != -1:
+            return None
+
+        return self._views[self._front][offset : offset + count]
+
+
+class SerialBusScheduler:
+    """Pace the requests on the RS-485 bus from the baud rate.
+
+    A request is sent as soon as the previous transaction and the inter-frame
+    silence of 3.5 character times are over.
+
+    Attributes
+    ----------
+    character_time: float
+        Time in seconds to transmit one character.
+    silence: float
+        Inter-frame silence in seconds.
+
+    """
+
+    # Read registers request: unit, function code, address, count and CRC.
+    REQUEST_FRAME_SIZE: Final[int] = 8
+    # Read registers response without registers: unit, function code, byte count and CRC.
+    RESPONSE_FRAME_SIZE: Final[int] = 5
+    # Fixed inter-frame silence for baud rates greater than 19200 (Modbus over serial line, 2.5.1.1).
+    MIN_SILENCE: Final[float] = 0.00175
+
+    def __init__(self, baud_rate: int, parity: str) -> None:
+        # Start bit, 8 data bits, optional parity bit and stop bit.
+        self.character_time: float = (10 if parity == "N" else 11) / baud_rate
+        self.silence: float = 3.5 * self.character_time if baud_rate <= 19200 else self.MIN_SILENCE
+        self._ready_at: float = 0
+
+    def transaction_time(self, count: int) -> float:
+        """Get the expected time of a read registers transaction.
+
+        Parameters
+        ----------
+        count: int
+            The number of registers to read.
+
+        Returns
+        -------
+        float
+            Time in seconds to transmit the request and the response.
+
+        """
+        return (self.REQUEST_FRAME_SIZE + self.RESPONSE_FRAME_SIZE + 2 * count) * self.character_time + self.silence
+
+    async def pace(self, count: int) -> None:
+        """Wait until the bus is free for the next request.
+
+        Parameters
+        ----------
+        count: int
+            The number of registers of the next request.
+
+        """
+        if (delay := self._ready_at - time.monotonic()) > 0:
+            await asyncio.sleep(delay)
+
+        self._ready_at = time.monotonic() + self.transaction_time(count) + self.silence
+
+
+@dataclass
+class ModbusWaitTime:
+    """Statistics about how long requests waited for the Modbus client."""
+
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    @property
+    def mean(self) -> float:
+        """Return the mean wait time in seconds."""
+        return self.total / self.count if self.count else 0
+
+    def add(self, wait_time: float) -> None:
+        """Add the wait time of one request.
+
+        Parameters
+        ----------
+        wait_time: float
+            Time in seconds the request waited for the client.
+
+        """
+        self.count += 1
+        self.total += wait_time
+        self.max = max(self.max, wait_time)
+
+
+class ModbusScheduler:
+    """Schedule all transactions of one Modbus client.
+
+    Queued requests are served by priority, so coil writes are sent before queued
+    polling reads. Requests with the same priority are served in order.
+
+    Attributes
+    ----------
+    max_in_flight: int
+        Maximum number of requests that are sent at the same time.
+    name: str
+        The name of the client in log messages.
+    log_interval: float
+        Time in seconds between two log messages of the wait times.
+    wait_times: dict
+        Wait time statistics by priority since the wait times were last logged.
+
+    """
+
+    WRITE: Final[int] = 0
+    READ: Final[int] = 1
+
+    def __init__(
+        self,
+        max_in_flight: int = 1,
+        serial_bus: Optional[SerialBusScheduler] = None,
+        errors: Optional[ModbusErrorLog] = None,
+        name: str = "Modbus",
+        log_interval: float = 60,
+    ) -> None:
+        self.max_in_flight: int = max_in_flight
+        self.serial_bus: Optional[SerialBusScheduler] = serial_bus
+        self.errors: Optional[ModbusErrorLog] = errors
+        self.name: str = name
+        self.log_interval: float = log_interval
+        self.wait_times: Dict[int, ModbusWaitTime] = {self.WRITE: ModbusWaitTime(), self.READ: ModbusWaitTime()}
+
+        self._logged_at: float = time.monotonic()
+
+        self._in_flight: int = 0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence: Iterator[int] = itertools.count()
+
+    async def _acquire(self, priority: int) -> None:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._in_flight += 1
+            return
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                self._release()
+
+            raise
+
+    def _log_wait_times(self) -> None:
+        if (now := time.monotonic()) - self._logged_at < self.log_interval:
+            return
+
+        self._logged_at = now
+
+        for priority, request_type in ((self.WRITE, "write"), (self.READ, "read")):
+            if (wait_time := self.wait_times[priority]).count:
+                UNIPI_LOGGER.debug(
+                    "%s [%s] %s %s request(s) waited %.1f ms on average and %.1f ms at most.",
+                    LogPrefix.MODBUS,
+                    self.name,
+                    wait_time.count,
+                    request_type,
+                    wait_time.mean * 1e3,
+                    wait_time.max * 1e3,
+                )
+
+        self.wait_times = {self.WRITE: ModbusWaitTime(), self.READ: ModbusWaitTime()}
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+
+            if not future.done():
+                self._in_flight += 1
+                future.set_result(None)
+                break
+
+    async def call(
+        self,
+        callback: Callable[..., Any],
+        data: ModbusRequestData,
+        priority: int = READ,
+        count: int = 1,
+    ) -> Optional[ModbusResponse]:
+        """Wait for the client and send a request.
+
+        Parameters
+        ----------
+        callback: Callable
+            modbus callback function e.g. read_input_registers()
+        data: ModbusReadData
+            Arguments pass to the callback function
+        priority: int
+            ``WRITE`` or ``READ``. Lower values are served first.
+        count: int
+            The number of registers of the request. Used to pace the serial bus.
+
+        Returns
+        -------
+        ModbusResponse: optional
+            Return modbus response if no errors found else None.
+
+        """
+        async with self._slot(priority, count):
+            return await check_modbus_call(callback, data, errors=self.errors)
+
+    async def read_into(
+        self, callback: Callable[..., Any], request: ModbusReadRequest, register_image: RegisterImage
+    ) -> bool:
+        """Wait for the client and read registers straight into the register image.
+
+        Parameters
+        ----------
+        callback: Callable
+            The ``read_into()`` function of a lean Modbus client.
+        request: ModbusReadRequest
+            The prebuilt read request.
+        register_image: RegisterImage
+            The register image of the unit.
+
+        Returns
+        -------
+        bool
+            ``True`` if the registers were read.
+
+        """
+        async with self._slot(self.READ, request.data["count"]):
+            return await check_modbus_read(callback, request, register_image, errors=self.errors)
+
+    @asynccontextmanager
+    async def _slot(self, priority: int, count: int) -> AsyncIterator[None]:
+        queued_at: float = time.monotonic()
+        await self._acquire(priority)
+
+        try:
+            self.wait_times[priority].add(time.monotonic() - queued_at)
+            self._log_wait_times()
+
+            if self.serial_bus:
+                await self.serial_bus.pace(count)
+
+            yield
+        finally:
+            self._release()
+
+
+class CoilWriteCoalescer:
+    """Collect coil writes and send contiguous coils with one ``write_coils`` request.
+
+    All coil writes within ``window`` seconds are sent together. Coils are switched off
+    before coils are switched on, e.g. the other direction of a cover.
+
+    Attributes
+    ----------
+    window: float
+        Time in seconds to collect coil writes.
+
+    """
+
+    def __init__(self, modbus_client: ModbusClient, scheduler: ModbusScheduler, window: float = 0) -> None:
+        self.modbus_client: ModbusClient = modbus_client
+        self.scheduler: ModbusScheduler = scheduler
+        self.window: float = window
+
+        self._pending: Dict[int, Tuple[bool, List[asyncio.Future]]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _contiguous_ranges(addresses: List[int]) -> Iterator[List[int]]:
+        coil_range: List[int] = []
+
+        for address in addresses:
+            if coil_range and address != coil_range[-1] + 1:
+                yield coil_range
+                coil_range = []
+
+            coil_range.append(address)
+
+        if coil_range:
+            yield coil_range
+
+    async def _write_coils(self, coil_range: List[int], value: bool) -> Optional[ModbusResponse]:
+        if len(coil_range) == 1:
+            data: ModbusWriteData = {"address": coil_range[0], "value": value, "slave": 0}
+            return await self.scheduler.call(self.modbus_client.tcp.write_coil, data, priority=ModbusScheduler.WRITE)
+
+        multiple_data: ModbusWriteMultipleData = {
+            "address": coil_range[0],
+            "values": [value] * len(coil_range),
+            "slave": 0,
+        }
+        return await self.scheduler.call(
+            self.modbus_client.tcp.write_coils, multiple_data, priority=ModbusScheduler.WRITE
+        )
+
+    @staticmethod
+    def _answer(pending: Dict[int, Tuple[bool, List[asyncio.Future]]], response: Optional[ModbusResponse]) -> None:
+        for _, futures in pending.values():
+            for future in futures:
+                if not future.done():
+                    future.set_result(response)
+
+    async def _flush(self) -> None:
+        pending: Dict[int, Tuple[bool, List[asyncio.Future]]] = {}
+
+        try:
+            await asyncio.sleep(self.window)
+
+            pending = self._pending
+            self._pending = {}
+            # Writes from now on are sent by the next flush.
+            self._flush_task = None
+
+            for value in (False, True):
+                addresses: List[int] = sorted(address for address, coil in pending.items() if coil[0] is value)
+
+                for coil_range in self._contiguous_ranges(addresses):
+                    response: Optional[ModbusResponse] = await self._write_coils(coil_range, value)
+                    self._answer({address: pending[address] for address in coil_range}, response)
+        except Exception as error:  # noqa: BLE001
+            UNIPI_LOGGER.error("%s Coil write failed: %s", LogPrefix.MODBUS, error)
+        finally:
+            self._answer(pending, None)
+
+    def _flush_done(self, task: asyncio.Task) -> None:
+        # The flush was cancelled before it took the pending writes.
+        if self._flush_task is task:
+            pending: Dict[int, Tuple[bool, List[asyncio.Future]]] = self._pending
+            self._pending = {}
+            self._flush_task = None
+            self._answer(pending, None)
+
+    async def write(self, address: int, value: bool) -> Optional[ModbusResponse]:
+        """Queue a coil write and wait until it is sent.
+
+        A later write to the same coil within the window replaces the earlier value.
+
+        Parameters
+        ----------
+        address: int
+            The coil address.
+        value: bool
+            The coil value.
+
+        Returns
+        -------
+        ModbusResponse: optional
+            Return modbus response if no errors found else None.
+
+        """
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        futures: List[asyncio.Future] = self._pending.get(address, (value, []))[1]
+        futures.append(future)
+        self._pending[address] = (value, futures)
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush())
+            self._flush_task.add_done_callback(self._flush_done)
+
+        response: Optional[ModbusResponse] = await future
+        return response
+
+
+class ModbusSerialBus:
+    """One RS-485 bus with its own client, pacing, scheduler and circuit breaker.
+
+    Attributes
+    ----------
+    config: ModbusSerialConfig
+        The bus configuration with its units.
+    client: AsyncModbusSerialClient or LeanModbusRtuClient
+        The Modbus RTU client of the bus.
+    pacing: SerialBusScheduler
+        Paces the requests from the baud rate.
+    scheduler: ModbusScheduler
+        Schedules all transactions on the bus.
+    circuit_breaker: ModbusCircuitBreaker
+        Pauses polling of units that stopped responding.
+
+    """
+
+    def __init__(self, config: ModbusSerialConfig, client: ModbusSerialClient, errors: ModbusErrorLog) -> None:
+        self.config: ModbusSerialConfig = config
+        self.client: ModbusSerialClient = client
+        self.pacing: SerialBusScheduler = SerialBusScheduler(baud_rate=config.baud_rate, parity=config.parity)
+        self.scheduler: ModbusScheduler = ModbusScheduler(serial_bus=self.pacing, errors=errors, name=config.port)
+        self.circuit_breaker: ModbusCircuitBreaker = ModbusCircuitBreaker(max_backoff=config.max_backoff)
+
+
 class ModbusCacheData:
     """Class that scan modbus register blocks and cache the response.
 
@@ -70,42 +848,467 @@ class ModbusCacheData:
         self.modbus_client: ModbusClient = modbus_client
         self.hardware: HardwareMap = hardware
 
-        self.data: Dict[int, Dict[int, int]] = {}
+        self.errors: ModbusErrorLog = ModbusErrorLog()
+        # The Neuron has up to three SPI boards that are scanned in parallel.
+        max_in_flight: int = 3 if hardware.config.modbus_tcp.concurrent_scan else 1
+
+        if hardware.config.modbus_tcp.pipeline_window > 1:
+            max_in_flight = hardware.config.modbus_tcp.pipeline_window
+
+        self.tcp_scheduler: ModbusScheduler = ModbusScheduler(
+            max_in_flight=max_in_flight,
+            errors=self.errors,
+            name=f"{hardware.config.modbus_tcp.host}:{hardware.config.modbus_tcp.port}",
+        )
+        self.tcp_circuit_breaker: ModbusCircuitBreaker = ModbusCircuitBreaker(
+            max_backoff=hardware.config.modbus_tcp.max_backoff
+        )
+        # Every RS-485 bus is scanned independently, ``modbus_serial`` is the first bus.
+        self.serial_buses: Dict[str, ModbusSerialBus] = {
+            serial_bus.port: ModbusSerialBus(
+                config=serial_bus,
+                client=modbus_client.serial_buses.get(serial_bus.port, modbus_client.serial),
+                errors=self.errors,
+            )
+            for serial_bus in hardware.config.serial_buses
+        }
+        self.serial_bus: SerialBusScheduler = self.serial_buses[hardware.config.modbus_serial.port].pacing
+        self.serial_scheduler: ModbusScheduler = self.serial_buses[hardware.config.modbus_serial.port].scheduler
+        self.coil_writer: CoilWriteCoalescer = CoilWriteCoalescer(
+            modbus_client=modbus_client,
+            scheduler=self.tcp_scheduler,
+            window=hardware.config.modbus_tcp.write_coalesce_window,
+        )
+
+        self.data: Dict[int, RegisterImage] = {}
+        self._next_scan: Dict[Tuple[int, Optional[int], int], float] = {}
+        self._last_scan: Dict[Tuple[int, Optional[int], int], float] = {}
+        self._first_scan: Dict[Tuple[int, Optional[int], int], float] = {}
+        self._read_requests: Dict[Tuple[int, Optional[int], int], ModbusReadRequest] = {}
+        self._max_staleness: Dict[int, float] = {
+            unit.unit: unit.max_staleness for serial_bus in hardware.config.serial_buses for unit in serial_bus.units
+        }
+        self._stale: Set[Tuple[int, Optional[int], int]] = set()
+        self._written: Optional[asyncio.Event] = None
+        self.staleness_misses: Dict[Tuple[int, Optional[int], int], int] = {}
+
+    @staticmethod
+    def _register_block_key(
+        modbus_register_block: ModbusRegisterBlock, definition: HardwareDefinition
+    ) -> Tuple[int, Optional[int], int]:
+        return definition.unit, modbus_register_block["slave"], modbus_register_block["start_reg"]
+
+    def _get_max_staleness(self, modbus_register_block: ModbusRegisterBlock, definition: HardwareDefinition) -> float:
+        return modbus_register_block["max_staleness"] or self._max_staleness.get(definition.unit, 0)
+
+    def _get_circuit_breaker(self, scan_type: str, unit: int) -> ModbusCircuitBreaker:
+        return self.tcp_circuit_breaker if scan_type == "tcp" else self.get_serial_bus(unit).circuit_breaker
+
+    @staticmethod
+    def _circuit_breaker_key(
+        scan_type: str, modbus_register_block: ModbusRegisterBlock, definition: HardwareDefinition
+    ) -> Tuple[int, Optional[int], Optional[int]]:
+        # The SPI boards of a Neuron share the unit and are addressed as slave 1, 2 and 3. On Modbus TCP every
+        # register block has its own state, so a dead board or register block doesn't pause the others. A serial
+        # unit is one device.
+        register: Optional[int] = modbus_register_block["start_reg"] if scan_type == "tcp" else None
+
+        return definition.unit, modbus_register_block["slave"], register
+
+    def _allow(
+        self, scan_type: str, modbus_register_block: ModbusRegisterBlock, definition: HardwareDefinition
+    ) -> bool:
+        return self._get_circuit_breaker(scan_type, definition.unit).allow(
+            *self._circuit_breaker_key(scan_type, modbus_register_block, definition)
+        )
+
+    def get_serial_bus(self, unit: int) -> ModbusSerialBus:
+        """Get the RS-485 bus of a unit.
+
+        Parameters
+        ----------
+        unit: int
+            The modbus RTU unit ID.
+
+        Returns
+        -------
+        ModbusSerialBus
+            The bus with this unit or the ``modbus_serial`` bus if no bus has this unit.
+
+        """
+        return self.serial_buses[self.hardware.config.get_serial_bus(unit).port]
 
     async def _save_response(
         self, scan_type: str, modbus_register_block: ModbusRegisterBlock, definition: HardwareDefinition
     ) -> None:
+        key: Tuple[int, Optional[int], int] = self._register_block_key(modbus_register_block, definition)
+        client: Union[ModbusTcpClient, ModbusSerialClient] = self.modbus_client.tcp
+        scheduler: ModbusScheduler = self.tcp_scheduler
+
+        if scan_type == "serial":
+            serial_bus: ModbusSerialBus = self.get_serial_bus(definition.unit)
+            client = serial_bus.client
+            scheduler = serial_bus.scheduler
+
+        if isinstance(client, LeanModbusClient):
+            success: bool = await self._read_into(scan_type, client, modbus_register_block, definition)
+        else:
+            success = await self._read_response(scan_type, client, scheduler, modbus_register_block, definition)
+
+        self._get_circuit_breaker(scan_type, definition.unit).record(
+            *self._circuit_breaker_key(scan_type, modbus_register_block, definition), success=success
+        )
+
+        if success:
+            self._last_scan[key] = time.monotonic()
+
+    async def _read_into(
+        self,
+        scan_type: str,
+        client: LeanModbusClient,
+        modbus_register_block: ModbusRegisterBlock,
+        definition: HardwareDefinition,
+    ) -> bool:
+        key: Tuple[int, Optional[int], int] = self._register_block_key(modbus_register_block, definition)
+
+        # The request frames of the scan plan are built once and sent in every scan.
+        if (request := self._read_requests.get(key)) is None:
+            request = self._read_requests[key] = ModbusReadRequest(
+                slave=modbus_register_block["slave"] or 0,
+                address=modbus_register_block["start_reg"],
+                count=modbus_register_block["count"],
+            )
+
+        if scan_type == "serial":
+            return await self.get_serial_bus(definition.unit).scheduler.read_into(
+                self.serial_callback(client.read_into, definition.unit), request, self.data[definition.unit]
+            )
+
+        return await self.tcp_scheduler.read_into(client.read_into, request, self.data[definition.unit])
+
+    async def _read_response(
+        self,
+        scan_type: str,
+        client: Union[ModbusTcpClient, ModbusSerialClient],
+        scheduler: ModbusScheduler,
+        modbus_register_block: ModbusRegisterBlock,
+        definition: HardwareDefinition,
+    ) -> bool:
         data: ModbusReadData = {
             "address": modbus_register_block["start_reg"],
             "count": modbus_register_block["count"],
-            "slave": modbus_register_block.get("slave", definition.unit),
+            "slave": modbus_register_block["slave"],
         }
 
-        response: Optional[ModbusResponse] = None
+        callback: Callable[..., Any] = client.read_input_registers
+
+        if scan_type == "serial":
+            callback = self.serial_callback(client.read_input_registers, definition.unit)
 
-        if scan_type == "tcp":
-            response = await check_modbus_call(self.modbus_client.tcp.read_input_registers, data)
-        elif scan_type == "serial":
-            response = await check_modbus_call(self.modbus_client.serial.read_input_registers, data)
+        response: Optional[ModbusResponse] = await scheduler.call(callback, data, count=data["count"])
 
         if response:
-            register: List[int] = response.registers
-            for index in range(data["count"]):
-                self.data[definition.unit][data["address"] + index] = register[index]
+            self.data[definition.unit].write(data["address"], response.registers)
+
+        return response is not None
+
+    async def _scan_register_blocks(
+        self, scan_type: str, modbus_register_blocks: Iterable[ModbusRegisterBlock], definition: HardwareDefinition
+    ) -> None:
+        for modbus_register_block in modbus_register_blocks:
+            # Don't wait for the timeouts of the remaining blocks if the unit stopped responding.
+            if not self._allow(scan_type, modbus_register_block, definition):
+                continue
+
+            await self._save_response(scan_type, modbus_register_block, definition)
+
+    def serial_callback(self, callback: Callable[..., Any], unit: int) -> Callable[..., Any]:
+        """Apply the timeout and retries of a unit before a serial client request is sent.
+
+        The serial scheduler sends one request at a time, so the client settings can be changed per request.
+
+        Parameters
+        ----------
+        callback: Callable
+            modbus callback function of the serial client e.g. read_input_registers()
+        unit: int
+            The unit this request is targeting.
+
+        Returns
+        -------
+        Callable
+            The callback with the unit timeout and retries.
+
+        """
+        serial_bus: ModbusSerialBus = self.get_serial_bus(unit)
+        timeout: float = serial_bus.config.timeout
+        retries: int = serial_bus.config.retries
+
+        for modbus_unit in serial_bus.config.units:
+            if modbus_unit.unit == unit:
+                timeout = modbus_unit.timeout or timeout
+                retries = modbus_unit.retries if modbus_unit.retries is not None else retries
+
+        async def _callback(
+            *args: Union[ModbusReadRequest, RegisterImage], **kwargs: int
+        ) -> Union[ModbusResponse, bool]:
+            serial_bus.client.comm_params.timeout_connect = timeout
+            serial_bus.client.retries = retries
+            response: Union[ModbusResponse, bool] = await callback(*args, **kwargs)
+            return response
+
+        return _callback
+
+    def _check_staleness(self, modbus_register_block: ModbusRegisterBlock, definition: HardwareDefinition) -> None:
+        if not (max_staleness := self._get_max_staleness(modbus_register_block, definition)):
+            return
+
+        now: float = time.monotonic()
+        key: Tuple[int, Optional[int], int] = self._register_block_key(modbus_register_block, definition)
+        staleness: float = now - self._last_scan.get(key, self._first_scan.setdefault(key, now))
+
+        if staleness <= max_staleness:
+            self._stale.discard(key)
+        elif key not in self._stale:
+            self._stale.add(key)
+            self.staleness_misses[key] = self.staleness_misses.get(key, 0) + 1
+
+            UNIPI_LOGGER.warning(
+                "%s Unit %s missed the staleness target of %ss on register %s (%.2fs).",
+                LogPrefix.MODBUS,
+                definition.unit,
+                max_staleness,
+                modbus_register_block["start_reg"],
+                staleness,
+            )
+
+    def _due_register_blocks(
+        self, scan_type: str, definitions: Iterable[HardwareDefinition]
+    ) -> Iterator[Tuple[ModbusRegisterBlock, HardwareDefinition]]:
+        now: float = time.monotonic()
+
+        for definition in definitions:
+            for modbus_register_block in definition.modbus_scan_plan:
+                # Units that stopped responding are polled again after the circuit breaker backoff.
+                if not self._allow(scan_type, modbus_register_block, definition):
+                    continue
+
+                self._check_staleness(modbus_register_block, definition)
+
+                if self._next_scan.get(self._register_block_key(modbus_register_block, definition), 0) <= now:
+                    yield modbus_register_block, definition
+
+    def _round_robin_register_blocks(
+        self, definitions: Iterable[HardwareDefinition], serial_bus: ModbusSerialBus
+    ) -> List[Tuple[ModbusRegisterBlock, HardwareDefinition]]:
+        due_register_blocks: List[Tuple[ModbusRegisterBlock, HardwareDefinition]] = list(
+            self._due_register_blocks("serial", definitions)
+        )
+        # Blocks without a staleness target should be read once per round-robin cycle.
+        cycle_time: float = sum(
+            serial_bus.pacing.transaction_time(modbus_register_block["count"]) + serial_bus.pacing.silence
+            for modbus_register_block, _ in due_register_blocks
+        )
+        now: float = time.monotonic()
+
+        def urgency(item: Tuple[ModbusRegisterBlock, HardwareDefinition]) -> float:
+            if (last_scan := self._last_scan.get(self._register_block_key(*item))) is None:
+                return float("inf")
+
+            return (now - last_scan) / (self._get_max_staleness(*item) or cycle_time)
+
+        return sorted(due_register_blocks, key=urgency, reverse=True)[: serial_bus.config.blocks_per_cycle]
+
+    async def _scan_concurrent(
+        self, scan_type: str, due_register_blocks: List[ModbusRegisterBlock], definition: HardwareDefinition
+    ) -> None:
+        modbus_register_blocks: Dict[Optional[int], List[ModbusRegisterBlock]] = {}
+
+        for modbus_register_block in due_register_blocks:
+            modbus_register_blocks.setdefault(modbus_register_block["slave"], []).append(modbus_register_block)
+
+        results: List[Optional[BaseException]] = await asyncio.gather(
+            *(
+                self._scan_register_blocks(scan_type, slave_register_blocks, definition)
+                for slave_register_blocks in modbus_register_blocks.values()
+            ),
+            return_exceptions=True,
+        )
+
+        for slave, result in zip(modbus_register_blocks, results):
+            if isinstance(result, Exception):
+                UNIPI_LOGGER.error("%s Scan failed on slave %s: %s", LogPrefix.MODBUS, slave, result)
+
+    async def _scan_pipelined(
+        self, scan_type: str, modbus_register_blocks: List[ModbusRegisterBlock], definition: HardwareDefinition
+    ) -> None:
+        pending_register_blocks: Iterator[ModbusRegisterBlock] = iter(modbus_register_blocks)
+
+        # Every worker sends the next request as soon as its response is matched by the transaction ID,
+        # so up to ``pipeline_window`` requests of the scan plan are in flight at the same time.
+        results: List[Optional[BaseException]] = await asyncio.gather(
+            *(
+                self._scan_register_blocks(scan_type, pending_register_blocks, definition)
+                for _ in range(self.hardware.config.modbus_tcp.pipeline_window)
+            ),
+            return_exceptions=True,
+        )
+
+        for result in results:
+            if isinstance(result, Exception):
+                UNIPI_LOGGER.error("%s Scan failed on unit %s: %s", LogPrefix.MODBUS, definition.unit, result)
+
+    async def _scan_definitions(
+        self, scan_type: str, definitions: List[HardwareDefinition], serial_bus: Optional[ModbusSerialBus] = None
+    ) -> None:
+        due_register_blocks: Dict[int, List[ModbusRegisterBlock]] = {}
+
+        register_blocks: Iterable[Tuple[ModbusRegisterBlock, HardwareDefinition]] = (
+            self._round_robin_register_blocks(definitions, serial_bus)
+            if serial_bus and serial_bus.config.polling == "round_robin"
+            else list(self._due_register_blocks(scan_type, definitions))
+        )
 
-    async def scan(self, scan_type: str, hardware_types: List[str]) -> None:
-        """Read modbus register blocks and cache the response."""
-        for definition in self.hardware.get_definition_by_hardware_types(hardware_types):
+        now: float = time.monotonic()
+
+        for modbus_register_block, definition in register_blocks:
+            key: Tuple[int, Optional[int], int] = self._register_block_key(modbus_register_block, definition)
+            self._next_scan[key] = now + (modbus_register_block["interval"] or 0)
+            due_register_blocks.setdefault(definition.unit, []).append(modbus_register_block)
+
+        for definition in definitions:
+            if not (unit_register_blocks := due_register_blocks.get(definition.unit)):
+                continue
+
+            register_image: RegisterImage = self.data[definition.unit]
+            register_image.begin()
+
+            if scan_type == "tcp" and self.hardware.config.modbus_tcp.pipeline_window > 1:
+                await self._scan_pipelined(scan_type, unit_register_blocks, definition)
+            elif scan_type == "tcp" and self.hardware.config.modbus_tcp.concurrent_scan:
+                await self._scan_concurrent(scan_type, unit_register_blocks, definition)
+            else:
+                await self._scan_register_blocks(scan_type, unit_register_blocks, definition)
+
+            register_image.commit()
+
+    def _get_definitions(self, hardware_types: List[str], port: Optional[str] = None) -> List[HardwareDefinition]:
+        return [
+            definition
+            for definition in self.hardware.get_definition_by_hardware_types(hardware_types)
+            if port is None or self.get_serial_bus(definition.unit).config.port == port
+        ]
+
+    async def scan(self, scan_type: str, hardware_types: List[str], port: Optional[str] = None) -> None:
+        """Read modbus register blocks and cache the response.
+
+        Only register blocks whose scan interval has elapsed are read. If ``concurrent_scan``
+        is enabled in the ``modbus_tcp`` config, the register blocks of all slaves on the
+        Modbus TCP link are read in parallel. With a ``pipeline_window`` greater than 1 the
+        whole read plan of a unit is sent with up to ``pipeline_window`` requests in flight.
+        Requests on the serial bus are paced by the ``SerialBusScheduler``. With the
+        ``round_robin`` polling mode only ``blocks_per_cycle`` serial register blocks are
+        read per scan, ordered by their staleness target.
+
+        All RS-485 buses are scanned in parallel unless ``port`` selects one bus.
+        """
+        definitions: List[HardwareDefinition] = self._get_definitions(
+            hardware_types, port=port if scan_type == "serial" else None
+        )
+
+        for definition in definitions:
             if not self.data.get(definition.unit):
-                self.data[definition.unit] = {}
+                self.data[definition.unit] = RegisterImage(definition.modbus_scan_plan)
 
-            if scan_type == "serial":
-                await asyncio.sleep(1)
+        if scan_type != "serial":
+            await self._scan_definitions(scan_type, definitions)
+            return
 
-            for modbus_register_block in definition.modbus_register_blocks:
-                await self._save_response(scan_type, modbus_register_block, definition)
+        serial_definitions: Dict[str, List[HardwareDefinition]] = {}
 
-    def get_register(self, address: int, index: int, unit: int) -> List[int]:
+        for definition in definitions:
+            serial_definitions.setdefault(self.get_serial_bus(definition.unit).config.port, []).append(definition)
+
+        await asyncio.gather(
+            *(
+                self._scan_definitions(scan_type, bus_definitions, self.serial_buses[bus_port])
+                for bus_port, bus_definitions in serial_definitions.items()
+            )
+        )
+
+    async def write_coil(self, address: Optional[int], value: bool) -> Optional[ModbusResponse]:
+        """Write a Unipi Neuron coil ahead of queued polling reads.
+
+        Coil writes within the ``write_coalesce_window`` are batched by the ``CoilWriteCoalescer``.
+
+        Parameters
+        ----------
+        address: int
+            The coil address.
+        value: bool
+            The coil value.
+
+        Returns
+        -------
+        ModbusResponse: optional
+            Return modbus response if no errors found else None.
+
+        """
+        if address is None:
+            return None
+
+        return await self.coil_writer.write(address, value)
+
+    @property
+    def written(self) -> asyncio.Event:
+        """Return the event that is set when cached registers were written through."""
+        if self._written is None:
+            self._written = asyncio.Event()
+
+        return self._written
+
+    def write_through(self, address: int, mask: int, value: bool, unit: int) -> None:
+        """Write the new state of a successful coil write into the cached register bits.
+
+        Parameters
+        ----------
+        address: int
+            The register address with the coil state.
+        mask: int
+            The bit mask of the coil in the register.
+        value: bool
+            The coil value.
+        unit: int
+            The unit identifier.
+
+        """
+        if register_image := self.data.get(unit):
+            register_image.set_bits(address, mask, value)
+            self.written.set()
+
+    def pop_dirty(self, hardware_types: List[str], port: Optional[str] = None) -> Dict[int, Set[int]]:
+        """Take the changed register addresses from all units with the given hardware types.
+
+        Parameters
+        ----------
+        hardware_types: list
+            A list of hardware types to filter hardware definitions.
+        port: str, optional
+            Only take the units of this RS-485 bus.
+
+        Returns
+        -------
+        dict
+            Changed register addresses by unit.
+
+        """
+        return {
+            definition.unit: self.data[definition.unit].pop_dirty()
+            for definition in self._get_definitions(hardware_types, port=port)
+            if definition.unit in self.data
+        }
+
+    def get_register(self, address: int, index: int, unit: int) -> memoryview:
         """Get the responses from the cached modbus register blocks.
 
         Parameters
@@ -119,16 +1322,15 @@ class ModbusCacheData:
 
         Returns
         -------
-        list
-            A list of cached modbus register blocks.
+        memoryview
+            A zero-copy view on the cached registers. The view is empty if a register is not cached.
 
         """
-        ret: List[int] = []
+        register_image: Optional[RegisterImage] = self.data.get(unit)
+        registers: Optional[memoryview] = register_image.read(address, index) if register_image else None
 
-        for _address in range(address, address + index):
-            if _address not in self.data[unit] or self.data[unit][_address] is None:
-                UNIPI_LOGGER.error("%s Error on address %s (unit: %s)", LogPrefix.MODBUS, address, unit)
-            else:
-                ret += [self.data[unit][_address]]
+        if registers is None:
+            self.errors.error("%s Error on address %s (unit: %s)", LogPrefix.MODBUS, address, unit)
+            return memoryview(array("H"))
 
-        return ret
+        return registers
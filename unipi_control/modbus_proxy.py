@@ -0,0 +1,415 @@
+"""Modbus TCP proxy server that answers external clients from the register cache."""
+
+import asyncio
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Final
+from typing import List
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from pymodbus.datastore import ModbusBaseSlaveContext
+from pymodbus.datastore import ModbusServerContext
+from pymodbus.pdu import ModbusExceptions
+from pymodbus.pdu import ModbusResponse
+from pymodbus.server import ModbusTcpServer
+from pymodbus.server.async_io import ModbusServerRequestHandler
+
+from unipi_control.config import HardwareType
+from unipi_control.config import LogPrefix
+from unipi_control.config import ModbusProxyConfig
+from unipi_control.config import UNIPI_LOGGER
+from unipi_control.helpers.typing import ModbusClient
+from unipi_control.helpers.typing import ModbusFeature
+from unipi_control.helpers.typing import ModbusRegisterBlock
+from unipi_control.helpers.typing import ModbusWriteData
+from unipi_control.helpers.typing import ModbusWriteMultipleData
+from unipi_control.helpers.typing import ModbusWriteMultipleRegistersData
+from unipi_control.helpers.typing import ModbusWriteRegisterData
+from unipi_control.modbus import ModbusCacheData
+from unipi_control.modbus import ModbusRequestData
+from unipi_control.modbus import ModbusScheduler
+
+READ_INPUT_REGISTERS: Final[Tuple[int, ...]] = (4,)
+WRITE_COILS: Final[Tuple[int, ...]] = (5, 15)
+WRITE_REGISTERS: Final[Tuple[int, ...]] = (6, 16)
+WRITE_SINGLE: Final[Tuple[int, ...]] = (5, 6)
+WRITE_MULTIPLE_COILS: Final[int] = 15
+WRITE_SINGLE_REGISTER: Final[int] = 6
+WRITE_MULTIPLE_REGISTERS: Final[int] = 16
+# Maximum quantities of the write requests from the Modbus specification.
+MAX_WRITE_COILS: Final[int] = 0x07B0
+MAX_WRITE_REGISTERS: Final[int] = 0x007B
+
+
+def contains(start: int, size: int, address: int, count: int) -> bool:
+    """Return ``True`` if the addresses from ``address`` to ``address + count`` are in the range."""
+    return start <= address and address + count <= start + size
+
+
+class ModbusProxySlaveContext(ModbusBaseSlaveContext):
+    """Answer register reads from the register cache and forward writes to the Unipi Neuron.
+
+    Only the input registers of the register blocks that are scanned from this slave are answered.
+    Writes to the coils of the features and to the registers of the scanned register blocks are
+    forwarded through the Modbus TCP scheduler and answered when the Unipi Neuron responded.
+    Confirmed coil writes are written through to the register cache like MQTT commands.
+
+    Attributes
+    ----------
+    modbus_cache_data: ModbusCacheData
+        The register cache of the Unipi Neuron.
+    slave: int
+        The slave ID of the external client requests.
+    register_blocks: list
+        The scanned register blocks of the slave.
+    coil_features: list
+        The features of the slave with coils.
+
+    """
+
+    def __init__(
+        self,
+        modbus_cache_data: ModbusCacheData,
+        slave: int,
+        register_blocks: List[ModbusRegisterBlock],
+        coil_features: Optional[List[ModbusFeature]] = None,
+    ) -> None:
+        self.modbus_cache_data: ModbusCacheData = modbus_cache_data
+        self.slave: int = slave
+        self.register_blocks: List[ModbusRegisterBlock] = register_blocks
+        self.coil_features: List[ModbusFeature] = coil_features or []
+
+        self._written: List[Union[int, bool]] = []
+
+    def reset(self) -> None:
+        """Reset is not supported, the registers are owned by the Unipi Neuron."""
+
+    def validate(self, fc_as_hex: int, address: int, count: int = 1) -> bool:
+        """Validate the request.
+
+        Parameters
+        ----------
+        fc_as_hex: int
+            The modbus function code.
+        address: int
+            The starting address.
+        count: int
+            The number of values.
+
+        Returns
+        -------
+        bool
+            ``True`` if the registers are cached, the coils belong to one feature or the registers
+            to one scanned register block, otherwise ``False``.
+
+        """
+        if fc_as_hex in WRITE_COILS:
+            return any(
+                (val_coil := feature.get("val_coil")) is not None
+                and contains(val_coil, feature["count"], address, count)
+                for feature in self.coil_features
+            )
+
+        in_register_blocks: bool = any(
+            contains(register_block["start_reg"], register_block["count"], address, count)
+            for register_block in self.register_blocks
+        )
+
+        if fc_as_hex in READ_INPUT_REGISTERS:
+            register_image = self.modbus_cache_data.data.get(0)
+
+            return in_register_blocks and bool(register_image and register_image.read(address, count) is not None)
+
+        return fc_as_hex in WRITE_REGISTERS and in_register_blocks
+
+    def getValues(self, fc_as_hex: int, address: int, count: int = 1) -> List[Union[int, bool]]:  # noqa: N802
+        """Get the cached registers or the written values of a write request.
+
+        Parameters
+        ----------
+        fc_as_hex: int
+            The modbus function code.
+        address: int
+            The starting address.
+        count: int
+            The number of values.
+
+        Returns
+        -------
+        list
+            The register values.
+
+        """
+        if fc_as_hex in READ_INPUT_REGISTERS:
+            return self.modbus_cache_data.get_register(address=address, index=count, unit=0).tolist()
+
+        return self._written[:count]
+
+    def setValues(  # noqa: N802
+        self, fc_as_hex: int, address: int, values: List[Union[int, bool]]  # noqa: ARG002
+    ) -> None:
+        """Save the values of a write request for the response.
+
+        The values are written to the Unipi Neuron by ``forward`` before the request is executed.
+
+        Parameters
+        ----------
+        fc_as_hex: int
+            The modbus function code.
+        address: int
+            The starting address.
+        values: list
+            The coil or register values.
+
+        """
+        self._written = list(values)
+
+    async def forward(self, fc_as_hex: int, address: int, values: List[Union[int, bool]]) -> bool:
+        """Forward a write request through the Modbus TCP scheduler.
+
+        Parameters
+        ----------
+        fc_as_hex: int
+            The modbus function code.
+        address: int
+            The starting address.
+        values: list
+            The coil or register values.
+
+        Returns
+        -------
+        bool
+            ``True`` if the Unipi Neuron confirmed the write, otherwise ``False``.
+
+        """
+        client: ModbusClient = self.modbus_cache_data.modbus_client
+        callback: Callable[..., Any]
+        data: ModbusRequestData
+
+        if fc_as_hex in WRITE_COILS and len(values) == 1:
+            callback = client.tcp.write_coil
+            data = ModbusWriteData(address=address, value=bool(values[0]), slave=self.slave)
+        elif fc_as_hex in WRITE_COILS:
+            callback = client.tcp.write_coils
+            data = ModbusWriteMultipleData(address=address, values=[bool(value) for value in values], slave=self.slave)
+        elif len(values) == 1:
+            callback = client.tcp.write_register
+            data = ModbusWriteRegisterData(address=address, value=int(values[0]), slave=self.slave)
+        else:
+            callback = client.tcp.write_registers
+            data = ModbusWriteMultipleRegistersData(
+                address=address, values=[int(value) for value in values], slave=self.slave
+            )
+
+        response: Optional[ModbusResponse] = await self.modbus_cache_data.tcp_scheduler.call(
+            callback, data, priority=ModbusScheduler.WRITE
+        )
+
+        if response is not None and fc_as_hex in WRITE_COILS:
+            self._write_through(address, values)
+
+        return response is not None
+
+    def _write_through(self, address: int, values: List[Union[int, bool]]) -> None:
+        for feature in self.coil_features:
+            if (val_coil := feature.get("val_coil")) is None:
+                continue
+
+            for coil, value in enumerate(values, start=address):
+                if 0 <= (index := coil - val_coil) < feature["count"]:
+                    self.modbus_cache_data.write_through(
+                        address=feature["val_reg"], mask=0x1 << (index % 16), value=bool(value), unit=0
+                    )
+
+
+class ModbusProxyRequestHandler(ModbusServerRequestHandler):
+    """Answer write requests after the Unipi Neuron confirmed the write.
+
+    The pymodbus request handler executes requests synchronously. Write requests are validated
+    completely and executed in a task instead, so the response is sent after the forwarded write and
+    a failed write is answered with an exception response. Function codes other than reading input
+    registers and writing coils or registers are answered with an illegal function.
+    """
+
+    server: "ModbusProxyTcpServer"
+
+    def execute(self, request: Any, *addr: Any) -> None:  # noqa: ANN401
+        """Execute a request and send the response.
+
+        Parameters
+        ----------
+        request: ModbusRequest
+            The decoded request, e.g. ``WriteSingleCoilRequest``.
+        addr: tuple
+            The client address.
+
+        """
+        if request.function_code in READ_INPUT_REGISTERS:
+            super().execute(request, *addr)  # type: ignore[no-untyped-call]
+            return
+
+        if request.function_code not in WRITE_COILS + WRITE_REGISTERS:
+            self._send(request, request.doException(ModbusExceptions.IllegalFunction), *addr)
+            return
+
+        task: asyncio.Task = asyncio.create_task(self._execute_write(request, *addr))
+        self.server.context.tasks.add(task)
+        task.add_done_callback(self.server.context.tasks.discard)
+
+    @staticmethod
+    def _check_write(
+        request: Any, context: ModbusProxySlaveContext, values: List[Union[int, bool]]  # noqa: ANN401
+    ) -> Optional[int]:
+        # The same checks as the pymodbus requests, but before the write is forwarded.
+        count: int = len(values)
+
+        if request.function_code == WRITE_MULTIPLE_COILS and (
+            not 1 <= count <= MAX_WRITE_COILS or request.byte_count != (count + 7) // 8
+        ):
+            return ModbusExceptions.IllegalValue
+
+        if request.function_code == WRITE_MULTIPLE_REGISTERS and (
+            not 1 <= count <= MAX_WRITE_REGISTERS or request.byte_count != 2 * count
+        ):
+            return ModbusExceptions.IllegalValue
+
+        if request.function_code == WRITE_SINGLE_REGISTER and not 0 <= request.value <= 0xFFFF:
+            return ModbusExceptions.IllegalValue
+
+        if not context.validate(request.function_code, request.address, count):
+            return ModbusExceptions.IllegalAddress
+
+        return None
+
+    async def _execute_write(self, request: Any, *addr: Any) -> None:  # noqa: ANN401
+        context: ModbusProxySlaveContext = self.server.context[request.slave_id]
+        values: List[Union[int, bool]] = (
+            [request.value] if request.function_code in WRITE_SINGLE else list(request.values)
+        )
+        response: ModbusResponse
+
+        try:
+            if (exception_code := self._check_write(request, context, values)) is not None:
+                response = request.doException(exception_code)
+            elif not await context.forward(request.function_code, request.address, values):
+                UNIPI_LOGGER.error(
+                    "%s Proxy write to address %s (slave: %s) failed.", LogPrefix.MODBUS, request.address, context.slave
+                )
+                response = request.doException(ModbusExceptions.SlaveFailure)
+            else:
+                response = request.execute(context)
+        except Exception as error:  # noqa: BLE001
+            UNIPI_LOGGER.error("%s Proxy write to address %s failed: %s", LogPrefix.MODBUS, request.address, error)
+            response = request.doException(ModbusExceptions.SlaveFailure)
+
+        self._send(request, response, *addr)
+
+    def _send(self, request: Any, response: ModbusResponse, *addr: Any) -> None:  # noqa: ANN401
+        response.transaction_id = request.transaction_id
+        response.slave_id = request.slave_id
+
+        if self.running:
+            self.send(response, *addr)  # type: ignore[no-untyped-call]
+
+
+class ModbusProxyServerContext(ModbusServerContext):
+    """Create a slave context for every slave ID that is scanned on the Unipi Neuron.
+
+    Other slave IDs get a context without registers, so their requests are answered with an illegal address.
+    """
+
+    def __init__(self, modbus_cache_data: ModbusCacheData) -> None:
+        super().__init__(single=False)  # type: ignore[no-untyped-call]
+        self.modbus_cache_data: ModbusCacheData = modbus_cache_data
+        self.tasks: Set[asyncio.Task] = set()
+
+        register_blocks: Dict[int, List[ModbusRegisterBlock]] = {}
+        coil_features: Dict[int, List[ModbusFeature]] = {}
+
+        for definition in modbus_cache_data.hardware.get_definition_by_hardware_types([HardwareType.NEURON]):
+            for register_block in definition.modbus_scan_plan:
+                register_blocks.setdefault(register_block["slave"] or 0, []).append(register_block)
+
+            # A feature belongs to the slave of the register block with its state.
+            for feature in definition.modbus_features:
+                for register_block in definition.modbus_scan_plan:
+                    if feature.get("val_coil") is not None and contains(
+                        register_block["start_reg"], register_block["count"], feature["val_reg"], 1
+                    ):
+                        coil_features.setdefault(register_block["slave"] or 0, []).append(feature)
+                        break
+
+        self._slaves: Dict[int, ModbusProxySlaveContext] = {
+            slave: ModbusProxySlaveContext(modbus_cache_data, slave, slave_register_blocks, coil_features.get(slave))
+            for slave, slave_register_blocks in register_blocks.items()
+        }
+
+    def __getitem__(self, slave: int) -> ModbusProxySlaveContext:
+        return self._slaves.get(slave) or ModbusProxySlaveContext(self.modbus_cache_data, slave, [])
+
+
+class ModbusProxyTcpServer(ModbusTcpServer):
+    """Modbus TCP server with the proxy request handler."""
+
+    context: ModbusProxyServerContext
+
+    def callback_new_connection(self) -> ModbusProxyRequestHandler:
+        """Handle an incoming connection."""
+        return ModbusProxyRequestHandler(self)  # type: ignore[no-untyped-call]
+
+
+class ModbusProxyServer:
+    """Modbus TCP server that answers external clients from the register cache.
+
+    External clients, e.g. Node-RED, read the registers of the Unipi Neuron without
+    additional requests to the hardware. Writes are sent through the same scheduled
+    client as the writes from MQTT commands.
+
+    Attributes
+    ----------
+    config: ModbusProxyConfig
+        The proxy server configuration.
+    context: ModbusProxyServerContext
+        The server context with the register cache.
+
+    """
+
+    def __init__(self, config: ModbusProxyConfig, modbus_cache_data: ModbusCacheData) -> None:
+        self.config: ModbusProxyConfig = config
+        self.context: ModbusProxyServerContext = ModbusProxyServerContext(modbus_cache_data)
+        self.server: Optional[ModbusProxyTcpServer] = None
+
+    async def start(self) -> bool:
+        """Start listening for external Modbus TCP clients.
+
+        Returns
+        -------
+        bool
+            ``True`` if the server is listening, otherwise ``False``.
+
+        """
+        self.server = ModbusProxyTcpServer(  # type: ignore[no-untyped-call]
+            context=self.context, address=(self.config.host, self.config.port)
+        )
+
+        if await self.server.transport_listen():
+            UNIPI_LOGGER.info(
+                "%s Proxy server listening on %s:%s", LogPrefix.MODBUS, self.config.host, self.config.port
+            )
+            return True
+
+        UNIPI_LOGGER.error(
+            "%s Proxy server can't listen on %s:%s", LogPrefix.MODBUS, self.config.host, self.config.port
+        )
+        return False
+
+    async def stop(self) -> None:
+        """Stop the server and wait for the forwarded writes."""
+        if self.server:
+            await self.server.shutdown()  # type: ignore[no-untyped-call]
+
+        await asyncio.gather(*self.context.tasks, return_exceptions=True)
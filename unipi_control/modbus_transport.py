@@ -0,0 +1,455 @@
+"""Lean asyncio Modbus TCP and RTU transport for the register scan.
+
+The lean clients send the requests of the scan plan as prebuilt frames and decode the
+responses straight into the register image. They support all requests that Unipi Control
+sends and can replace the pymodbus clients.
+"""
+
+import asyncio
+import contextlib
+import itertools
+import struct
+import sys
+from abc import ABC
+from abc import abstractmethod
+from array import array
+from typing import Dict
+from typing import Final
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import TYPE_CHECKING
+from typing import Tuple
+
+from pymodbus.exceptions import ModbusException
+from pymodbus.transport import CommParams
+from pymodbus.transport.serialtransport import create_serial_connection
+
+if TYPE_CHECKING:
+    from unipi_control.helpers.typing import ModbusReadData
+    from unipi_control.modbus import RegisterImage
+
+READ_HOLDING_REGISTERS: Final[int] = 3
+READ_INPUT_REGISTERS: Final[int] = 4
+WRITE_SINGLE_COIL: Final[int] = 5
+WRITE_SINGLE_REGISTER: Final[int] = 6
+WRITE_MULTIPLE_COILS: Final[int] = 15
+WRITE_MULTIPLE_REGISTERS: Final[int] = 16
+
+MBAP_HEADER: Final[struct.Struct] = struct.Struct(">HHHB")
+READ_PDU: Final[struct.Struct] = struct.Struct(">BHH")
+WRITE_SINGLE_PDU: Final[struct.Struct] = struct.Struct(">BHH")
+WRITE_MULTIPLE_PDU: Final[struct.Struct] = struct.Struct(">BHHB")
+
+
+class LeanModbusError(ModbusException):
+    """Connection or framing error of a lean Modbus client."""
+
+    def __init__(self, message: str) -> None:
+        super().__init__(message)  # type: ignore[no-untyped-call]
+
+
+def _crc16_table() -> Tuple[int, ...]:
+    table: List[int] = []
+
+    for byte in range(256):
+        crc: int = byte
+
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+
+        table.append(crc)
+
+    return tuple(table)
+
+
+CRC16_TABLE: Final[Tuple[int, ...]] = _crc16_table()
+
+
+def crc16(frame: bytes) -> int:
+    """Calculate the Modbus RTU CRC with a lookup table.
+
+    Parameters
+    ----------
+    frame: bytes
+        The frame without CRC. The CRC of a frame with a valid CRC is ``0``.
+
+    Returns
+    -------
+    int
+        The CRC. It is sent low byte first.
+
+    """
+    crc: int = 0xFFFF
+
+    for byte in frame:
+        crc = (crc >> 8) ^ CRC16_TABLE[(crc ^ byte) & 0xFF]
+
+    return crc
+
+
+def decode_registers(data: bytes) -> array:
+    """Decode big-endian registers without creating an integer object per register."""
+    registers: array = array("H", data)
+
+    if sys.byteorder == "little":
+        registers.byteswap()
+
+    return registers
+
+
+class ModbusReadRequest:
+    """Prebuilt frames of a read request that is sent in every scan.
+
+    Attributes
+    ----------
+    data: ModbusReadData
+        The address, count and slave of the request. Used for log messages.
+    pdu: bytes
+        The protocol data unit for Modbus TCP.
+    rtu_frame: bytes
+        The complete Modbus RTU frame with CRC.
+
+    """
+
+    __slots__ = ("data", "pdu", "rtu_frame")
+
+    def __init__(self, slave: int, address: int, count: int, function_code: int = READ_INPUT_REGISTERS) -> None:
+        self.data: ModbusReadData = {"address": address, "count": count, "slave": slave}
+        self.pdu: bytes = READ_PDU.pack(function_code, address, count)
+        self.rtu_frame: bytes = LeanModbusRtuClient.frame(slave, self.pdu)
+
+
+class LeanModbusResponse:
+    """Response with the subset of the pymodbus response interface used by Unipi Control.
+
+    Attributes
+    ----------
+    function_code: int
+        The function code of the response. The exception bit is set for exception responses.
+    registers: list
+        The registers of a read response.
+
+    """
+
+    __slots__ = ("function_code", "registers")
+
+    def __init__(self, pdu: bytes) -> None:
+        self.function_code: int = pdu[0]
+        self.registers: List[int] = []
+
+        if self.function_code in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS):
+            if len(pdu) < 2 or pdu[1] % 2 or len(pdu) != 2 + pdu[1]:
+                msg = f"Invalid response: {pdu.hex()}"
+                raise LeanModbusError(msg)
+
+            self.registers = decode_registers(pdu[2:]).tolist()
+
+    def isError(self) -> bool:  # noqa: N802
+        """Return ``True`` for exception responses like the pymodbus response."""
+        return bool(self.function_code & 0x80)
+
+
+class LeanModbusClient(asyncio.Protocol, ABC):
+    """Base class of the lean Modbus clients.
+
+    Attributes
+    ----------
+    comm_params: CommParams
+        The connection parameters like the pymodbus clients. ``timeout_connect`` is the response timeout.
+    retries: int
+        Number of retries after a timeout.
+
+    """
+
+    def __init__(self, comm_params: CommParams, retries: int) -> None:
+        self.comm_params: CommParams = comm_params
+        self.retries: int = retries
+        self.transport: Optional[asyncio.Transport] = None
+
+        self._buffer: bytearray = bytearray()
+
+    @property
+    def connected(self) -> bool:
+        """Return ``True`` if the client is connected."""
+        return self.transport is not None and not self.transport.is_closing()
+
+    @abstractmethod
+    async def connect(self) -> bool:
+        """Connect to the Modbus server."""
+
+    def close(self) -> None:
+        """Close the connection."""
+        if self.transport:
+            self.transport.close()
+
+        self.transport = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:  # noqa: D102
+        self.transport = transport  # type: ignore[assignment]
+        self._buffer.clear()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:  # noqa: D102, ARG002
+        self.transport = None
+
+    def data_received(self, data: bytes) -> None:  # noqa: D102
+        self._buffer += data
+        self._process_buffer()
+
+    @abstractmethod
+    def _process_buffer(self) -> None:
+        """Resolve the pending requests with the complete responses in the buffer."""
+
+    @abstractmethod
+    def _send(self, slave: int, pdu: bytes, rtu_frame: Optional[bytes]) -> asyncio.Future:
+        """Send a request and return the future of its response PDU."""
+
+    async def _attempt(self, slave: int, pdu: bytes, rtu_frame: Optional[bytes]) -> bytes:
+        if not self.connected and not await self.connect():
+            msg = f"Can't connect to {self.comm_params.host}:{self.comm_params.port}"
+            raise LeanModbusError(msg)
+
+        return await asyncio.wait_for(self._send(slave, pdu, rtu_frame), timeout=self.comm_params.timeout_connect)
+
+    async def _request(self, slave: int, pdu: bytes, rtu_frame: Optional[bytes] = None) -> bytes:
+        for _ in range(self.retries):
+            with contextlib.suppress(asyncio.TimeoutError):
+                return await self._attempt(slave, pdu, rtu_frame)
+
+        return await self._attempt(slave, pdu, rtu_frame)
+
+    async def read_into(self, request: ModbusReadRequest, register_image: "RegisterImage") -> bool:
+        """Read registers and write the response straight into the register image.
+
+        Parameters
+        ----------
+        request: ModbusReadRequest
+            The prebuilt read request.
+        register_image: RegisterImage
+            The register image of the unit.
+
+        Returns
+        -------
+        bool
+            ``False`` if the server answered with an exception response.
+
+        Raises
+        ------
+        LeanModbusError
+            If the response doesn't match the request.
+
+        """
+        pdu: bytes = await self._request(request.data["slave"] or 0, request.pdu, request.rtu_frame)
+
+        if pdu[0] & 0x80:
+            return False
+
+        byte_count: int = 2 * request.data["count"]
+
+        if pdu[0] != request.pdu[0] or len(pdu) < 2 or pdu[1] != byte_count or len(pdu) != 2 + byte_count:
+            msg = f"Invalid response to {request.data}: {pdu.hex()}"
+            raise LeanModbusError(msg)
+
+        register_image.write(request.data["address"], decode_registers(pdu[2:]))
+        return True
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 0) -> LeanModbusResponse:
+        """Read input registers."""
+        return LeanModbusResponse(await self._request(slave, READ_PDU.pack(READ_INPUT_REGISTERS, address, count)))
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 0) -> LeanModbusResponse:
+        """Read holding registers."""
+        return LeanModbusResponse(await self._request(slave, READ_PDU.pack(READ_HOLDING_REGISTERS, address, count)))
+
+    async def write_coil(self, address: int, value: bool, slave: int = 0) -> LeanModbusResponse:
+        """Write a coil."""
+        pdu: bytes = WRITE_SINGLE_PDU.pack(WRITE_SINGLE_COIL, address, 0xFF00 if value else 0)
+        return LeanModbusResponse(await self._request(slave, pdu))
+
+    async def write_coils(self, address: int, values: List[bool], slave: int = 0) -> LeanModbusResponse:
+        """Write contiguous coils."""
+        bits: bytearray = bytearray((len(values) + 7) // 8)
+
+        for index, value in enumerate(values):
+            if value:
+                bits[index // 8] |= 1 << (index % 8)
+
+        pdu: bytes = WRITE_MULTIPLE_PDU.pack(WRITE_MULTIPLE_COILS, address, len(values), len(bits)) + bits
+        return LeanModbusResponse(await self._request(slave, pdu))
+
+    async def write_register(self, address: int, value: int, slave: int = 0) -> LeanModbusResponse:
+        """Write a holding register."""
+        return LeanModbusResponse(
+            await self._request(slave, WRITE_SINGLE_PDU.pack(WRITE_SINGLE_REGISTER, address, value))
+        )
+
+    async def write_registers(self, address: int, values: List[int], slave: int = 0) -> LeanModbusResponse:
+        """Write contiguous holding registers."""
+        pdu: bytes = WRITE_MULTIPLE_PDU.pack(WRITE_MULTIPLE_REGISTERS, address, len(values), 2 * len(values))
+        return LeanModbusResponse(await self._request(slave, pdu + struct.pack(f">{len(values)}H", *values)))
+
+
+class LeanModbusTcpClient(LeanModbusClient):
+    """Lean Modbus TCP client with MBAP framing.
+
+    Responses are matched to the requests by the transaction ID.
+    """
+
+    def __init__(self, host: str, port: int = 502, timeout: float = 3, retries: int = 3) -> None:
+        super().__init__(CommParams(host=host, port=port, timeout_connect=timeout), retries)
+
+        # The unit ID and the response future by transaction ID.
+        self._pending: Dict[int, Tuple[int, asyncio.Future]] = {}
+        self._transaction_ids: Iterator[int] = itertools.cycle(range(1, 0x10000))
+
+    async def connect(self) -> bool:
+        """Connect to the Modbus TCP server.
+
+        Returns
+        -------
+        bool
+            ``True`` if the client is connected.
+
+        """
+        try:
+            await asyncio.wait_for(
+                asyncio.get_running_loop().create_connection(
+                    lambda: self, self.comm_params.host, self.comm_params.port
+                ),
+                timeout=self.comm_params.timeout_connect,
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+
+        return self.connected
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:  # noqa: D102
+        super().connection_lost(exc)
+
+        for _, future in self._pending.values():
+            if not future.done():
+                future.set_exception(LeanModbusError("Connection lost"))
+
+        self._pending.clear()
+
+    def _send(self, slave: int, pdu: bytes, rtu_frame: Optional[bytes]) -> asyncio.Future:  # noqa: ARG002
+        transaction_id: int = next(self._transaction_ids)
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda _: self._pending.pop(transaction_id, None))
+
+        self._pending[transaction_id] = (slave, future)
+
+        if self.transport:
+            self.transport.write(MBAP_HEADER.pack(transaction_id, 0, len(pdu) + 1, slave) + pdu)
+
+        return future
+
+    def _process_buffer(self) -> None:
+        while len(self._buffer) >= MBAP_HEADER.size:
+            transaction_id, _, length, unit_id = MBAP_HEADER.unpack_from(self._buffer)
+            end: int = max(6 + length, MBAP_HEADER.size)
+
+            if len(self._buffer) < end:
+                break
+
+            frame: bytes = bytes(self._buffer[:end])
+            del self._buffer[:end]
+
+            if not (pending := self._pending.get(transaction_id)) or pending[1].done():
+                continue
+
+            slave, future = pending
+
+            # The PDU has at least the function code and one byte of data or the exception code.
+            if len(frame) < MBAP_HEADER.size + 2:
+                future.set_exception(LeanModbusError(f"Invalid response: {frame.hex()}"))
+            elif unit_id != slave:
+                future.set_exception(LeanModbusError(f"Unexpected unit ID in response: {frame.hex()}"))
+            else:
+                future.set_result(frame[MBAP_HEADER.size :])
+
+
+class LeanModbusRtuClient(LeanModbusClient):
+    """Lean Modbus RTU client for the RS-485 bus.
+
+    Only one request is sent at a time. The ``ModbusScheduler`` serializes the requests on the bus.
+    """
+
+    def __init__(
+        self, port: str, baudrate: int = 19200, parity: str = "N", timeout: float = 1, retries: int = 3
+    ) -> None:
+        super().__init__(CommParams(host=port, baudrate=baudrate, parity=parity, timeout_connect=timeout), retries)
+
+        self._future: Optional[asyncio.Future] = None
+        self._request_header: bytes = b""
+
+    @staticmethod
+    def frame(slave: int, pdu: bytes) -> bytes:
+        """Build a Modbus RTU frame with CRC."""
+        frame: bytes = bytes((slave,)) + pdu
+        return frame + crc16(frame).to_bytes(2, "little")
+
+    async def connect(self) -> bool:
+        """Open the serial port.
+
+        Returns
+        -------
+        bool
+            ``True`` if the serial port is open.
+
+        """
+        try:
+            transport, _ = await create_serial_connection(
+                asyncio.get_running_loop(),
+                lambda: self,
+                self.comm_params.host,
+                baudrate=self.comm_params.baudrate,
+                parity=self.comm_params.parity,
+                bytesize=8,
+                stopbits=1,
+            )
+        except OSError:
+            return False
+
+        self.transport = transport
+        return self.connected
+
+    def _send(self, slave: int, pdu: bytes, rtu_frame: Optional[bytes]) -> asyncio.Future:
+        self._future = asyncio.get_running_loop().create_future()
+        self._request_header = bytes((slave, pdu[0]))
+        self._buffer.clear()
+
+        if self.transport:
+            self.transport.write(rtu_frame or self.frame(slave, pdu))
+
+        return self._future
+
+    @staticmethod
+    def _frame_length(buffer: bytearray) -> int:
+        function_code: int = buffer[1]
+
+        if function_code & 0x80:
+            return 5
+
+        if function_code in (READ_HOLDING_REGISTERS, READ_INPUT_REGISTERS):
+            return 5 + buffer[2]
+
+        return 8
+
+    def _process_buffer(self) -> None:
+        if not self._future or self._future.done():
+            self._buffer.clear()
+            return
+
+        if len(self._buffer) < 3 or len(self._buffer) < (length := self._frame_length(self._buffer)):
+            return
+
+        frame: bytes = bytes(self._buffer[:length])
+        self._buffer.clear()
+
+        if crc16(frame):
+            self._future.set_exception(LeanModbusError(f"CRC error in response: {frame.hex()}"))
+        elif bytes((frame[0], frame[1] & 0x7F)) != self._request_header:
+            self._future.set_exception(LeanModbusError(f"Unexpected slave or function code in response: {frame.hex()}"))
+        else:
+            self._future.set_result(frame[1:-2])
@@ -0,0 +1,92 @@
+"""Encode aggregated state messages as text or packed binary payloads."""
+
+import itertools
+import json
+import math
+import struct
+from typing import Dict
+from typing import Final
+from typing import Optional
+from typing import Sequence
+from typing import Type
+from typing import Union
+
+from unipi_control.features.extensions import EastronMeter
+from unipi_control.features.neuron import NeuronFeature
+
+StateFeature = Union[NeuronFeature, EastronMeter]
+
+
+class TextCodec:
+    """Encode the states as a compact JSON object by feature id.
+
+    Attributes
+    ----------
+    features: list
+        The features of the message.
+    schema: str, optional
+        The text payload describes itself, so there is no schema.
+
+    """
+
+    schema: Optional[str] = None
+
+    def __init__(self, features: Sequence[StateFeature]) -> None:
+        self.features: Sequence[StateFeature] = features
+
+    def encode(self) -> str:
+        """Return the current states as JSON."""
+        return json.dumps({feature.feature_id: feature.payload for feature in self.features}, separators=(",", ":"))
+
+
+class StructCodec:
+    """Pack the states into a fixed binary layout.
+
+    The layout is a little-endian :mod:`struct` format with one field per feature. DI, DO and RO states are packed
+    as ``?`` (1 is ON) and meter values as ``f`` (float32, NaN if the value is unknown). The schema is a JSON object
+    with the ``format`` and the feature ids in field order, so a consumer unpacks the payload with
+    ``struct.unpack(schema["format"], payload)``.
+
+    Attributes
+    ----------
+    features: list
+        The features of the message.
+    format: str
+        The struct format of the payload.
+    schema: str
+        The JSON schema that describes the payload.
+
+    """
+
+    def __init__(self, features: Sequence[StateFeature]) -> None:
+        self.features: Sequence[StateFeature] = features
+        self.format: str = "<" + "".join(
+            f"{len(list(group))}{field_type}"
+            for field_type, group in itertools.groupby(self._field_type(feature) for feature in features)
+        )
+        self.schema: str = json.dumps(
+            {"format": self.format, "fields": [feature.feature_id for feature in features]}, separators=(",", ":")
+        )
+        self._struct: struct.Struct = struct.Struct(self.format)
+
+    @staticmethod
+    def _field_type(feature: StateFeature) -> str:
+        return "f" if isinstance(feature, EastronMeter) else "?"
+
+    @staticmethod
+    def _field_value(feature: StateFeature) -> Union[bool, float]:
+        if isinstance(feature, EastronMeter):
+            value: Optional[float] = feature.value
+            return math.nan if value is None else value
+
+        return feature.value == 1
+
+    def encode(self) -> bytes:
+        """Return the current states as packed binary."""
+        return self._struct.pack(*(self._field_value(feature) for feature in self.features))
+
+
+PAYLOAD_CODECS: Final[Dict[str, Type[Union[TextCodec, StructCodec]]]] = {
+    "text": TextCodec,
+    "struct": StructCodec,
+}
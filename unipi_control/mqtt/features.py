@@ -1,62 +1,257 @@
 """Initialize MQTT subscribe and publish for features."""
 
 import asyncio
+import contextlib
+import functools
+import itertools
+import json
+import re
+import time
 from asyncio import Task
 from contextlib import AsyncExitStack
 from typing import Any
 from typing import AsyncIterable
 from typing import ClassVar
+from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Set
 from typing import Union
 
 from aiomqtt import Client
 
 from unipi_control.config import HardwareType
+from unipi_control.config import LogPrefix
 from unipi_control.config import UNIPI_LOGGER
 from unipi_control.features.extensions import EastronMeter
 from unipi_control.features.neuron import DigitalInput
 from unipi_control.features.neuron import DigitalOutput
 from unipi_control.features.neuron import Led
+from unipi_control.features.neuron import NeuronFeature
 from unipi_control.features.neuron import Relay
+from unipi_control.features.utils import FeatureState
+from unipi_control.helpers.exception import ConfigError
 from unipi_control.helpers.log import LOG_LEVEL
 from unipi_control.helpers.log import LOG_MQTT_PUBLISH
 from unipi_control.helpers.log import LOG_MQTT_SUBSCRIBE
 from unipi_control.helpers.log import LOG_MQTT_SUBSCRIBE_TOPIC
+from unipi_control.helpers.text import slugify
+from unipi_control.mqtt.codec import PAYLOAD_CODECS
+from unipi_control.mqtt.codec import StateFeature
+from unipi_control.mqtt.codec import StructCodec
+from unipi_control.mqtt.codec import TextCodec
+from unipi_control.mqtt.publisher import MqttPublisher
 from unipi_control.neuron import Neuron
 
 
+class FeatureCommandQueue:
+    """Write the requested states of outputs, the latest command of a feature wins.
+
+    Commands that request the cached state are dropped and queued commands of a feature are collapsed while a
+    write is in progress or the feature waits for its ``min_write_interval``.
+
+    Attributes
+    ----------
+    skipped: int
+        Number of commands that were dropped because they requested the cached state.
+
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Union[DigitalOutput, Relay], bool] = {}
+        self._tasks: Dict[Union[DigitalOutput, Relay], Task] = {}
+        self._last_write: Dict[Union[DigitalOutput, Relay], float] = {}
+        self.skipped: int = 0
+
+    def put(self, feature: Union[DigitalOutput, Relay], value: bool) -> None:
+        """Queue a state for a feature and replace any queued state of the same feature.
+
+        Parameters
+        ----------
+        feature: DigitalOutput, Relay
+            The output feature.
+        value: bool
+            The requested state.
+
+        """
+        self._pending[feature] = value
+
+        if (task := self._tasks.get(feature)) is None or task.done():
+            task = self._tasks[feature] = asyncio.create_task(self._write(feature))
+            task.add_done_callback(functools.partial(self._write_done, feature))
+
+    async def join(self) -> None:
+        """Wait until all queued states are written."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    def _write_done(self, feature: Union[DigitalOutput, Relay], task: Task) -> None:
+        if self._tasks.get(feature) is task:
+            del self._tasks[feature]
+
+        if not task.cancelled() and (error := task.exception()):
+            UNIPI_LOGGER.error("%s Can't write %s: %s", LogPrefix.MQTT, feature.feature_id, error)
+
+    async def _write(self, feature: Union[DigitalOutput, Relay]) -> None:
+        loop = asyncio.get_running_loop()
+        min_write_interval: float = feature.features_config.min_write_interval if feature.features_config else 0
+
+        while feature in self._pending:
+            value: bool = self._pending.pop(feature)
+
+            if feature.value == value:
+                self.skipped += 1
+                UNIPI_LOGGER.debug("%s %s is already %s.", LogPrefix.MQTT, feature.feature_id, feature.payload)
+                continue
+
+            if (wait := self._last_write.get(feature, -min_write_interval) + min_write_interval - loop.time()) > 0:
+                await asyncio.sleep(wait)
+
+                if feature in self._pending:
+                    # A newer command arrived while waiting.
+                    continue
+
+            self._last_write[feature] = loop.time()
+            await feature.set_state(value)
+
+
 class BaseFeaturesMqttPlugin:
     PUBLISH_RUNNING: bool = True
     subscribe_feature_types: ClassVar[List[str]] = []
     publish_feature_types: ClassVar[List[str]] = []
+    wake_on_write: ClassVar[bool] = False
+    aggregate_boards: ClassVar[bool] = False
+    aggregate_topic: ClassVar[str] = "board"
+    statistics_interval: ClassVar[float] = 60
 
     def __init__(self, neuron: Neuron, mqtt_client: Client) -> None:
         self.neuron: Neuron = neuron
         self.mqtt_client: Client = mqtt_client
+        self.publisher: MqttPublisher = MqttPublisher(mqtt_client, neuron.config.mqtt.max_inflight_messages)
+
+        publish_mode: str = neuron.config.mqtt.publish_mode
+        self.publish_features: bool = not self.aggregate_boards or publish_mode in {"features", "all"}
+        self.publish_boards: bool = publish_mode in {"boards", "all"}
+        self.snapshot_interval: float = neuron.config.mqtt.snapshot_interval if self.aggregate_boards else 0
+        self.payload_codec: str = neuron.config.mqtt.payload_codec
+        self._codecs: Dict[str, Union[TextCodec, StructCodec]] = {}
+        self._logged_statistics: Dict[str, int] = {}
+
+    @staticmethod
+    def _get_board(feature: Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]) -> int:
+        if isinstance(feature, EastronMeter):
+            return feature.hardware.definition.unit
+
+        return feature.hardware.major_group
+
+    def _get_boards(self, feature_types: List[str]) -> Dict[int, List[StateFeature]]:
+        boards: Dict[int, List[StateFeature]] = {}
+
+        for feature in self.neuron.features.by_feature_types(feature_types):
+            if isinstance(feature, (NeuronFeature, EastronMeter)):
+                boards.setdefault(self._get_board(feature), []).append(feature)
+
+        return boards
+
+    def _log_enabled(self, feature: StateFeature) -> bool:
+        if isinstance(feature, EastronMeter):
+            return LOG_LEVEL[self.neuron.config.logging.mqtt.meters_level] <= LOG_LEVEL["info"]
+
+        return LOG_LEVEL[self.neuron.config.logging.mqtt.features_level] <= LOG_LEVEL["info"]
+
+    def _publish_feature(self, feature: Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter]) -> None:
+        topic: str = f"{feature.topic}/get"
+        # The scan never waits for the broker, only the newest state of a topic is queued.
+        self.publisher.publish(topic=topic, payload=feature.payload, qos=1, retain=True)
+
+        if self._log_enabled(feature):
+            UNIPI_LOGGER.log(
+                level=LOG_LEVEL["info"],
+                msg=LOG_MQTT_PUBLISH % (topic, feature.payload),
+            )
+
+    def _publish_state(self, topic: str, features: List[StateFeature]) -> None:
+        if (codec := self._codecs.get(topic)) is None:
+            codec = self._codecs[topic] = PAYLOAD_CODECS[self.payload_codec](features)
+
+            if codec.schema:
+                # The layout of a topic is fixed, so the schema is only published once per connection.
+                schema_topic: str = f"{topic.rsplit('/', 1)[0]}/schema"
+                self.publisher.publish(topic=schema_topic, payload=codec.schema, qos=1, retain=True)
+                UNIPI_LOGGER.debug(LOG_MQTT_PUBLISH, schema_topic, codec.schema)
+
+        payload: Union[str, bytes] = codec.encode()
+        self.publisher.publish(topic=topic, payload=payload, qos=1, retain=True)
+
+        if self._log_enabled(features[0]):
+            UNIPI_LOGGER.log(
+                level=LOG_LEVEL["info"],
+                msg=LOG_MQTT_PUBLISH % (topic, payload.hex() if isinstance(payload, bytes) else payload),
+            )
+
+    def _statistics(self) -> Dict[str, int]:
+        return self.publisher.statistics
+
+    def _log_statistics(self) -> None:
+        statistics: Dict[str, int] = self._statistics()
+
+        # Only log changed counters, so an idle system doesn't fill the log.
+        if statistics != self._logged_statistics:
+            self._logged_statistics = statistics
+            UNIPI_LOGGER.debug(
+                "%s [%s] Statistics: %s",
+                LogPrefix.MQTT,
+                slugify(self.neuron.config.device_info.name),
+                ", ".join(f"{name}: {value}" for name, value in statistics.items()),
+            )
+
+    async def _publish(
+        self,
+        scan_type: str,
+        hardware_types: List[str],
+        feature_types: List[str],
+        sleep: float,
+        port: Optional[str] = None,
+    ) -> None:
+        device: str = slugify(self.neuron.config.device_info.name)
+        boards: Dict[int, List[StateFeature]] = self._get_boards(feature_types)
+        snapshot: List[StateFeature] = list(itertools.chain.from_iterable(boards.values()))
+        next_snapshot: float = 0
+        next_statistics: float = time.monotonic() + self.statistics_interval
 
-    async def _publish(self, scan_type: str, hardware_types: List[str], feature_types: List[str], sleep: float) -> None:
         while self.PUBLISH_RUNNING:
-            await self.neuron.modbus_cache_data.scan(scan_type, hardware_types)
+            await self.neuron.modbus_cache_data.scan(scan_type, hardware_types, port=port)
+            dirty: Dict[int, Set[int]] = self.neuron.modbus_cache_data.pop_dirty(hardware_types, port=port)
+            changed_boards: Set[int] = set()
+
+            for feature in self.neuron.features.changed(dirty, feature_types):
+                if self.publish_features:
+                    self._publish_feature(feature)
 
-            for feature in self.neuron.features.by_feature_types(feature_types):
-                if feature.changed:
-                    topic: str = f"{feature.topic}/get"
-                    await self.mqtt_client.publish(topic=topic, payload=feature.payload, qos=1, retain=True)
+                changed_boards.add(self._get_board(feature))
 
-                    if (
-                        isinstance(feature, EastronMeter)
-                        and LOG_LEVEL[self.neuron.config.logging.mqtt.meters_level] <= LOG_LEVEL["info"]
-                    ) or (
-                        isinstance(feature, (DigitalInput, DigitalOutput, Led, Relay))
-                        and LOG_LEVEL[self.neuron.config.logging.mqtt.features_level] <= LOG_LEVEL["info"]
-                    ):
-                        UNIPI_LOGGER.log(
-                            level=LOG_LEVEL["info"],
-                            msg=LOG_MQTT_PUBLISH % (topic, feature.payload),
-                        )
+            if self.publish_boards:
+                # One message per board or extension unit with the state of all its features.
+                for board in sorted(changed_boards):
+                    self._publish_state(f"{device}/{self.aggregate_topic}/{board}/get", boards[board])
 
-            await asyncio.sleep(sleep)
+            if self.snapshot_interval and (now := time.monotonic()) >= next_snapshot:
+                next_snapshot = now + self.snapshot_interval
+                self._publish_state(f"{device}/state/get", snapshot)
+
+            if (now := time.monotonic()) >= next_statistics:
+                next_statistics = now + self.statistics_interval
+                self._log_statistics()
+
+            if self.wake_on_write:
+                # Wake up early if a coil write changed the cached registers, so the new state is published right away.
+                written: asyncio.Event = self.neuron.modbus_cache_data.written
+
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(written.wait(), timeout=sleep)
+
+                written.clear()
+            else:
+                await asyncio.sleep(sleep)
 
 
 class NeuronFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
@@ -64,8 +259,18 @@ class NeuronFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
 
     subscribe_feature_types: ClassVar[List[str]] = ["DO", "RO"]
     publish_feature_types: ClassVar[List[str]] = ["DI", "DO", "RO"]
+    wake_on_write: ClassVar[bool] = True
+    aggregate_boards: ClassVar[bool] = True
     scan_interval: float = 25e-3
 
+    def __init__(self, neuron: Neuron, mqtt_client: Client) -> None:
+        super().__init__(neuron, mqtt_client)
+        self.commands: FeatureCommandQueue = FeatureCommandQueue()
+        self.command_topics: Dict[str, Union[DigitalOutput, Relay]] = {}
+
+    def _statistics(self) -> Dict[str, int]:
+        return {**super()._statistics(), "skipped commands": self.commands.skipped}
+
     async def init_tasks(self, stack: AsyncExitStack, tasks: Set[Task]) -> None:
         """Initialize MQTT tasks for subscribe and publish MQTT topics.
 
@@ -77,18 +282,34 @@ class NeuronFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
             A set of all MQTT tasks.
 
         """
+        # Queued states are written before the Modbus clients and the MQTT tasks are closed.
+        stack.push_async_callback(self.commands.join)
+
+        # One wildcard subscription per topic family, the messages are routed by topic.
         for feature in self.neuron.features.by_feature_types(self.subscribe_feature_types):
             if isinstance(feature, (DigitalOutput, Relay)):
-                topic: str = f"{feature.topic}/set"
+                self.command_topics[f"{feature.topic}/set"] = feature
+
+        for topic_filter in sorted({f"{topic.rsplit('/', 2)[0]}/+/set" for topic in self.command_topics}):
+            manager = self.mqtt_client.filtered_messages(topic_filter)
+            messages = await stack.enter_async_context(manager)
+
+            subscribe_task: Task = asyncio.create_task(self._subscribe(messages))
+            tasks.add(subscribe_task)
+
+            await self.mqtt_client.subscribe(topic_filter)
+            UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, topic_filter)
 
-                manager = self.mqtt_client.filtered_messages(topic)
-                messages = await stack.enter_async_context(manager)
+        bulk_topic: str = f"{slugify(self.neuron.config.device_info.name)}/relay/set"
 
-                subscribe_task: Task = asyncio.create_task(self._subscribe(feature, topic, messages))
-                tasks.add(subscribe_task)
+        bulk_manager = self.mqtt_client.filtered_messages(bulk_topic)
+        bulk_messages = await stack.enter_async_context(bulk_manager)
 
-                await self.mqtt_client.subscribe(topic)
-                UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, topic)
+        bulk_subscribe_task: Task = asyncio.create_task(self._subscribe_bulk(bulk_topic, bulk_messages))
+        tasks.add(bulk_subscribe_task)
+
+        await self.mqtt_client.subscribe(bulk_topic)
+        UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, bulk_topic)
 
         task: Task = asyncio.create_task(
             self._publish(
@@ -101,14 +322,19 @@ class NeuronFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
 
         tasks.add(task)
 
-    async def _subscribe(self, feature: Union[DigitalOutput, Relay], topic: str, messages: AsyncIterable[Any]) -> None:
+    async def _subscribe(self, messages: AsyncIterable[Any]) -> None:
         async for message in messages:
+            topic: str = message.topic
+
+            if (feature := self.command_topics.get(topic)) is None:
+                continue
+
             value: str = message.payload.decode()
 
             if value == "ON":
-                await feature.set_state(True)
+                self.commands.put(feature, True)
             elif value == "OFF":
-                await feature.set_state(False)
+                self.commands.put(feature, False)
 
             if (
                 value in {"ON", "OFF"}
@@ -119,11 +345,85 @@ class NeuronFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
                     msg=LOG_MQTT_SUBSCRIBE % (topic, value),
                 )
 
+    @staticmethod
+    def parse_bulk_payload(payload: str) -> Dict[str, str]:
+        """Parse a bulk command payload.
+
+        The payload is a JSON object or a compact map, e.g. ``{"ro_2_01": "ON"}`` or ``ro_2_01=ON,do_1_01=OFF``.
+
+        Parameters
+        ----------
+        payload: str
+            The MQTT message payload.
+
+        Returns
+        -------
+        dict
+            Feature states by feature id.
+
+        Raises
+        ------
+        ValueError
+            Get an exception if the payload is not a valid map.
+
+        """
+        if payload.lstrip()[:1] in {"{", "["}:
+            states: Any = json.loads(payload)
+
+            if not isinstance(states, dict):
+                msg = "Expected a JSON object"
+                raise ValueError(msg)
+        else:
+            states = {}
+
+            for item in re.split(r"[,\s]+", payload.strip()):
+                feature_id, separator, value = item.partition("=")
+
+                if not separator:
+                    msg = f"Expected 'feature_id=ON|OFF', got '{item}'"
+                    raise ValueError(msg)
+
+                states[feature_id] = value
+
+        for feature_id, value in states.items():
+            if value not in {FeatureState.ON, FeatureState.OFF}:
+                msg = f"Invalid value '{value}' for '{feature_id}'"
+                raise ValueError(msg)
+
+        return {str(feature_id): str(value) for feature_id, value in states.items()}
+
+    async def _subscribe_bulk(self, topic: str, messages: AsyncIterable[Any]) -> None:
+        async for message in messages:
+            payload: str = message.payload.decode()
+
+            try:
+                states: Dict[str, str] = self.parse_bulk_payload(payload)
+                features: Dict[Union[DigitalInput, DigitalOutput, Led, Relay, EastronMeter], str] = {
+                    self.neuron.features.by_feature_id(feature_id, self.subscribe_feature_types): value
+                    for feature_id, value in states.items()
+                }
+            except (ValueError, ConfigError) as error:
+                UNIPI_LOGGER.error("%s [%s] Invalid bulk command: %s", LogPrefix.MQTT, topic, error)
+                continue
+
+            # All states are queued in the same event loop iteration, so the coil writes are sent in as few requests
+            # as possible by the coil write coalescer.
+            for feature, value in features.items():
+                if isinstance(feature, (DigitalOutput, Relay)):
+                    self.commands.put(feature, value == FeatureState.ON)
+
+            if LOG_LEVEL[self.neuron.config.logging.mqtt.features_level] <= LOG_LEVEL["info"]:
+                UNIPI_LOGGER.log(
+                    level=LOG_LEVEL["info"],
+                    msg=LOG_MQTT_SUBSCRIBE % (topic, payload),
+                )
+
 
 class MeterFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
     """Provide features control as MQTT commands."""
 
     publish_feature_types: ClassVar[List[str]] = ["METER"]
+    aggregate_topic: ClassVar[str] = "unit"
     scan_interval: float = 25e-3
 
     async def init_tasks(self, tasks: Set[Task]) -> None:
@@ -135,12 +435,15 @@ class MeterFeaturesMqttPlugin(BaseFeaturesMqttPlugin):
             A set of all MQTT tasks.
 
         """
-        task: Task = asyncio.create_task(
-            self._publish(
-                scan_type="serial",
-                hardware_types=[HardwareType.EXTENSION],
-                feature_types=self.publish_feature_types,
-                sleep=self.scan_interval,
+        # Every RS-485 bus has its own publish loop, so a slow bus doesn't delay the others.
+        for serial_bus in self.neuron.config.serial_buses:
+            task: Task = asyncio.create_task(
+                self._publish(
+                    scan_type="serial",
+                    hardware_types=[HardwareType.EXTENSION],
+                    feature_types=self.publish_feature_types,
+                    sleep=self.scan_interval,
+                    port=serial_bus.port,
+                )
             )
-        )
-        tasks.add(task)
+            tasks.add(task)
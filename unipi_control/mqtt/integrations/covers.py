@@ -1,7 +1,9 @@
 """Initialize MQTT subscribe and publish for covers."""
 
 import asyncio
+import functools
 import re
+import time
 from asyncio import Queue
 from asyncio import Task
 from contextlib import AsyncExitStack
@@ -9,7 +11,9 @@ from typing import Any
 from typing import AsyncIterable
 from typing import Awaitable
 from typing import Callable
+from typing import ClassVar
 from typing import Dict
+from typing import List
 from typing import NamedTuple
 from typing import Optional
 from typing import Set
@@ -24,9 +28,11 @@ from unipi_control.helpers.log import LOG_LEVEL
 from unipi_control.helpers.log import LOG_MQTT_PUBLISH
 from unipi_control.helpers.log import LOG_MQTT_SUBSCRIBE
 from unipi_control.helpers.log import LOG_MQTT_SUBSCRIBE_TOPIC
+from unipi_control.helpers.text import slugify
 from unipi_control.integrations.covers import Cover
 from unipi_control.integrations.covers import CoverDeviceState
 from unipi_control.integrations.covers import CoverMap
+from unipi_control.mqtt.publisher import MqttPublisher
 
 
 class SubscribeCommand(NamedTuple):
@@ -40,19 +46,24 @@ class CoversMqttPlugin:
 
     PUBLISH_RUNNING: bool = True
     SUBSCRIBE_RUNNING: bool = True
+    statistics_interval: ClassVar[float] = 60
 
     def __init__(self, mqtt_client: Client, covers: CoverMap) -> None:
         self.config: Config = covers.config
         self.mqtt_client: Client = mqtt_client
         self.covers: CoverMap = covers
+        self.publisher: MqttPublisher = MqttPublisher(mqtt_client, self.config.mqtt.max_inflight_messages)
 
         self._queues: Dict[str, Queue] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._logged_statistics: Dict[str, int] = {}
 
         self._init_queues()
 
     def _init_queues(self) -> None:
         for cover in self.covers.by_device_classes(DEVICE_CLASSES):
             self._queues[cover.topic] = Queue()
+            self._locks[cover.topic] = asyncio.Lock()
 
     async def _clear_queue(self, cover: Cover) -> None:
         queue: Queue = self._queues[cover.topic]
@@ -116,105 +127,143 @@ class CoversMqttPlugin:
 
             queue.task_done()
 
-    async def _command_topic(self, stack: AsyncExitStack, tasks: Set[Task]) -> None:
-        for cover in self.covers.by_device_classes(DEVICE_CLASSES):
-            topic: str = f"{cover.topic}/set"
+    async def _subscribe_topic_family(
+        self,
+        stack: AsyncExitStack,
+        tasks: Set[Task],
+        covers: List[Cover],
+        suffix: str,
+        handler: Callable[[Cover, str, str], Awaitable[None]],
+    ) -> None:
+        if not covers:
+            return
 
-            manager = self.mqtt_client.filtered_messages(topic)
-            messages = await stack.enter_async_context(manager)
+        topics: Dict[str, Cover] = {f"{cover.topic}/{suffix}": cover for cover in covers}
+        topic_filter: str = f"{slugify(self.config.device_info.name)}/+/cover/+/{suffix}"
 
-            task: Task = asyncio.create_task(self._subscribe_command_topic(cover, topic, messages))
-            tasks.add(task)
+        manager = self.mqtt_client.filtered_messages(topic_filter)
+        messages = await stack.enter_async_context(manager)
 
-            await self.mqtt_client.subscribe(topic, qos=0)
-            UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, topic)
-
-    async def _set_position_topic(self, stack: AsyncExitStack, tasks: Set[Task]) -> None:
-        for cover in self.covers.by_device_classes(DEVICE_CLASSES):
-            topic: str = f"{cover.topic}/position/set"
+        task: Task = asyncio.create_task(self._subscribe(topics, handler, messages))
+        tasks.add(task)
 
-            manager = self.mqtt_client.filtered_messages(topic)
-            messages = await stack.enter_async_context(manager)
+        await self.mqtt_client.subscribe(topic_filter, qos=0)
+        UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, topic_filter)
+
+    async def _subscribe(
+        self,
+        topics: Dict[str, Cover],
+        handler: Callable[[Cover, str, str], Awaitable[None]],
+        messages: AsyncIterable[Any],
+    ) -> None:
+        handler_tasks: Set[Task] = set()
+
+        try:
+            async for message in messages:
+                topic: str = message.topic
+
+                if cover := topics.get(topic):
+                    # A slow command of one cover doesn't delay the commands of the other covers.
+                    task: Task = asyncio.create_task(self._handle(cover, handler, topic, message.payload.decode()))
+                    handler_tasks.add(task)
+                    task.add_done_callback(functools.partial(self._handle_done, handler_tasks))
+
+            await asyncio.gather(*handler_tasks, return_exceptions=True)
+        finally:
+            for task in handler_tasks:
+                task.cancel()
+
+    async def _handle(
+        self, cover: Cover, handler: Callable[[Cover, str, str], Awaitable[None]], topic: str, value: str
+    ) -> None:
+        # The lock is acquired in the order of the messages, so the commands of one cover run in order.
+        async with self._locks[cover.topic]:
+            await handler(cover, topic, value)
+
+    @staticmethod
+    def _handle_done(handler_tasks: Set[Task], task: Task) -> None:
+        handler_tasks.discard(task)
+
+        if not task.cancelled() and (error := task.exception()):
+            UNIPI_LOGGER.error("%s Cover command failed: %s", LogPrefix.COVER, error)
 
-            task: Task = asyncio.create_task(self._subscribe_set_position_topic(cover, topic, messages))
-            tasks.add(task)
+    async def _command_topic(self, stack: AsyncExitStack, tasks: Set[Task]) -> None:
+        covers: List[Cover] = list(self.covers.by_device_classes(DEVICE_CLASSES))
+        await self._subscribe_topic_family(stack, tasks, covers, "set", self._subscribe_command_topic)
 
-            await self.mqtt_client.subscribe(topic, qos=0)
-            UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, topic)
+    async def _set_position_topic(self, stack: AsyncExitStack, tasks: Set[Task]) -> None:
+        covers: List[Cover] = list(self.covers.by_device_classes(DEVICE_CLASSES))
+        await self._subscribe_topic_family(stack, tasks, covers, "position/set", self._subscribe_set_position_topic)
 
     async def _tilt_command_topic(self, stack: AsyncExitStack, tasks: Set[Task]) -> None:
-        for cover in self.covers.by_device_classes(DEVICE_CLASSES):
-            if cover.settings.tilt_change_time:
-                topic: str = f"{cover.topic}/tilt/set"
-
-                manager = self.mqtt_client.filtered_messages(topic)
-                messages = await stack.enter_async_context(manager)
-
-                task: Task = asyncio.create_task(self._subscribe_tilt_command_topic(cover, topic, messages))
-                tasks.add(task)
-
-                await self.mqtt_client.subscribe(topic, qos=0)
-                UNIPI_LOGGER.debug(LOG_MQTT_SUBSCRIBE_TOPIC, topic)
-
-    async def _subscribe_command_topic(self, cover: Cover, topic: str, messages: AsyncIterable[Any]) -> None:
-        async for message in messages:
-            value: str = message.payload.decode()
-
-            await self._clear_queue(cover)
-
-            if value == CoverDeviceState.OPEN:
-                await cover.open_cover()
-            elif value == CoverDeviceState.CLOSE:
-                await cover.close_cover()
-            elif value == CoverDeviceState.STOP:
-                await cover.stop_cover()
-
-            if LOG_LEVEL[self.config.logging.mqtt.covers_level] <= LOG_LEVEL["info"]:
-                UNIPI_LOGGER.log(
-                    level=LOG_LEVEL["info"],
-                    msg=LOG_MQTT_SUBSCRIBE % (topic, value),
-                )
-
-    async def _subscribe_set_position_topic(self, cover: Cover, topic: str, messages: AsyncIterable[Any]) -> None:
-        async for message in messages:
-            value: str = message.payload.decode()
-
-            if re.match(r"[+-]?\d+$", value):
-                position: int = int(value)
-                queue: Queue = self._queues[cover.topic]
-
-                await queue.put(
-                    SubscribeCommand(
-                        command="set_position",
-                        value=position,
-                        log=LOG_MQTT_SUBSCRIBE % (topic, position),
-                    ),
-                )
-
-    async def _subscribe_tilt_command_topic(self, cover: Cover, topic: str, messages: AsyncIterable[Any]) -> None:
-        async for message in messages:
-            value: str = message.payload.decode()
+        covers: List[Cover] = [
+            cover for cover in self.covers.by_device_classes(DEVICE_CLASSES) if cover.settings.tilt_change_time
+        ]
+        await self._subscribe_topic_family(stack, tasks, covers, "tilt/set", self._subscribe_tilt_command_topic)
+
+    async def _subscribe_command_topic(self, cover: Cover, topic: str, value: str) -> None:
+        await self._clear_queue(cover)
+
+        if value == CoverDeviceState.OPEN:
+            await cover.open_cover()
+        elif value == CoverDeviceState.CLOSE:
+            await cover.close_cover()
+        elif value == CoverDeviceState.STOP:
+            await cover.stop_cover()
+
+        if LOG_LEVEL[self.config.logging.mqtt.covers_level] <= LOG_LEVEL["info"]:
+            UNIPI_LOGGER.log(
+                level=LOG_LEVEL["info"],
+                msg=LOG_MQTT_SUBSCRIBE % (topic, value),
+            )
+
+    async def _subscribe_set_position_topic(self, cover: Cover, topic: str, value: str) -> None:
+        if re.match(r"[+-]?\d+$", value):
+            position: int = int(value)
+            queue: Queue = self._queues[cover.topic]
 
-            if re.match(r"[+-]?\d+$", value):
-                tilt: int = int(value)
-                queue: Queue = self._queues[cover.topic]
+            await queue.put(
+                SubscribeCommand(
+                    command="set_position",
+                    value=position,
+                    log=LOG_MQTT_SUBSCRIBE % (topic, position),
+                ),
+            )
+
+    async def _subscribe_tilt_command_topic(self, cover: Cover, topic: str, value: str) -> None:
+        if re.match(r"[+-]?\d+$", value):
+            tilt: int = int(value)
+            queue: Queue = self._queues[cover.topic]
 
-                await queue.put(
-                    SubscribeCommand(
-                        command="set_tilt",
-                        value=tilt,
-                        log=LOG_MQTT_SUBSCRIBE % (topic, tilt),
-                    ),
-                )
+            await queue.put(
+                SubscribeCommand(
+                    command="set_tilt",
+                    value=tilt,
+                    log=LOG_MQTT_SUBSCRIBE % (topic, tilt),
+                ),
+            )
+
+    def _log_statistics(self) -> None:
+        statistics: Dict[str, int] = self.publisher.statistics
+
+        # Only log changed counters, so an idle system doesn't fill the log.
+        if statistics != self._logged_statistics:
+            self._logged_statistics = statistics
+            UNIPI_LOGGER.debug(
+                "%s [%s] Statistics: %s",
+                LogPrefix.COVER,
+                slugify(self.config.device_info.name),
+                ", ".join(f"{name}: {value}" for name, value in statistics.items()),
+            )
 
     async def _publish(self) -> None:
+        next_statistics: float = time.monotonic() + self.statistics_interval
+
         while self.PUBLISH_RUNNING:
             for cover in self.covers.by_device_classes(DEVICE_CLASSES):
                 if cover.position_changed:
                     position_topic: str = f"{cover.topic}/position"
-                    await self.mqtt_client.publish(
-                        topic=position_topic, payload=cover.status.position, qos=1, retain=True
-                    )
+                    self.publisher.publish(topic=position_topic, payload=cover.status.position, qos=1, retain=True)
 
                     if LOG_LEVEL[self.config.logging.mqtt.covers_level] <= LOG_LEVEL["info"]:
                         UNIPI_LOGGER.log(
@@ -224,7 +273,7 @@ class CoversMqttPlugin:
 
                 if cover.tilt_changed:
                     tilt_topic: str = f"{cover.topic}/tilt"
-                    await self.mqtt_client.publish(topic=tilt_topic, payload=cover.status.tilt, qos=1, retain=True)
+                    self.publisher.publish(topic=tilt_topic, payload=cover.status.tilt, qos=1, retain=True)
 
                     if LOG_LEVEL[self.config.logging.mqtt.covers_level] <= LOG_LEVEL["info"]:
                         UNIPI_LOGGER.log(
@@ -234,7 +283,7 @@ class CoversMqttPlugin:
 
                 if cover.state_changed:
                     state_topic: str = f"{cover.topic}/state"
-                    await self.mqtt_client.publish(topic=state_topic, payload=cover.state, qos=1, retain=True)
+                    self.publisher.publish(topic=state_topic, payload=cover.state, qos=1, retain=True)
 
                     if LOG_LEVEL[self.config.logging.mqtt.covers_level] <= LOG_LEVEL["info"]:
                         UNIPI_LOGGER.log(
@@ -243,4 +292,9 @@ class CoversMqttPlugin:
                         )
 
                 await cover.calibrate()
+
+            if (now := time.monotonic()) >= next_statistics:
+                next_statistics = now + self.statistics_interval
+                self._log_statistics()
+
             await asyncio.sleep(25e-3)
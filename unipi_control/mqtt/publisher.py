@@ -0,0 +1,142 @@
+"""Publish MQTT messages without waiting for the acknowledgements."""
+
+import asyncio
+from asyncio import Task
+from typing import Dict
+from typing import Optional
+from typing import Set
+from typing import Tuple
+from typing import Union
+
+from aiomqtt import Client
+from aiomqtt import MqttError
+
+from unipi_control.config import LogPrefix
+from unipi_control.config import UNIPI_LOGGER
+
+MqttPayload = Union[str, bytes, float, None]
+
+
+class MqttPublisher:
+    """Publish MQTT messages through a bounded pipeline.
+
+    Messages are queued by topic and only the newest payload of a topic is kept, so the
+    caller never waits for the broker and the queue never holds more messages than
+    there are topics. The queue is drained at the rate the broker acknowledges the
+    messages. At most ``max_inflight_messages`` messages are in flight. Topics are
+    published in the order they were first queued.
+
+    Attributes
+    ----------
+    mqtt_client: Client
+        The MQTT client.
+    max_inflight_messages: int
+        Maximum number of messages that wait for an acknowledgement.
+    superseded: int
+        Number of queued payloads that were replaced by a newer payload of the same topic.
+    dropped: int
+        Number of queued payloads that were discarded after a failed publish.
+
+    """
+
+    def __init__(self, mqtt_client: Client, max_inflight_messages: int) -> None:
+        self.mqtt_client: Client = mqtt_client
+        self.max_inflight_messages: int = max_inflight_messages
+        self.superseded: int = 0
+        self.dropped: int = 0
+
+        self._slots: asyncio.Semaphore = asyncio.Semaphore(max_inflight_messages)
+        self._queue: Dict[str, Tuple[MqttPayload, int, bool]] = {}
+        self._drain_task: Optional[Task] = None
+        self._tasks: Set[Task] = set()
+        self._error: Optional[BaseException] = None
+
+    @property
+    def in_flight(self) -> int:
+        """Return the number of messages that wait for an acknowledgement."""
+        return len(self._tasks)
+
+    @property
+    def queued(self) -> int:
+        """Return the number of messages that wait for a free slot."""
+        return len(self._queue)
+
+    @property
+    def statistics(self) -> Dict[str, int]:
+        """Return the superseded and dropped message counters for the log."""
+        return {"superseded messages": self.superseded, "dropped messages": self.dropped}
+
+    def publish(self, topic: str, payload: MqttPayload, qos: int = 1, retain: bool = True) -> None:
+        """Queue a message and replace a queued message of the same topic.
+
+        Parameters
+        ----------
+        topic: str
+            The MQTT topic.
+        payload: str, bytes, float, optional
+            The message payload.
+        qos: int
+            The MQTT quality of service.
+        retain: bool
+            Retain the message on the broker.
+
+        Raises
+        ------
+        MqttError
+            Get the error of a failed previous publish, so the MQTT connection is restarted.
+
+        """
+        self._raise_error()
+
+        if topic in self._queue:
+            self.superseded += 1
+
+        self._queue[topic] = (payload, qos, retain)
+
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+
+    async def join(self) -> None:
+        """Wait until all queued messages are acknowledged."""
+        if self._drain_task:
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._raise_error()
+
+    async def _drain(self) -> None:
+        while self._queue and not self._error:
+            await self._slots.acquire()
+
+            if not self._queue:
+                # The queue was dropped after a failed publish.
+                self._slots.release()
+                break
+
+            # The payload is taken after the wait, so a newer payload of the topic is published instead.
+            topic: str = next(iter(self._queue))
+            payload, qos, retain = self._queue.pop(topic)
+
+            task: Task = asyncio.create_task(self._publish(topic, payload, qos, retain))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _publish(self, topic: str, payload: MqttPayload, qos: int, retain: bool) -> None:
+        try:
+            await self.mqtt_client.publish(topic=topic, payload=payload, qos=qos, retain=retain)
+        except MqttError as error:
+            # Drop the queue before the slot is released, so no further message is sent.
+            self._error = self._error or error
+
+            if self._queue:
+                self.dropped += len(self._queue)
+                UNIPI_LOGGER.warning("%s %s queued message(s) dropped: %s", LogPrefix.MQTT, len(self._queue), error)
+                self._queue.clear()
+        finally:
+            self._slots.release()
+
+    def _raise_error(self) -> None:
+        if self._error:
+            error: BaseException = self._error
+            self._error = None
+            raise error
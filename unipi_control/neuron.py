@@ -1,8 +1,10 @@
 """Read hardware to initialize neuron device."""
 
+import asyncio
 from typing import List
 from typing import NamedTuple
 from typing import Optional
+from typing import Tuple
 
 from pymodbus.pdu import ModbusResponse
 
@@ -23,9 +25,7 @@ from unipi_control.features.utils import FeatureType
 from unipi_control.helpers.typing import HardwareDefinition
 from unipi_control.helpers.typing import ModbusClient
 from unipi_control.helpers.typing import ModbusFeature
-from unipi_control.helpers.typing import ModbusReadData
 from unipi_control.modbus import ModbusCacheData
-from unipi_control.modbus import check_modbus_call
 
 
 class BoardConfig(NamedTuple):
@@ -180,7 +180,8 @@ class Neuron:
     """Class that reads all boards and scan modbus registers from an Unipi Neuron, extensions and third-party devices.
 
     The Unipi Neuron has one or more boards and each board has its features (e.g. Relay, Digital Input). This class
-    reads out all boards and append it to the boards ``list``.
+    reads out all boards and append it to the boards ``list``. A remote Unipi Neuron is created with its ``model``
+    instead of reading the model from the local EEPROM.
 
     Attributes
     ----------
@@ -196,10 +197,10 @@ class Neuron:
 
     """
 
-    def __init__(self, config: Config, modbus_client: ModbusClient) -> None:
+    def __init__(self, config: Config, modbus_client: ModbusClient, model: Optional[str] = None) -> None:
         self.config: Config = config
         self.modbus_client: ModbusClient = modbus_client
-        self.hardware: HardwareMap = HardwareMap(config=config)
+        self.hardware: HardwareMap = HardwareMap(config=config, model=model)
         self.features = FeatureMap()
         self.boards: List[Board] = []
 
@@ -215,6 +216,11 @@ class Neuron:
         await self.read_boards()
         await self.read_extensions()
 
+        self.hardware.compile_feature_scan_plans(self.features.registers)
+
+        await self.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
+        await self.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
+
         UNIPI_LOGGER.info("%s %s features initialized.", LogPrefix.CONFIG, len(self.features))
 
     @staticmethod
@@ -236,20 +242,24 @@ class Neuron:
         return f"{(versions[0] & 0xff00) >> 8}.{(versions[0] & 0x00ff)}"
 
     async def read_boards(self) -> None:
-        """Scan Modbus TCP and initialize Unipi Neuron board."""
-        UNIPI_LOGGER.info("%s Reading SPI boards", LogPrefix.MODBUS)
+        """Scan Modbus TCP and initialize Unipi Neuron board.
 
-        for index in (1, 2, 3):
-            data: ModbusReadData = {
-                "address": 1000,
-                "count": 1,
-                "slave": index,
-            }
+        All SPI boards are probed in parallel, so a missing board doesn't delay the others.
+        """
+        UNIPI_LOGGER.info("%s Reading SPI boards", LogPrefix.MODBUS)
 
-            response: Optional[ModbusResponse] = await check_modbus_call(
-                self.modbus_client.tcp.read_input_registers, data
+        indexes: Tuple[int, ...] = (1, 2, 3)
+        responses: List[Optional[ModbusResponse]] = await asyncio.gather(
+            *(
+                self.modbus_cache_data.tcp_scheduler.call(
+                    self.modbus_client.tcp.read_input_registers,
+                    {"address": 1000, "count": 1, "slave": index},
+                )
+                for index in indexes
             )
+        )
 
+        for index, response in zip(indexes, responses):
             if response:
                 board = Board(
                     config=self.config,
@@ -268,8 +278,6 @@ class Neuron:
             else:
                 UNIPI_LOGGER.info("%s No board on SPI %s", LogPrefix.MODBUS, index)
 
-        await self.modbus_cache_data.scan("tcp", hardware_types=[HardwareType.NEURON])
-
     async def read_extensions(self) -> None:
         """Scan Modbus RTU and initialize extension classes."""
         UNIPI_LOGGER.info("%s Reading extensions", LogPrefix.MODBUS)
@@ -287,5 +295,3 @@ class Neuron:
                     definition=definition,
                     features=self.features,
                 ).init()
-
-        await self.modbus_cache_data.scan("serial", hardware_types=[HardwareType.EXTENSION])
@@ -13,6 +13,7 @@ from pymodbus.client.serial import AsyncModbusSerialClient
 from pymodbus.client.tcp import AsyncModbusTcpClient
 from typing import Awaitable
 from typing import Callable
+from typing import Dict
 from typing import List
 from typing import NoReturn
 from typing import Optional
@@ -21,14 +22,22 @@ from typing import Set
 from unipi_control.config import Config
 from unipi_control.config import DEFAULT_CONFIG_DIR
 from unipi_control.config import LogPrefix
+from unipi_control.config import ModbusSerialConfig
+from unipi_control.config import ModbusTCPConfig
 from unipi_control.config import MqttConfig
+from unipi_control.config import RemoteNeuronConfig
 from unipi_control.config import UNIPI_LOGGER
 from unipi_control.helpers.argparse import init_argparse
 from unipi_control.helpers.exception import ConfigError
 from unipi_control.helpers.exception import UnexpectedError
 from unipi_control.helpers.text import slugify
 from unipi_control.helpers.typing import ModbusClient
+from unipi_control.helpers.typing import ModbusSerialClient
+from unipi_control.helpers.typing import ModbusTcpClient
 from unipi_control.integrations.covers import CoverMap
+from unipi_control.modbus_proxy import ModbusProxyServer
+from unipi_control.modbus_transport import LeanModbusRtuClient
+from unipi_control.modbus_transport import LeanModbusTcpClient
 from unipi_control.mqtt.discovery.binary_sensors import HassBinarySensorsMqttPlugin
 from unipi_control.mqtt.discovery.covers import HassCoversMqttPlugin
 from unipi_control.mqtt.discovery.sensors import HassSensorsMqttPlugin
@@ -52,6 +61,25 @@ class UnipiControl:
         self.config: Config = config
         self.modbus_client: ModbusClient = modbus_client
         self.neuron: Neuron = Neuron(config=config, modbus_client=modbus_client)
+        self.remote_neurons: List[Neuron] = [
+            self._create_remote_neuron(remote_neuron) for remote_neuron in config.remote_neurons
+        ]
+        self.modbus_proxy: Optional[ModbusProxyServer] = None
+
+        self._remote_neuron_tasks: Dict[str, Task] = {}
+
+    def _create_remote_neuron(self, remote_neuron: RemoteNeuronConfig) -> Neuron:
+        config: Config = self.config.get_remote_neuron_config(remote_neuron)
+
+        return Neuron(
+            config=config,
+            modbus_client=ModbusClient(
+                tcp=create_modbus_tcp_client(config.modbus_tcp),
+                # Remote Unipi Neurons have no extensions on the local serial bus.
+                serial=self.modbus_client.serial,
+            ),
+            model=remote_neuron.model,
+        )
 
     async def _init_tasks(self, stack: AsyncExitStack, mqtt_client: Client) -> None:
         tasks: Set[Task] = set()
@@ -60,6 +88,9 @@ class UnipiControl:
         await NeuronFeaturesMqttPlugin(self.neuron, mqtt_client).init_tasks(stack, tasks)
         await MeterFeaturesMqttPlugin(self.neuron, mqtt_client).init_tasks(tasks)
 
+        for remote_neuron in self.remote_neurons:
+            tasks.add(asyncio.create_task(self._init_remote_neuron_tasks(remote_neuron, stack, mqtt_client)))
+
         covers = CoverMap(self.config, self.neuron.features)
         covers.init()
 
@@ -86,6 +117,51 @@ class UnipiControl:
         except asyncio.CancelledError:
             ...
 
+    async def _init_remote_neuron(self, remote_neuron: Neuron) -> None:
+        host: str = remote_neuron.config.modbus_tcp.host
+        port: int = remote_neuron.config.modbus_tcp.port
+        backoff: float = 1.0
+
+        # An unreachable remote neuron is retried with exponential backoff and initialized as soon as it responds.
+        while True:
+            await remote_neuron.modbus_client.tcp.connect()
+
+            if remote_neuron.modbus_client.tcp.connected:
+                break
+
+            UNIPI_LOGGER.error(
+                "%s TCP client can't connect to %s:%s. Remote neuron '%s' is retried in %.1fs.",
+                LogPrefix.MODBUS,
+                host,
+                port,
+                remote_neuron.config.device_info.name,
+                backoff,
+            )
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, remote_neuron.config.modbus_tcp.max_backoff)
+
+        UNIPI_LOGGER.info("%s TCP client connected to %s:%s", LogPrefix.MODBUS, host, port)
+        await remote_neuron.init()
+
+    async def _init_remote_neuron_tasks(
+        self, remote_neuron: Neuron, stack: AsyncExitStack, mqtt_client: Client
+    ) -> None:
+        tasks: Set[Task] = set()
+
+        # The shield keeps the initialization running when the MQTT connection is restarted.
+        await asyncio.shield(self._remote_neuron_tasks[remote_neuron.config.device_info.name])
+        await NeuronFeaturesMqttPlugin(remote_neuron, mqtt_client).init_tasks(stack, tasks)
+
+        if self.config.homeassistant.enabled:
+            await HassBinarySensorsMqttPlugin(remote_neuron, mqtt_client).init_tasks(tasks)
+            await HassSwitchesMqttPlugin(remote_neuron, mqtt_client).init_tasks(tasks)
+
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            await self._cancel_tasks(tasks)
+
     async def _modbus_connect(self) -> None:
         await self.modbus_client.tcp.connect()
 
@@ -117,6 +193,15 @@ class UnipiControl:
             )
             raise UnexpectedError(exception_message_serial)
 
+        for serial_port, serial_client in self.modbus_client.serial_buses.items():
+            await serial_client.connect()
+
+            if serial_client.connected:
+                UNIPI_LOGGER.info("%s Serial client connected to %s", LogPrefix.MODBUS, serial_port)
+            else:
+                exception_message_serial_bus: str = f"{LogPrefix.MODBUS} Serial client can't connect to {serial_port}"
+                raise UnexpectedError(exception_message_serial_bus)
+
     @staticmethod
     async def mqtt_connect(
         mqtt_config: MqttConfig,
@@ -153,6 +238,7 @@ class UnipiControl:
                         keepalive=mqtt_config.keepalive,
                         username=mqtt_config.username,
                         password=mqtt_config.password,
+                        max_inflight_messages=mqtt_config.max_inflight_messages,
                     )
 
                     await stack.enter_async_context(mqtt_client)
@@ -182,14 +268,90 @@ class UnipiControl:
     async def run(self) -> NoReturn:
         """Connect to Modbus and initialize Unipi Neuron hardware."""
         await self._modbus_connect()
+
+        for remote_neuron in self.remote_neurons:
+            self._remote_neuron_tasks[remote_neuron.config.device_info.name] = asyncio.create_task(
+                self._init_remote_neuron(remote_neuron)
+            )
+
         await self.neuron.init()
 
-        await self.mqtt_connect(
-            mqtt_config=self.config.mqtt,
-            mqtt_client_id=f"{slugify(self.config.device_info.name)}-{uuid.uuid4()}",
-            callback=self._init_tasks,
+        if self.config.modbus_proxy.enabled:
+            self.modbus_proxy = ModbusProxyServer(self.config.modbus_proxy, self.neuron.modbus_cache_data)
+            await self.modbus_proxy.start()
+
+        try:
+            await self.mqtt_connect(
+                mqtt_config=self.config.mqtt,
+                mqtt_client_id=f"{slugify(self.config.device_info.name)}-{uuid.uuid4()}",
+                callback=self._init_tasks,
+            )
+        finally:
+            # Close the proxy server and wait for the writes of external clients on shutdown.
+            if self.modbus_proxy:
+                await self.modbus_proxy.stop()
+
+            await self._cancel_tasks(set(self._remote_neuron_tasks.values()))
+
+
+def create_modbus_tcp_client(modbus_tcp: ModbusTCPConfig) -> ModbusTcpClient:
+    """Create the Modbus TCP client of the configured transport.
+
+    Parameters
+    ----------
+    modbus_tcp: ModbusTCPConfig
+        The Modbus TCP configuration.
+
+    Returns
+    -------
+    AsyncModbusTcpClient or LeanModbusTcpClient
+
+    """
+    if modbus_tcp.transport == "lean":
+        return LeanModbusTcpClient(
+            host=modbus_tcp.host, port=modbus_tcp.port, timeout=modbus_tcp.timeout, retries=modbus_tcp.retries
         )
 
+    return AsyncModbusTcpClient(
+        host=modbus_tcp.host,
+        port=modbus_tcp.port,
+        timeout=modbus_tcp.timeout,
+        retries=modbus_tcp.retries,
+        retry_on_empty=True,
+    )
+
+
+def create_modbus_serial_client(modbus_serial: ModbusSerialConfig) -> ModbusSerialClient:
+    """Create the Modbus RTU client of the configured transport.
+
+    Parameters
+    ----------
+    modbus_serial: ModbusSerialConfig
+        The configuration of the RS-485 bus.
+
+    Returns
+    -------
+    AsyncModbusSerialClient or LeanModbusRtuClient
+
+    """
+    if modbus_serial.transport == "lean":
+        return LeanModbusRtuClient(
+            port=modbus_serial.port,
+            baudrate=modbus_serial.baud_rate,
+            parity=modbus_serial.parity,
+            timeout=modbus_serial.timeout,
+            retries=modbus_serial.retries,
+        )
+
+    return AsyncModbusSerialClient(
+        port=modbus_serial.port,
+        baudrate=modbus_serial.baud_rate,
+        parity=modbus_serial.parity,
+        timeout=modbus_serial.timeout,
+        retries=modbus_serial.retries,
+        retry_on_empty=True,
+    )
+
 
 def parse_args(args: List[str]) -> argparse.Namespace:
     """Initialize argument parser options.
@@ -234,21 +396,12 @@ def main(argv: Optional[List[str]] = None) -> None:
         unipi_control = UnipiControl(
             config=config,
             modbus_client=ModbusClient(
-                tcp=AsyncModbusTcpClient(
-                    host=config.modbus_tcp.host,
-                    port=config.modbus_tcp.port,
-                    timeout=0.5,
-                    retries=3,
-                    retry_on_empty=True,
-                ),
-                serial=AsyncModbusSerialClient(
-                    port=config.modbus_serial.port,
-                    baudrate=config.modbus_serial.baud_rate,
-                    parity=config.modbus_serial.parity,
-                    timeout=1,
-                    retries=3,
-                    retry_on_empty=True,
-                ),
+                tcp=create_modbus_tcp_client(config.modbus_tcp),
+                serial=create_modbus_serial_client(config.modbus_serial),
+                serial_buses={
+                    serial_bus.port: create_modbus_serial_client(serial_bus)
+                    for serial_bus in config.modbus_serial_buses
+                },
             ),
         )
 